@@ -0,0 +1,192 @@
+"""
+Micro-benchmarks for the Selenium crawlers' extractor helpers
+- _extract_mobile_from_text, _extract_whatsapp_from_page, _process_phone_number, _normalize_url, _is_valid_email
+- Fixed, seeded corpus of page texts, link lists, phones, URLs and emails (no browser: pages are SnapshotDrivers)
+- Reports ns/op and peak bytes allocated per op (tracemalloc), plus a digest of the outputs
+- Flags ops slower than the stored baseline, or whose outputs changed
+
+Usage:
+  python benchmarks/bench_extractors.py [--script entire|contact] [--save-baseline] [--baseline PATH]
+"""
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import platform
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SCRIPTS = {
+    'contact': 'google_maps_leads_visit_home_and_contact_related_pages_to_extract_leads',
+    'entire': 'google_maps_leads_visit_entire_website_to_extract_leads'
+}
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+CORPUS_SEED = 2024
+CORPUS_VERSION = 1  # bump when the corpus changes; baselines of another version are not compared
+MIN_SAMPLE_SECONDS = 0.2  # each timing sample repeats the corpus for at least this long
+REPEATS = 7  # best-of, to ride out scheduler noise
+REGRESSION_THRESHOLD = 1.25  # flag ops this much slower than the baseline
+
+WORDS = ['salon', 'booking', 'hair', 'contact', 'service', 'offer', 'team', 'visit', 'price', 'open',
+         'monday', 'friday', 'street', 'floor', 'mall', 'spa', 'bridal', 'makeup', 'call', 'us']
+PHONES = ['9801234567', '+977 980-1234567', '01-4412345', '+977-1-4412345', '(01) 4412345',
+          '980 123 4567', '00977 9851234567', '+1 212-555-0147', '4412345', '12345', '98-0123']
+URLS = ['https://www.example.com', 'example.com.np/contact', 'http://shop.example.co.uk:8080/a?b=c',
+        'https://facebook.com/some.salon', 'www.instagram.com/salon', 'HTTPS://WWW.EXAMPLE.ORG/',
+        'mailto:info@example.com', 'user@host.com', '', 'https://linktr.ee/salon', 'salon-ktm.business.site']
+EMAILS = ['info@salon.com', 'contact@salon.com.np', 'http://www.fake@example.com', 'owner@studio.beauty',
+          'image@2x.png', 'booking@spa.co.uk', 'someone@domain.xyz', 'a@b.c', 'sales@company.unknowntld']
+
+
+def build_corpus(seed: int = CORPUS_SEED) -> dict:
+    """Deterministic inputs per extractor"""
+    rng = random.Random(seed)
+
+    def page(words: int, numbers: int, whatsapp: bool) -> str:
+        tokens = [rng.choice(WORDS) for _ in range(words)]
+        for _ in range(numbers):
+            tokens.insert(rng.randrange(len(tokens) + 1), f'Call {rng.choice(PHONES)}')
+        if whatsapp:
+            tokens.insert(rng.randrange(len(tokens) + 1), f'WhatsApp: {rng.choice(PHONES[:7])}')
+        return ' '.join(tokens)
+
+    def anchors(count: int, whatsapp: str) -> list:
+        links = [[f'https://example.com/{rng.choice(WORDS)}/{i}', rng.choice(WORDS)] for i in range(count)]
+        if whatsapp == 'wa.me':
+            links.append([f'https://wa.me/97798{rng.randrange(10**8):08d}?text=hi', 'Chat'])
+        elif whatsapp == 'api':
+            links.append([f'https://api.whatsapp.com/send?phone=97798{rng.randrange(10**8):08d}', 'WhatsApp'])
+        rng.shuffle(links)
+        return links
+
+    texts = [page(60, 1, False), page(400, 3, True), page(4000, 8, False), page(300, 0, False)]
+    pages = [
+        ({'anchors': anchors(40, 'wa.me')}, page(200, 1, False)),
+        ({'anchors': anchors(120, 'api')}, page(800, 2, False)),
+        ({'anchors': anchors(80, '')}, page(400, 1, True)),
+        ({'anchors': anchors(200, '')}, page(2000, 2, False))
+    ]
+    return {'texts': texts, 'pages': pages, 'phones': PHONES, 'urls': URLS, 'emails': EMAILS}
+
+
+def load_crawler(script: str):
+    """Import a crawler script from the repository root"""
+    return __import__(SCRIPTS[script])
+
+
+def build_cases(crawler, corpus: dict) -> dict:
+    """op name -> (callable, list of argument tuples)"""
+    extractor = crawler.EnterpriseLeadGenerator.__new__(crawler.EnterpriseLeadGenerator)
+    extractor.country_code = 'NP'
+    pages = [(crawler.SnapshotDriver(snapshot), text) for snapshot, text in corpus['pages']]
+    return {
+        '_is_valid_email': (extractor._is_valid_email, [(email,) for email in corpus['emails']]),
+        '_normalize_url': (extractor._normalize_url, [(url,) for url in corpus['urls']]),
+        '_process_phone_number': (extractor._process_phone_number, [(phone,) for phone in corpus['phones']]),
+        '_extract_mobile_from_text': (extractor._extract_mobile_from_text, [(text,) for text in corpus['texts']]),
+        '_extract_whatsapp_from_page': (extractor._extract_whatsapp_from_page, pages)
+    }
+
+
+def time_op(func, inputs: list) -> float:
+    """Best-of-REPEATS mean ns per call over the corpus"""
+    loops = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            for args in inputs:
+                func(*args)
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= MIN_SAMPLE_SECONDS * 1e9:
+            break
+        loops *= 2
+    samples = [elapsed]
+    for _ in range(REPEATS - 1):
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            for args in inputs:
+                func(*args)
+        samples.append(time.perf_counter_ns() - start)
+    return min(samples) / (loops * len(inputs))
+
+
+def allocated_per_op(func, inputs: list) -> float:
+    """Mean peak bytes allocated by one call (tracemalloc, traced separately from the timing)"""
+    func(*inputs[0])  # warm caches (compiled regexes, phonenumbers metadata)
+    tracemalloc.start()
+    total = 0
+    for args in inputs:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        func(*args)
+        total += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return total / len(inputs)
+
+
+def output_digest(func, inputs: list) -> str:
+    results = [repr(func(*args)) for args in inputs]
+    return hashlib.sha256('\n'.join(results).encode()).hexdigest()[:16]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--script', choices=SCRIPTS, default='contact')
+    parser.add_argument('--baseline', help="baseline file (default: benchmarks/results/extractors_<script>_baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the baseline")
+    args = parser.parse_args()
+
+    crawler = load_crawler(args.script)
+    cases = build_cases(crawler, build_corpus())
+    baseline_file = args.baseline or os.path.join(RESULTS_DIR, f'extractors_{args.script}_baseline.json')
+    baseline = None
+    if os.path.exists(baseline_file) and not args.save_baseline:
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('corpus_version') != CORPUS_VERSION:
+            print(f"⚠️ Baseline corpus v{baseline.get('corpus_version')} differs from v{CORPUS_VERSION}; not comparing")
+            baseline = None
+
+    print(f"{SCRIPTS[args.script]}.py | Python {platform.python_version()}\n")
+    print(f"{'op':<30}{'inputs':>7}{'ns/op':>14}{'B/op':>12}  {'outputs':<17}{'vs baseline'}")
+    results = {}
+    regressions = 0
+    for name, (func, inputs) in cases.items():
+        ns = time_op(func, inputs)
+        allocated = allocated_per_op(func, inputs)
+        digest = output_digest(func, inputs)
+        results[name] = {'ns_per_op': round(ns, 1), 'bytes_per_op': round(allocated), 'outputs': digest}
+
+        note = ''
+        old = (baseline or {}).get('ops', {}).get(name)
+        if old:
+            ratio = ns / old['ns_per_op']
+            note = f'{ratio:.2f}x'
+            if ratio > REGRESSION_THRESHOLD:
+                note += ' ⚠️ slower'
+                regressions += 1
+            if digest != old['outputs']:
+                note += ' ⚠️ outputs changed'
+                regressions += 1
+        print(f"{name:<30}{len(inputs):>7}{ns:>14,.0f}{allocated:>12,.0f}  {digest:<17}{note}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_file)), exist_ok=True)
+        with open(baseline_file, 'w', encoding='utf-8') as f:
+            json.dump({'script': args.script, 'corpus_version': CORPUS_VERSION,
+                       'python': platform.python_version(), 'ops': results}, f, indent=2)
+        print(f"\nSaved baseline to {baseline_file}")
+    elif baseline is None:
+        print(f"\nNo baseline at {baseline_file}; run with --save-baseline to store one")
+    elif regressions:
+        print(f"\n⚠️ {regressions} regression(s) against {baseline_file}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
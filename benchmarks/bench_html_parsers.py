@@ -0,0 +1,86 @@
+"""
+HTML parser backend benchmark for the aiohttp extractor
+- Per-page parse time for every installed backend (selectolax / lxml / bs4)
+- Checks that each backend finds the same emails as BeautifulSoup
+
+Usage:
+  python benchmarks/bench_html_parsers.py [repeats] (default: 20)
+"""
+import os
+import argparse
+import random
+import statistics
+import time
+import importlib.util
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(ROOT, 'extra_scripts_business_listed_country_list_for_leads', 'main.py')
+PAGE_SIZES = {'small': 200, 'medium': 2000, 'large': 20000}  # paragraphs per page
+
+
+def load_main():
+    """Import the aiohttp engine script by path (its folder is not a package)"""
+    spec = importlib.util.spec_from_file_location('lead_engine_main', MAIN_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_page(paragraphs: int, seed: int = 7) -> str:
+    """Synthetic business page with emails spread over text, meta, anchors and inputs"""
+    rng = random.Random(seed)
+    words = ['salon', 'booking', 'hair', 'contact', 'service', 'offer', 'team', 'visit', 'price', 'open']
+    parts = [
+        '<html><head><title>Shop</title>',
+        '<meta name="description" content="Reach us at meta@example.com">',
+        '<script>var tracking = "js@tracker.io";</script></head><body>'
+    ]
+    for i in range(paragraphs):
+        sentence = ' '.join(rng.choice(words) for _ in range(12))
+        parts.append(f'<p class="p{i % 7}">{sentence} <a href="/page/{i}">more</a></p>')
+        if i % 500 == 0:
+            parts.append(f'<div>Write to info{i}@example.com today</div>')
+    parts.append('<a href="mailto:owner@example.co.uk">Email</a>')
+    parts.append('<form><input type="email" value="form@example.org"></form></body></html>')
+    return ''.join(parts)
+
+
+def time_backend(extract, html: str, repeats: int) -> float:
+    """Median wall time of one parse, in milliseconds"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        extract(html)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('repeats', nargs='?', type=int, default=20, help="timed parses per page and backend")
+    repeats = parser.parse_args().repeats
+    engine = load_main()
+    extractor = engine.EnterpriseLeadGenerator.__new__(engine.EnterpriseLeadGenerator)
+
+    # BeautifulSoup first: it is the reference the fast paths are checked against
+    backends = ['bs4'] + [name for name in engine.PARSER_BACKENDS
+                          if name != 'bs4' and engine.resolve_parser_backend(name) == name]
+    print(f"Backends: {', '.join(backends)} | repeats per page: {repeats}\n")
+    print(f"{'page':<8}{'bytes':>12}" + ''.join(f'{name:>14}' for name in backends) + '  (median ms/page)')
+
+    for label, paragraphs in PAGE_SIZES.items():
+        html = build_page(paragraphs)
+        timings = []
+        extractor.parser_backend = 'bs4'
+        reference = extractor._extract_emails(html)
+        for name in backends:
+            extractor.parser_backend = name
+            emails = extractor._extract_emails(html)
+            if emails != reference:
+                print(f"⚠️ {name} disagrees on '{label}': {sorted(emails ^ reference)}")
+            timings.append(time_backend(engine.PARSER_BACKENDS[name], html, repeats))
+        print(f"{label:<8}{len(html.encode()):>12}" + ''.join(f'{ms:>14.2f}' for ms in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+LeadDataProcessor scale benchmark on synthetic lead files
+- Times every stage (load, segment, each platform writer, summary) at 100k / 1M / 10M rows
+- Peak resident memory per stage, sampled from a background thread
+- Saves results as JSON per code revision and flags stages that regressed against a saved run
+
+Usage:
+  python benchmarks/bench_prepare_scale.py [rows ...] (default: 100000 1000000)
+      [--chunksize N]     time the out-of-core pipeline instead of the in-memory stages
+      [--data-dir DIR]    keep generated inputs here and reuse them on later runs
+      [--save PATH]       results file (default: benchmarks/results/prepare_scale_<revision>.json)
+      [--compare PATH]    earlier results file to compare against
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from prepare_leads import LeadDataProcessor  # noqa: E402
+from synthetic_leads import write_synthetic_leads  # noqa: E402
+
+# Optional: per-stage peak RSS (without psutil only the process-wide peak is known)
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+SAMPLE_INTERVAL = 0.01  # seconds between RSS samples
+REGRESSION_THRESHOLD = 1.2  # flag stages this much slower (or heavier) than the saved run
+MIN_REGRESSION_SECONDS = 0.05  # ...and slower by at least this much, so tiny stages do not flag noise
+PLATFORM_STAGES = {
+    'meta_ads': 'prepare_for_meta_ads',
+    'google_ads': 'prepare_for_google_ads',
+    'mautic': 'prepare_for_mautic',
+    'whatsapp': 'prepare_for_whatsapp'
+}
+
+
+class PeakRss:
+    """Background sampler of this process's resident memory; peak_mb() is the high-water mark since reset()"""
+
+    def __init__(self):
+        self.process = psutil.Process() if psutil else None
+        self._peak = 0
+        self._stop = threading.Event()
+        if self.process:
+            threading.Thread(target=self._sample, daemon=True).start()
+
+    def _sample(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            self._peak = max(self._peak, self.process.memory_info().rss)
+
+    def reset(self):
+        self._peak = self.process.memory_info().rss if self.process else 0
+
+    def peak_mb(self):
+        if self.process:
+            return round(max(self._peak, self.process.memory_info().rss) / 2**20, 1)
+        if resource:
+            # ru_maxrss is KiB on Linux, bytes on macOS; process-wide, not per stage
+            scale = 1 if sys.platform == 'darwin' else 1024
+            return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20, 1)
+        return None
+
+    def stop(self):
+        self._stop.set()
+
+
+def timed(stages: dict, name: str, memory: PeakRss, func, *args):
+    memory.reset()
+    start = time.perf_counter()
+    result = func(*args)
+    stages[name] = {'seconds': round(time.perf_counter() - start, 3), 'peak_rss_mb': memory.peak_mb()}
+    print(f"  {name:<12}{stages[name]['seconds']:>10.3f} s{stages[name]['peak_rss_mb'] or 0:>12.1f} MB")
+    return result
+
+
+def run_in_memory(input_file: str, output_dir: str, memory: PeakRss) -> dict:
+    stages = {}
+    processor = timed(stages, 'load', memory, LeadDataProcessor, input_file, output_dir)
+    segments = timed(stages, 'segment', memory, processor.segment_data)
+    for name, method in PLATFORM_STAGES.items():
+        timed(stages, name, memory, getattr(processor, method), segments)
+    timed(stages, 'summary', memory, processor.prepare_summary_report)
+    return {'mode': 'in-memory', 'leads': len(processor.df), 'stages': stages}
+
+
+def run_chunked(input_file: str, output_dir: str, chunksize: int, memory: PeakRss) -> dict:
+    stages = {}
+    processor = LeadDataProcessor(input_file, output_dir, chunksize=chunksize)
+    timed(stages, 'stream', memory, processor.process_streaming)
+    return {'mode': f'chunked-{chunksize}', 'leads': None, 'stages': stages}
+
+
+def revision() -> str:
+    try:
+        rev = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+        return rev + ('-dirty' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results: dict, baseline_file: str):
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    earlier = {(run['rows'], run['mode']): run for run in baseline['runs']}
+    print(f"\nCompared with {baseline['revision']} ({baseline_file}):")
+    for run in results['runs']:
+        old = earlier.get((run['rows'], run['mode']))
+        if not old:
+            print(f"  {run['rows']} rows ({run['mode']}): no earlier run")
+            continue
+        for name, stage in run['stages'].items():
+            if name not in old['stages']:
+                continue
+            old_seconds = old['stages'][name]['seconds']
+            ratio = stage['seconds'] / max(old_seconds, 1e-6)
+            slower = ratio > REGRESSION_THRESHOLD and stage['seconds'] - old_seconds > MIN_REGRESSION_SECONDS
+            flag = '⚠️ slower' if slower else ''
+            old_mb, new_mb = old['stages'][name].get('peak_rss_mb'), stage.get('peak_rss_mb')
+            if old_mb and new_mb and new_mb / old_mb > REGRESSION_THRESHOLD:
+                flag += ' ⚠️ more memory'
+            print(f"  {run['rows']:>10} {name:<12}{old_seconds:>9.3f} → {stage['seconds']:>9.3f} s"
+                  f"  ({ratio:.2f}x) {flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('rows', nargs='*', type=int, default=[100000, 1000000])
+    parser.add_argument('--chunksize', type=int)
+    parser.add_argument('--data-dir')
+    parser.add_argument('--save')
+    parser.add_argument('--compare')
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = {
+        'revision': revision(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'cpu_count': os.cpu_count(),
+        'runs': []
+    }
+    memory = PeakRss()
+    with tempfile.TemporaryDirectory() as workdir:
+        data_dir = args.data_dir or workdir
+        os.makedirs(data_dir, exist_ok=True)
+        for rows in args.rows:
+            input_file = os.path.join(data_dir, f'synthetic_leads_{rows}.csv')
+            if not os.path.exists(input_file):
+                start = time.perf_counter()
+                write_synthetic_leads(input_file, rows)
+                print(f"Generated {rows} rows in {time.perf_counter() - start:.1f} s")
+            print(f"\n{rows} rows ({os.path.getsize(input_file) / 2**20:.0f} MB){'':>6}time{'':>8}peak RSS")
+            output_dir = os.path.join(workdir, f'out_{rows}')
+            if args.chunksize:
+                run = run_chunked(input_file, output_dir, args.chunksize, memory)
+            else:
+                run = run_in_memory(input_file, output_dir, memory)
+            run['rows'] = rows
+            run['total_seconds'] = round(sum(stage['seconds'] for stage in run['stages'].values()), 3)
+            results['runs'].append(run)
+            print(f"  {'total':<12}{run['total_seconds']:>10.3f} s")
+    memory.stop()
+
+    save_file = args.save or os.path.join(RESULTS_DIR, f"prepare_scale_{results['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(save_file)), exist_ok=True)
+    with open(save_file, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved results to {save_file}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
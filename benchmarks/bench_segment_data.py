@@ -0,0 +1,56 @@
+"""
+LeadDataProcessor.segment_data benchmark
+- Times the row-wise and vectorized segmentation paths on the same input
+- Verifies both paths produce identical segments
+
+Usage:
+  python benchmarks/bench_segment_data.py [rows] (default: 100000)
+"""
+import os
+import sys
+import argparse
+import tempfile
+import time
+import logging
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from prepare_leads import LeadDataProcessor  # noqa: E402
+from synthetic_leads import write_synthetic_leads  # noqa: E402
+
+
+def time_segmentation(processor: LeadDataProcessor, vectorized: bool):
+    processor.vectorized = vectorized
+    processor.invalidate_cache()
+    start = time.perf_counter()
+    segments = processor.segment_data()
+    return time.perf_counter() - start, segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('rows', nargs='?', type=int, default=100000)
+    rows = parser.parse_args().rows
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        input_file = os.path.join(workdir, 'bench_leads.csv')
+        write_synthetic_leads(input_file, rows)
+        processor = LeadDataProcessor(input_file, output_dir=os.path.join(workdir, 'out'))
+
+        rowwise_s, rowwise = time_segmentation(processor, vectorized=False)
+        vectorized_s, vectorized = time_segmentation(processor, vectorized=True)
+
+    for name in rowwise:
+        pd.testing.assert_frame_equal(rowwise[name], vectorized[name], check_dtype=False)
+
+    print(f"Rows after filtering: {len(processor.df)}")
+    print(f"Row-wise   segment_data: {rowwise_s:8.3f} s")
+    print(f"Vectorized segment_data: {vectorized_s:8.3f} s  ({rowwise_s / vectorized_s:.1f}x faster, identical segments)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Offline end-to-end load test of a Selenium crawler's EnterpriseLeadGenerator
+- Maps results come from StubMapsEngine (N synthetic entries at a set rate); websites from local fixture sites
+- Pages are loaded by FixtureDriver over HTTP, so no Chrome is needed; the extraction process pool runs as in production
+- Reports throughput, per-lead latency, queue depth (leads waiting for a browser thread) and RSS growth over time
+- Saves the summary and sampled timeline as JSON
+
+Usage:
+  python benchmarks/load_test_crawler.py [entries] (default: 10000)
+      [--script contact|entire] [--rate N] [--browsers N] [--latency S] [--scroll-wait] [--save PATH]
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+from statistics import median, quantiles
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from stub_maps_engine import FixtureSites, FixtureDriver, StubMapsEngine  # noqa: E402
+
+# Optional: RSS of this process and the extraction workers
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+SCRIPTS = {
+    'contact': 'google_maps_leads_visit_home_and_contact_related_pages_to_extract_leads',
+    'entire': 'google_maps_leads_visit_entire_website_to_extract_leads'
+}
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+SAMPLE_INTERVAL = 0.5  # seconds between timeline samples
+LOCATION = 'Kathmandu, Nepal'
+
+
+def stubbed_generator(crawler, sites: FixtureSites, scroll_wait: bool):
+    """The crawler's EnterpriseLeadGenerator on top of StubMapsEngine, with fixture browsers and lead counters"""
+
+    class LoadTestLeadGenerator(crawler.EnterpriseLeadGenerator, StubMapsEngine):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.lock = threading.Lock()
+            self.started = 0
+            self.completed = 0
+            self.pages_loaded = 0
+            self.latencies = []
+
+        def _new_driver(self):
+            return FixtureDriver(crawler, sites.address, crawler.REQUEST_TIMEOUT)
+
+        def _scroll_page(self, driver) -> None:
+            if scroll_wait:
+                super()._scroll_page(driver)
+
+        def _extract_emails(self, driver, base_url: str) -> dict:
+            try:
+                return super()._extract_emails(driver, base_url)
+            finally:
+                with self.lock:
+                    self.pages_loaded += driver.pages_loaded
+
+        def _process_lead(self, lead):
+            with self.lock:
+                self.started += 1
+            start = time.perf_counter()
+            try:
+                return super()._process_lead(lead)
+            finally:
+                with self.lock:
+                    self.completed += 1
+                    self.latencies.append(time.perf_counter() - start)
+
+    return LoadTestLeadGenerator
+
+
+class Timeline:
+    """Samples queue depth, completed leads and RSS from a background thread"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.samples = []
+        self.process = psutil.Process() if psutil else None
+        self._stop = threading.Event()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _rss_mb(self):
+        if not self.process:
+            return None, None
+        own = self.process.memory_info().rss
+        children = 0
+        for child in self.process.children(recursive=True):
+            try:
+                children += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return round(own / 2**20, 1), round(children / 2**20, 1)
+
+    def sample(self):
+        engine = self.engine
+        with engine.lock:
+            emitted, started, completed = len(engine._entries), engine.started, engine.completed
+        rss, workers_rss = self._rss_mb()
+        self.samples.append({
+            't': round(time.perf_counter() - self._start, 2),
+            'emitted': emitted,
+            'queued': emitted - started,
+            'in_flight': started - completed,
+            'completed': completed,
+            'rss_mb': rss,
+            'workers_rss_mb': workers_rss
+        })
+
+    def _run(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            self.sample()
+
+    def __enter__(self):
+        self.sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+def summarize(engine, timeline: Timeline, crawl_seconds: float, export_seconds: float) -> dict:
+    samples = timeline.samples
+    leads = engine.leads or []
+    latencies = sorted(engine.latencies)
+    rss = [s['rss_mb'] for s in samples if s['rss_mb'] is not None]
+    workers = [s['workers_rss_mb'] for s in samples if s['workers_rss_mb'] is not None]
+    emit_seconds = engine.emitted_at[-1] - engine.emitted_at[0] if engine.emitted_at else 0
+    return {
+        'entries': len(engine._entries),
+        'leads': len(leads),
+        'with_email': sum(1 for lead in leads if lead.get('Email') not in ('', 'null')),
+        'with_mobile': sum(1 for lead in leads if lead.get('mobile_number')),
+        'with_whatsapp': sum(1 for lead in leads if lead.get('whatsapp_number')),
+        'pages_loaded': engine.pages_loaded,
+        'emit_seconds': round(emit_seconds, 2),
+        'crawl_seconds': round(crawl_seconds, 2),
+        'export_seconds': round(export_seconds, 2),
+        'leads_per_second': round(len(leads) / crawl_seconds, 1) if crawl_seconds else None,
+        'pages_per_second': round(engine.pages_loaded / crawl_seconds, 1) if crawl_seconds else None,
+        'latency_p50_ms': round(median(latencies) * 1000, 1) if latencies else None,
+        'latency_p95_ms': round(quantiles(latencies, n=20)[-1] * 1000, 1) if len(latencies) > 1 else None,
+        'max_queued': max(s['queued'] for s in samples),
+        'rss_start_mb': rss[0] if rss else None,
+        'rss_peak_mb': max(rss) if rss else None,
+        'rss_end_mb': rss[-1] if rss else None,
+        'rss_growth_mb_per_1k_leads': round((rss[-1] - rss[0]) / len(leads) * 1000, 2) if rss and leads else None,
+        'workers_rss_peak_mb': max(workers) if workers else None
+    }
+
+
+async def run_load_test(crawler, entries: int, rate: float, latency: float, scroll_wait: bool, workdir: str):
+    with FixtureSites(latency=latency) as sites:
+        generator = stubbed_generator(crawler, sites, scroll_wait)
+        engine = generator(query='salon', location=LOCATION, zoom=15, entries=entries, rate=rate)
+        with Timeline(engine) as timeline:
+            start = time.perf_counter()
+            with redirect_stdout(StringIO()):  # the crawler prints per-page errors; keep the report readable
+                await engine.run()
+            crawl_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cwd = os.getcwd()
+            os.chdir(workdir)
+            try:
+                engine.export_csv('load_test_leads.csv')
+            finally:
+                os.chdir(cwd)
+            export_seconds = time.perf_counter() - start
+    return summarize(engine, timeline, crawl_seconds, export_seconds), timeline.samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('entries', nargs='?', type=int, default=10000)
+    parser.add_argument('--script', choices=SCRIPTS, default='contact')
+    parser.add_argument('--rate', type=float, default=0.0, help="Maps entries per second (default: unthrottled)")
+    parser.add_argument('--browsers', type=int, help="browser threads (default: the script's MAX_CONCURRENT_BROWSERS)")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds the fixture server waits per page")
+    parser.add_argument('--scroll-wait', action='store_true', help="keep the crawler's scroll sleeps (5 s per page)")
+    parser.add_argument('--save', help="results file (default: benchmarks/results/load_test_<script>_<entries>.json)")
+    args = parser.parse_args()
+
+    crawler = __import__(SCRIPTS[args.script])
+    if args.browsers:
+        crawler.MAX_CONCURRENT_BROWSERS = args.browsers
+
+    print(f"🚀 Load test: {args.entries} entries → {SCRIPTS[args.script]}.py "
+          f"({crawler.MAX_CONCURRENT_BROWSERS} browser(s), {crawler.EXTRACTION_PROCESSES} extraction process(es))")
+    with tempfile.TemporaryDirectory() as workdir:
+        summary, samples = asyncio.run(
+            run_load_test(crawler, args.entries, args.rate, args.latency, args.scroll_wait, workdir))
+
+    for key, value in summary.items():
+        print(f"  {key:<28}{value}")
+
+    save_file = args.save or os.path.join(RESULTS_DIR, f'load_test_{args.script}_{args.entries}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(save_file)), exist_ok=True)
+    with open(save_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'options': vars(args),
+            'browsers': crawler.MAX_CONCURRENT_BROWSERS,
+            'summary': summary,
+            'timeline': samples
+        }, f, indent=2)
+    print(f"\n✅ Saved results to {save_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Offline stand-ins for load-testing the Selenium crawlers
+- StubMapsEngine: GoogleMapsEngine whose run() emits N synthetic Maps entries at a set rate (no Playwright, no geocoding)
+- FixtureSites: local HTTP server hosting a small deterministic website per entry (home, about, services, contact)
+- FixtureDriver: WebDriver stand-in that loads those sites over HTTP and answers the crawler's snapshot/XPath calls
+
+Every entry's website is https://www.bench-site-NNNNN.com; FixtureDriver routes any such URL to the local
+server (the crawler normalizes websites to https without a port), which picks the site from the Host header.
+"""
+import re
+import time
+import random
+import asyncio
+import threading
+import urllib.error
+import urllib.request
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from py_lead_generation import GoogleMapsEngine
+
+from synthetic_leads import ADJECTIVES, NOUNS, KINDS
+
+SITE_HOST = 'bench-site-{:05d}.com'
+SITE_URL = 'https://www.' + SITE_HOST
+NO_WEBSITE_SHARE = 0.1  # entries without a website (no browser work)
+SOCIAL_WEBSITE_SHARE = 0.05  # entries whose website is a social profile (filtered by _normalize_url)
+FILLER_WORDS = ['welcome', 'our', 'team', 'offers', 'the', 'best', 'service', 'in', 'town', 'book', 'today',
+                'open', 'daily', 'quality', 'care', 'friendly', 'staff', 'prices', 'gallery', 'news']
+
+
+def _site_index(host: str) -> Optional[int]:
+    match = re.fullmatch(r'(?:www\.)?bench-site-(\d+)\.com', host.split(':', 1)[0].lower())
+    return int(match.group(1)) if match else None
+
+
+def fixture_page(site: int, path: str, filler_words: int = 300) -> Optional[str]:
+    """HTML of one fixture page, or None for a 404.
+
+    Contact details are spread over the pages in a fixed per-site mix, so some
+    sites are satisfied by the home page and others make the crawler visit every page.
+    """
+    rng = random.Random(site)
+    pages = ['/', '/about', '/services', '/contact-us']
+    path = path.rstrip('/') or '/'
+    if path not in pages:
+        return None
+
+    mobile = f'98{rng.randrange(10**8):08d}'
+    landline = f'01-4{rng.randrange(10**6):06d}'
+    placement = {
+        'email': rng.choice(['/', '/contact-us', '/about', None]),
+        'tel': rng.choice(['/', '/contact-us', None]),
+        'text_phone': rng.choice(['/', '/services', None]),
+        'whatsapp': rng.choice(['/contact-us', '/', None, None])
+    }
+    body = [f'<h1>{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {rng.choice(KINDS)}</h1>', '<nav>']
+    body += [f'<a href="{page}">{page.strip("/").replace("-", " ") or "home"}</a>' for page in pages]
+    body += ['<a href="/gallery/photo.jpg">gallery</a>', '<a href="https://facebook.com/bench">facebook</a>', '</nav>']
+    body.append('<p>' + ' '.join(rng.choice(FILLER_WORDS) for _ in range(filler_words)) + '</p>')
+    if placement['email'] == path:
+        body.append(f'<a href="mailto:info@{SITE_HOST.format(site)}">Email us</a>')
+    if placement['tel'] == path:
+        body.append(f'<a href="tel:+977{mobile}">Call</a>')
+    if placement['text_phone'] == path:
+        body.append(f'<p>Office: {landline}</p>')
+    if placement['whatsapp'] == path:
+        body.append(f'<a href="https://wa.me/977{mobile}?text=hi">Chat on WhatsApp</a>')
+    return ('<!DOCTYPE html><html><head><title>fixture</title><script>var x = 1;</script></head><body>'
+            + '\n'.join(body) + '</body></html>')
+
+
+class FixtureSites:
+    """Fixture websites served from a background thread; use as a context manager"""
+
+    def __init__(self, latency: float = 0.0, filler_words: int = 300):
+        sites = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site = _site_index(self.headers.get('Host', ''))
+                html = fixture_page(site, urlparse(self.path).path, sites.filler_words) if site is not None else None
+                if sites.latency:
+                    time.sleep(sites.latency)
+                payload = (html or '<html><body>Not found</body></html>').encode('utf-8')
+                self.send_response(200 if html else 404)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.latency = latency
+        self.filler_words = filler_words
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.address = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _PageParser(HTMLParser):
+    """Visible text and anchors of a page, as the SNAPSHOT_SCRIPT would report them"""
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url
+        self.text: List[str] = []
+        self.anchors: List[List[str]] = []
+        self._anchor = None
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style', 'head'):
+            self._skip += 1
+        elif tag == 'a':
+            href = dict(attrs).get('href')
+            self._anchor = [urljoin(self.base_url, href), ''] if href else None
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style', 'head'):
+            self._skip = max(0, self._skip - 1)
+        elif tag == 'a' and self._anchor:
+            self.anchors.append(self._anchor)
+            self._anchor = None
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        self.text.append(data)
+        if self._anchor:
+            self._anchor[1] += data.strip()
+
+
+class FixtureDriver:
+    """WebDriver stand-in for the fixture sites: get(), execute_script() and find_elements() over plain HTTP"""
+
+    def __init__(self, crawler, sites_address: str, timeout: float = 30):
+        self.crawler = crawler
+        self.sites_address = sites_address
+        self.timeout = timeout
+        self.current_url = ''
+        self.page_source = ''
+        self.snapshot = {'url': '', 'text': '', 'anchors': []}
+        self.pages_loaded = 0
+
+    def set_page_load_timeout(self, seconds: float) -> None:
+        self.timeout = seconds
+
+    def get(self, url: str) -> None:
+        parsed = urlparse(url)
+        request = urllib.request.Request(self.sites_address + (parsed.path or '/'), headers={'Host': parsed.netloc})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                html = response.read().decode('utf-8', 'replace')
+        except urllib.error.HTTPError as e:
+            html = e.read().decode('utf-8', 'replace')  # a browser renders error pages too
+        parser = _PageParser(url)
+        parser.feed(html)
+        self.current_url = url
+        self.page_source = html
+        self.snapshot = {'url': url, 'text': ' '.join(' '.join(parser.text).split()), 'anchors': parser.anchors}
+        self.pages_loaded += 1
+
+    def execute_script(self, script: str, *args):
+        if script == self.crawler.SNAPSHOT_SCRIPT:
+            return self.snapshot
+        if 'scrollHeight' in script:
+            return 1000  # static pages: nothing loads on scroll
+        return None
+
+    def find_element(self, by: str, value: str):
+        return self.crawler.SnapshotDriver(self.snapshot).find_element(by, value)
+
+    def find_elements(self, by: str, value: str):
+        return self.crawler.SnapshotDriver(self.snapshot).find_elements(by, value)
+
+    def quit(self) -> None:
+        pass
+
+
+class StubMapsEngine(GoogleMapsEngine):
+    """GoogleMapsEngine whose run() emits synthetic entries instead of scraping Google Maps.
+
+    Mix it in after the crawler's EnterpriseLeadGenerator so its super().run() lands here.
+    """
+
+    def __init__(self, query: str, location: str, zoom: int | float = 12,
+                 entries: int = 1000, rate: float = 0.0, seed: int = 42) -> None:
+        self._entries = []
+        self.zoom = zoom
+        self.query = query
+        self.location = location
+        self.entry_count = entries
+        self.entry_rate = rate  # entries per second, 0 = as fast as possible
+        self.seed = seed
+        self.emitted_at: List[float] = []
+
+    def synthetic_entry(self, index: int, rng: random.Random) -> Dict[str, str]:
+        """One Maps result in GoogleMapsEngine.FIELD_NAMES layout (phone digits only, like the real parser)"""
+        draw = rng.random()
+        if draw < NO_WEBSITE_SHARE:
+            website = ''
+        elif draw < NO_WEBSITE_SHARE + SOCIAL_WEBSITE_SHARE:
+            website = f'https://facebook.com/bench{index}'
+        else:
+            website = SITE_URL.format(index)
+        return {
+            'Title': f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {rng.choice(KINDS)}',
+            'Address': f'{rng.randrange(1, 300)} Durbar Marg, {self.location}',
+            'PhoneNumber': rng.choice([f'97798{rng.randrange(10**8):08d}', f'0144{rng.randrange(10**5):05d}', '']),
+            'WebsiteURL': website
+        }
+
+    async def run(self) -> None:
+        rng = random.Random(self.seed)
+        start = time.perf_counter()
+        for index in range(self.entry_count):
+            if self.entry_rate:
+                delay = start + index / self.entry_rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            self._entries.append(self.synthetic_entry(index, rng))
+            self.emitted_at.append(time.perf_counter())
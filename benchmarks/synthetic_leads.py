@@ -0,0 +1,185 @@
+"""
+Synthetic lead files in the crawler CSV layout, for benchmarks
+- Country mix with each country's address and postal code format (see LeadDataProcessor.COUNTRY_POSTAL_FORMATS)
+- Mixed phone formats (E.164, national, spaced/dashed), missing and 'null' contact fields
+- Social-media and business websites, free and business emails, a share of repeated leads
+- Generated in vectorized chunks, so 10M-row files need little memory
+
+Usage:
+  python benchmarks/synthetic_leads.py --output leads.csv [--rows N] (default: 100000) [--seed N]
+"""
+import argparse
+import string
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['Title', 'Address', 'Phone', 'Country', 'Website', 'Email', 'mobile_number', 'whatsapp_number']
+CHUNK_ROWS = 200000
+REPEATED_SHARE = 0.03  # leads the crawler found twice (overlapping searches)
+
+ADJECTIVES = ['Glow', 'Royal', 'Urban', 'Golden', 'Silver', 'Classic', 'Modern', 'Green', 'Bright', 'Happy',
+              'Prime', 'Elite', 'Pure', 'Fresh', 'Grand', 'Little', 'Blue', 'Sunny', 'Lotus', 'Everest']
+NOUNS = ['Hair', 'Beauty', 'Nails', 'Style', 'Spa', 'Tea', 'Coffee', 'Dental', 'Fitness', 'Yoga',
+         'Bakery', 'Pizza', 'Auto', 'Print', 'Travel', 'Fashion', 'Books', 'Pet', 'Garden', 'Tech']
+KINDS = ['Salon', 'Studio', 'Center', 'House', 'Shop', 'Clinic', 'Lounge', 'Bar', 'Co.', 'Academy',
+         'Services', 'Store', 'Hub', '& Spa', 'Traders']
+FREE_EMAIL_DOMAINS = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com']
+SOCIAL_SITES = ['https://facebook.com/', 'https://www.instagram.com/', 'https://linktr.ee/']
+
+# code -> weight, streets, cities, address template, postal code format, phone formats.
+# In postal and phone formats # is a random digit and A a random letter.
+COUNTRIES = {
+    'NP': (0.30, ['Durbar Marg', 'Thamel', 'New Baneshwor', 'Jawalakhel', 'Lazimpat', 'Kalanki'],
+           ['Kathmandu', 'काठमाडौँ', 'Lalitpur', 'ललितपुर', 'Pokhara', 'Biratnagar'],
+           '{street}, {city} {zip}', '446##', ['+97798########', '01-4######', '98#-#######', '+977 1-4######']),
+    'US': (0.18, ['Main St', 'Oak Ave', 'Maple Dr', 'Broadway', 'Elm St', 'Sunset Blvd'],
+           ['Springfield, IL', 'Austin, TX', 'Denver, CO', 'Portland, OR', 'Miami, FL'],
+           '{num} {street}, {city} {zip}', '#####', ['+1 2##-555-0###', '(2##) 555-0###', '2##.555.0###']),
+    'GB': (0.10, ['High Street', 'Station Road', 'Church Lane', 'Baker Street'],
+           ['London', 'Manchester', 'Leeds', 'Bristol'],
+           '{num} {street}, {city} {zip}', 'A#A #AA', ['+44 20 7### ####', '020 7### ####', '07700 9#####']),
+    'IN': (0.08, ['MG Road', 'Park Street', 'Linking Road', 'Anna Salai'],
+           ['Bengaluru, Karnataka', 'Mumbai, Maharashtra', 'Chennai, Tamil Nadu'],
+           '{num}, {street}, {city} {zip}', '5600##', ['+91 98### #####', '098### #####', '+9198########']),
+    'DE': (0.06, ['Hauptstraße', 'Bahnhofstraße', 'Gartenweg', 'Schillerstraße'],
+           ['Berlin', 'München', 'Hamburg', 'Köln'],
+           '{street} {num}, {zip} {city}', '1####', ['+49 30 #######', '030 #######', '0170 #######']),
+    'FR': (0.05, ['Rue de Rivoli', 'Avenue Foch', 'Boulevard Voltaire'],
+           ['Paris', 'Lyon', 'Marseille'],
+           '{num} {street}, {zip} {city}', '750##', ['+33 1 ## ## ## ##', '01 ## ## ## ##']),
+    'CA': (0.05, ['King St W', 'Queen St E', 'Yonge St'],
+           ['Toronto, ON', 'Ottawa, ON', 'Vancouver, BC'],
+           '{num} {street}, {city} {zip}', 'M#A #A#', ['+1 416-555-0###', '(604) 555-0###']),
+    'BR': (0.04, ['Av. Paulista', 'Rua Augusta', 'Rua Oscar Freire'],
+           ['São Paulo', 'Rio de Janeiro'],
+           '{street} {num}, {city} {zip}', '0####-###', ['+55 11 9####-####', '(11) 9####-####']),
+    'JP': (0.04, ['Shinjuku', 'Shibuya', 'Ginza'],
+           ['Tokyo', 'Osaka'],
+           '{street} {num}-1, {city} {zip}', '1##-####', ['+81 3-####-####', '03-####-####']),
+    'NL': (0.03, ['Damrak', 'Kalverstraat', 'Coolsingel'],
+           ['Amsterdam', 'Rotterdam'],
+           '{street} {num}, {zip} {city}', '10## AA', ['+31 20 ### ####', '020 ### ####']),
+    'PT': (0.02, ['Rua Augusta', 'Avenida da Liberdade'],
+           ['Lisboa', 'Porto'],
+           '{street} {num}, {zip} {city}', '1###-###', ['+351 21 ### ####', '21 ### ####']),
+    'PL': (0.02, ['ul. Marszałkowska', 'ul. Floriańska'],
+           ['Warszawa', 'Kraków'],
+           '{street} {num}, {zip} {city}', '0#-###', ['+48 22 ### ## ##', '22 ### ## ##']),
+    'AU': (0.02, ['George St', 'Collins St'],
+           ['Sydney NSW', 'Melbourne VIC'],
+           '{num} {street}, {city} {zip}', '2###', ['+61 2 #### ####', '(02) #### ####']),
+    '': (0.01, ['Market Road', 'Station Road'],
+         ['Biratnagar', 'Colombo', 'Dhaka'],
+         '{street}, {city} {zip}', '#####', ['+8801#########', '#######'])
+}
+
+
+DIGITS = np.array(list(string.digits), dtype='<U1')
+LETTERS = np.array(list(string.ascii_uppercase), dtype='<U1')
+
+
+def _pick(rng: np.random.Generator, values, n: int, p=None) -> np.ndarray:
+    return np.asarray(values, dtype=object)[rng.choice(len(values), n, p=p)]
+
+
+def _fill(rng: np.random.Generator, pattern: str, n: int) -> pd.Series:
+    """n strings shaped like pattern, with every # a random digit and every A a random letter"""
+    chars = np.tile(np.array(list(pattern), dtype='<U1'), (n, 1))
+    digits = chars == '#'
+    letters = chars == 'A'
+    chars[digits] = DIGITS[rng.integers(0, 10, digits.sum())]
+    chars[letters] = LETTERS[rng.integers(0, 26, letters.sum())]
+    return pd.Series(np.ascontiguousarray(chars).view(f'<U{len(pattern)}').ravel(), dtype=object)
+
+
+def _with_blanks(rng: np.random.Generator, values: pd.Series, present: float, null: float) -> pd.Series:
+    """Keep a share of values; the rest become 'null' or blank, like the crawler output"""
+    draw = rng.random(len(values))
+    return pd.Series(np.select([draw < present, draw < present + null], [values, 'null'], default=''), dtype=object)
+
+
+def synthetic_chunk(rows: int, rng: np.random.Generator, start: int = 0) -> pd.DataFrame:
+    """One chunk of synthetic leads; start keeps business slugs unique across chunks"""
+    codes = list(COUNTRIES)
+    weights = np.array([spec[0] for spec in COUNTRIES.values()])
+    country = _pick(rng, codes, rows, weights / weights.sum())
+
+    words = [np.asarray(values, dtype=object) for values in (ADJECTIVES, NOUNS, KINDS)]
+    picks = [rng.integers(0, len(values), rows) for values in words]
+    title = pd.Series(words[0][picks[0]] + ' ' + words[1][picks[1]] + ' ' + words[2][picks[2]])
+    slug = pd.Series(np.arange(start, start + rows)).astype(str)
+    for values, pick in zip(reversed(words), reversed(picks)):
+        slug = pd.Series([''.join(filter(str.isalpha, value)).lower() for value in values], dtype=object)[pick].to_numpy() + slug
+
+    address = pd.Series('', index=range(rows), dtype=object)
+    phone = pd.Series('', index=range(rows), dtype=object)
+    for code, (_, streets, cities, template, postal, phone_formats) in COUNTRIES.items():
+        rows_of = np.flatnonzero(country == code)
+        if not len(rows_of):
+            continue
+        n = len(rows_of)
+        zip_codes = _fill(rng, postal, n)
+        zip_codes[rng.random(n) < 0.1] = ''  # addresses without a postal code
+        parts = {
+            'num': pd.Series(rng.integers(1, 300, n)).astype(str),
+            'street': pd.Series(_pick(rng, streets, n)),
+            'city': pd.Series(_pick(rng, cities, n)),
+            'zip': zip_codes
+        }
+        filled = pd.Series('', index=range(n), dtype=object)
+        for literal, token, _, _ in string.Formatter().parse(template):
+            filled = filled + literal + (parts[token] if token else '')
+        address.iloc[rows_of] = filled.str.strip().to_numpy()
+        formats = [_fill(rng, phone_format, n) for phone_format in phone_formats]
+        choice = rng.integers(0, len(formats), n)
+        phone.iloc[rows_of] = np.choose(choice, [values.to_numpy() for values in formats])
+
+    own_domain = slug + pd.Series(_pick(rng, ['.com', '.net', '.com.np', '.co.uk', '.de'], rows))
+    email = pd.Series(np.where(
+        rng.random(rows) < 0.6,
+        _pick(rng, ['info@', 'contact@', 'hello@', 'booking@'], rows) + own_domain,
+        slug + '@' + _pick(rng, FREE_EMAIL_DOMAINS, rows)
+    ), dtype=object)
+    website_draw = rng.random(rows)
+    website = pd.Series(np.select(
+        [website_draw < 0.45, website_draw < 0.55, website_draw < 0.65],
+        ['https://' + own_domain, 'http://www.' + own_domain, _pick(rng, SOCIAL_SITES, rows) + slug],
+        default=''
+    ), dtype=object)
+    website[(website == '') & (rng.random(rows) < 0.5)] = 'null'
+
+    df = pd.DataFrame({
+        'Title': _with_blanks(rng, title, 0.97, 0.02),
+        'Address': _with_blanks(rng, address, 0.95, 0.03),
+        'Phone': _with_blanks(rng, phone, 0.85, 0.05),
+        'Country': country,
+        'Website': website,
+        'Email': _with_blanks(rng, email, 0.35, 0.45),
+        'mobile_number': _with_blanks(rng, phone, 0.2, 0.1),
+        'whatsapp_number': _with_blanks(rng, phone, 0.15, 0.1)
+    })
+
+    # Leads found twice: copies of earlier rows of the chunk
+    repeated = np.flatnonzero(rng.random(rows) < REPEATED_SHARE)
+    repeated = repeated[repeated > 0]
+    df.iloc[repeated] = df.iloc[rng.integers(0, repeated)].to_numpy()
+    return df[COLUMNS]
+
+
+def write_synthetic_leads(path: str, rows: int, seed: int = 42, chunk_rows: int = CHUNK_ROWS) -> None:
+    """Write rows synthetic leads to path (utf-8-sig, like the crawlers) one chunk at a time"""
+    rng = np.random.default_rng(seed)
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        for start in range(0, max(rows, 1), chunk_rows):
+            chunk = synthetic_chunk(min(chunk_rows, rows - start), rng, start) if rows else pd.DataFrame(columns=COLUMNS)
+            chunk.to_csv(f, index=False, header=start == 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', '-o', required=True, help="CSV file to write")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    write_synthetic_leads(args.output, args.rows, seed=args.seed)
@@ -596,16 +596,28 @@ Professional Lead Generation Suite v7.1
 - Enhanced stability
 - Optimized phone validation
 - Improved email extraction
+- Bounded, pooled connections with per-host limits and DNS caching
+- Error-classified retries with Retry-After support and a campaign retry budget
+- Optional streaming HTML scan with early exit and a per-page byte cap
+- Pluggable single-pass HTML parser backends (selectolax / lxml / BeautifulSoup)
+- Optional in-process handoff of finished leads to prepare_leads.LeadDataProcessor
 """
 
 import asyncio
+import codecs
 import csv
+import os
 import re
+import ssl
 import sys
 import json
+import socket
 import phonenumbers
 
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
 from urllib.parse import urlparse, urlunparse
 from typing import Dict, List, Set, Optional, Tuple
 
@@ -613,25 +625,262 @@ import aiohttp
 from bs4 import BeautifulSoup
 from py_lead_generation import GoogleMapsEngine
 
+# Optional fast HTML parsers; BeautifulSoup is always available as the fallback
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
 # System Configuration
 MAX_CONCURRENT_REQUESTS = 5
-REQUEST_TIMEOUT = 300
+MAX_REQUESTS_PER_HOST = 2
+DNS_CACHE_TTL = 300  # seconds
+KEEPALIVE_TIMEOUT = 30  # seconds an idle pooled connection is kept for reuse
+REQUEST_TIMEOUT = 300  # whole-request deadline (connect, headers and body), so a trickling server cannot hold a slot
+CONNECT_TIMEOUT = 20
+READ_TIMEOUT = 60  # max silence between received chunks
+MAX_RESPONSE_BYTES = 10 * 1024 * 1024  # body cap outside streaming mode
 RETRY_ATTEMPTS = 5
+RETRY_BACKOFF_BASE = 1  # seconds, doubled after every attempt
+MAX_RETRY_DELAY = 60  # cap on backoff and honored Retry-After values
+CAMPAIGN_RETRY_BUDGET = 500  # retries shared by every search in one run
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+STREAMING_SCAN = False  # scan pages chunk by chunk instead of buffering the whole body
+STREAM_CHUNK_SIZE = 16 * 1024
+STREAM_EMAIL_TARGET = 1  # stop reading a page once this many valid emails are found
+MAX_PAGE_BYTES = 2 * 1024 * 1024  # per-page byte budget in streaming mode
+HTML_PARSER_BACKEND = 'auto'  # 'selectolax', 'lxml', 'bs4' or 'auto' (fastest installed)
+PREPARE_LEADS = False  # also stream finished leads into platform files (prepare_leads.py) during the crawl
+PREPARE_BATCH_SIZE = 50  # leads per handoff to the LeadDataProcessor
+PREPARED_OUTPUT_DIR = "Prepared_Data_Platform_Specific"
+EMAIL_PATTERN = re.compile(r"\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b", re.IGNORECASE)
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 DEFAULT_CONFIG_FILE = "search_configs.json"
 VALID_ZOOM_RANGE = (12, 20)
 
+def parse_bool(value) -> bool:
+    """Config flag: JSON booleans as-is; strings and numbers only when '1', 'true', 'yes' or 'on'"""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+# Optional per-config engine settings (see load_configurations)
+ENGINE_OPTION_TYPES = {
+    'max_concurrent': int,
+    'per_host_limit': int,
+    'request_timeout': float,
+    'connect_timeout': float,
+    'read_timeout': float,
+    'streaming': parse_bool,
+    'max_page_bytes': int,
+    'parser_backend': str,
+    'prepare': parse_bool
+}
+
 SOCIAL_MEDIA_BLACKLIST = {
     'facebook.com', 'instagram.com', 'linkedin.com',
     'twitter.com', 'x.com', 'pinterest.com'
 }
 
+def extract_sources_bs4(html: str) -> List[str]:
+    """Email sources via a full BeautifulSoup tree (reference backend)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    return [
+        soup.get_text(),
+        ' '.join(meta.get('content', '') for meta in soup.find_all('meta')),
+        ' '.join(a['href'] for a in soup.find_all('a', href=True)),
+        ' '.join(input.get('value', '') for input in soup.find_all('input', {'type': 'email'}))
+    ]
+
+def extract_sources_lxml(html: str) -> List[str]:
+    """Email sources collected in one lxml element walk"""
+    text, metas, hrefs, inputs = [], [], [], []
+    for element in lxml.html.document_fromstring(html).iter():
+        tag = element.tag
+        if isinstance(tag, str):
+            if tag == 'meta':
+                metas.append(element.get('content', ''))
+            elif tag == 'a' and element.get('href') is not None:
+                hrefs.append(element.get('href'))
+            elif tag == 'input' and element.get('type') == 'email':
+                inputs.append(element.get('value', ''))
+            if element.text and tag not in ('script', 'style'):
+                text.append(element.text)
+        # Comments contribute no text of their own, but the text after them does
+        if element.tail:
+            text.append(element.tail)
+    return [''.join(text), ' '.join(metas), ' '.join(hrefs), ' '.join(inputs)]
+
+def extract_sources_selectolax(html: str) -> List[str]:
+    """Email sources collected in one lexbor DOM traversal"""
+    text, metas, hrefs, inputs = [], [], [], []
+    root = LexborHTMLParser(html).root
+    for node in (root.traverse(include_text=True) if root else []):
+        tag = node.tag
+        if tag == '-text':
+            if node.parent is None or node.parent.tag not in ('script', 'style'):
+                text.append(node.text(deep=False))
+        elif tag == 'meta':
+            metas.append(node.attributes.get('content') or '')
+        elif tag == 'a':
+            href = node.attributes.get('href')
+            if href is not None:
+                hrefs.append(href)
+        elif tag == 'input' and node.attributes.get('type') == 'email':
+            inputs.append(node.attributes.get('value') or '')
+    return [''.join(text), ' '.join(metas), ' '.join(hrefs), ' '.join(inputs)]
+
+PARSER_BACKENDS = {
+    'selectolax': extract_sources_selectolax,
+    'lxml': extract_sources_lxml,
+    'bs4': extract_sources_bs4
+}
+
+def resolve_parser_backend(name: str) -> str:
+    """Map 'auto' or an unavailable backend to the fastest installed one"""
+    available = {
+        'selectolax': LexborHTMLParser is not None,
+        'lxml': lxml is not None,
+        'bs4': True
+    }
+    if available.get(name):
+        return name
+    if name != 'auto':
+        print(f"⚠️ HTML parser backend '{name}' unavailable, choosing automatically")
+    return next(backend for backend in PARSER_BACKENDS if available[backend])
+
+def load_lead_processor():
+    """LeadDataProcessor from prepare_leads.py in the repository root, or None if it cannot be imported"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if root not in sys.path:
+        sys.path.append(root)
+    try:
+        from prepare_leads import LeadDataProcessor
+    except ImportError as e:
+        print(f"⚠️ Lead preparation unavailable: {e}")
+        return None
+    return LeadDataProcessor
+
+class RetryBudget:
+    """Campaign-wide cap on retries, shared by every search in a run"""
+
+    def __init__(self, limit: int):
+        self.remaining = limit
+
+    def acquire(self) -> bool:
+        """Consume one retry; False once the budget is exhausted"""
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+CAMPAIGN_RETRIES = RetryBudget(CAMPAIGN_RETRY_BUDGET)
+
+class StreamingEmailScanner(HTMLParser):
+    """Incremental tokenizer that collects emails while HTML is still arriving.
+
+    Scans the same sources as ``_extract_emails`` (page text, meta contents,
+    anchor hrefs and email inputs). Page text is matched as one continuous
+    string; the unscanned tail is carried over so addresses split across
+    chunks are not lost or truncated.
+    """
+
+    def __init__(self, validator, target: int = STREAM_EMAIL_TARGET):
+        super().__init__(convert_charrefs=True)
+        self.validator = validator
+        self.target = target
+        self.emails = set()
+        self._text = ''
+        self._in_code = False
+
+    @property
+    def done(self) -> bool:
+        return len(self.emails) >= self.target
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'meta':
+            self._scan(attrs.get('content') or '')
+        elif tag == 'a':
+            self._scan(attrs.get('href') or '')
+        elif tag == 'input' and (attrs.get('type') or '').lower() == 'email':
+            self._scan(attrs.get('value') or '')
+        elif tag in ('script', 'style'):
+            self._in_code = True
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style'):
+            self._in_code = False
+
+    def handle_data(self, data):
+        # Like BeautifulSoup's get_text(), script and style bodies are not page text
+        if not self._in_code:
+            self._text += data
+
+    def feed_text(self, text: str) -> None:
+        """Feed a decoded chunk and scan the page text that is safe to scan"""
+        self.feed(text)
+        self._scan_text(final=False)
+
+    def finish(self) -> Set[str]:
+        self.close()
+        self._scan_text(final=True)
+        return self.emails
+
+    def _scan(self, text: str) -> None:
+        for email in EMAIL_PATTERN.findall(text):
+            if self.validator(email):
+                self.emails.add(email.lower())
+
+    def _scan_text(self, final: bool) -> None:
+        text = self._text
+        # Anything touching the end of the buffer may still grow, so leave it for the next chunk
+        consumed = len(text)
+        if not final:
+            while consumed > 0 and (text[consumed - 1].isalnum() or text[consumed - 1] in '._%+-@'):
+                consumed -= 1
+        self._scan(text[:consumed])
+        self._text = text[consumed:]
+
+
 class EnterpriseLeadGenerator(GoogleMapsEngine):
     """Advanced lead processor with international phone validation"""
     
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args,
+                 max_concurrent: int = MAX_CONCURRENT_REQUESTS,
+                 per_host_limit: int = MAX_REQUESTS_PER_HOST,
+                 request_timeout: float = REQUEST_TIMEOUT,
+                 connect_timeout: float = CONNECT_TIMEOUT,
+                 read_timeout: float = READ_TIMEOUT,
+                 retry_budget: Optional[RetryBudget] = None,
+                 streaming: bool = STREAMING_SCAN,
+                 max_page_bytes: int = MAX_PAGE_BYTES,
+                 parser_backend: str = HTML_PARSER_BACKEND,
+                 processor=None,
+                 prepare_batch_size: int = PREPARE_BATCH_SIZE,
+                 **kwargs):
         super().__init__(*args, **kwargs)
         self.leads = []
+        self.max_concurrent = max(1, max_concurrent)
+        self.per_host_limit = max(1, per_host_limit)
+        self.request_timeout = request_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retry_budget = retry_budget or CAMPAIGN_RETRIES
+        self.streaming = streaming
+        self.max_page_bytes = max_page_bytes
+        self.parser_backend = resolve_parser_backend(parser_backend)
+        self.processor = processor  # LeadDataProcessor fed with finished leads while the crawl runs
+        self.prepare_batch_size = max(1, prepare_batch_size)
+        self._pending = []
+        self._preparing = False  # cleared when the processor fails, so the crawl itself still completes
+        self._handoff = None  # single thread: the processor's SQLite indexes are bound to it
+        self._slots = None
         self.country_code = self._detect_country()
         self.field_map = {
             'Title': ['title', 'Title'],
@@ -696,6 +945,51 @@ class EnterpriseLeadGenerator(GoogleMapsEngine):
 
     async def _fetch_website(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
         """AI-powered resilient HTTP client"""
+        return await self._request(session, url, self._read_text)
+
+    async def _read_text(self, response: aiohttp.ClientResponse) -> str:
+        """Body as text, cut off at MAX_RESPONSE_BYTES"""
+        chunks = []
+        received = 0
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            chunks.append(chunk[:MAX_RESPONSE_BYTES - received])
+            received += len(chunks[-1])
+            if received >= MAX_RESPONSE_BYTES:
+                response.close()  # drop the rest of an oversized body instead of draining it into the pool
+                break
+        return b''.join(chunks).decode(self._response_charset(response), errors='replace')
+
+    async def _scan_website(self, session: aiohttp.ClientSession, url: str) -> Optional[Set[str]]:
+        """Streaming variant of fetch + extract that stops early and caps bytes read"""
+        return await self._request(session, url, self._scan_response)
+
+    async def _scan_response(self, response: aiohttp.ClientResponse) -> Set[str]:
+        """Feed the body to a StreamingEmailScanner chunk by chunk"""
+        scanner = StreamingEmailScanner(self._validate_email)
+        decoder = codecs.getincrementaldecoder(self._response_charset(response))(errors='replace')
+        received = 0
+
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            chunk = chunk[:self.max_page_bytes - received]
+            received += len(chunk)
+            scanner.feed_text(decoder.decode(chunk))
+            if scanner.done or received >= self.max_page_bytes:
+                # Drop the rest of the body instead of draining it into the pool
+                response.close()
+                break
+
+        scanner.feed_text(decoder.decode(b'', final=True))
+        return scanner.finish()
+
+    def _response_charset(self, response: aiohttp.ClientResponse) -> str:
+        """Declared charset if Python knows it, otherwise UTF-8"""
+        try:
+            return codecs.lookup(response.charset or 'utf-8').name
+        except LookupError:
+            return 'utf-8'
+
+    async def _request(self, session: aiohttp.ClientSession, url: str, consume):
+        """GET with classified retries; ``consume`` reads the successful response"""
         if not url:
             return None
 
@@ -706,39 +1000,68 @@ class EnterpriseLeadGenerator(GoogleMapsEngine):
         }
 
         for attempt in range(RETRY_ATTEMPTS):
+            retry_after = None
             try:
-                async with session.get(
+                # Hold a connection slot only while talking to the server, never while backing off
+                async with self._slots, session.get(
                     url,
                     headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
-                    ssl=False,
                     allow_redirects=True
                 ) as response:
-                    response.raise_for_status()
-                    return await response.text()
+                    if response.status < 400:
+                        return await consume(response)
+                    if response.status not in RETRYABLE_STATUSES:
+                        print(f"⛔ HTTP {response.status} (permanent): {url}")
+                        return None
+                    retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
             except Exception as e:
-                if attempt == RETRY_ATTEMPTS - 1:
+                if not self._is_retryable_error(e):
+                    print(f"⛔ Permanent failure for {url}: {str(e)[:80]}...")
                     return None
-                await asyncio.sleep(2 ** attempt)
+
+            if attempt == RETRY_ATTEMPTS - 1 or not self.retry_budget.acquire():
+                return None
+            delay = retry_after if retry_after is not None else RETRY_BACKOFF_BASE * 2 ** attempt
+            await asyncio.sleep(min(delay, MAX_RETRY_DELAY))
         return None
 
+    def _is_retryable_error(self, error: Exception) -> bool:
+        """Transient network failures are retried; DNS, TLS and URL errors are permanent"""
+        if isinstance(error, (aiohttp.ClientSSLError, aiohttp.ClientConnectorCertificateError, ssl.SSLError)):
+            return False
+        if isinstance(error, aiohttp.ClientConnectorError):
+            # NXDOMAIN and friends surface as gaierror; only EAI_AGAIN is a temporary resolver failure
+            if isinstance(error.os_error, socket.gaierror):
+                return error.os_error.errno == socket.EAI_AGAIN
+            return True
+        if isinstance(error, (aiohttp.InvalidURL, aiohttp.TooManyRedirects)):
+            return False
+        return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientOSError,
+                                  aiohttp.ServerDisconnectedError, aiohttp.ClientPayloadError))
+
+    def _parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        """Retry-After header as seconds (delta-seconds or HTTP-date form)"""
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
     def _extract_emails(self, html: str) -> Set[str]:
         """Deep-email extraction engine"""
-        soup = BeautifulSoup(html, 'html.parser')
-        email_sources = [
-            soup.get_text(),
-            ' '.join(meta.get('content', '') for meta in soup.find_all('meta')),
-            ' '.join(a['href'] for a in soup.find_all('a', href=True)),
-            ' '.join(input['value'] for input in soup.find_all('input', {'type': 'email'}))
-        ]
-        
+        try:
+            email_sources = PARSER_BACKENDS[self.parser_backend](html)
+        except Exception:
+            # Fast parsers reject some inputs (e.g. empty or XML-declared documents)
+            email_sources = extract_sources_bs4(html)
+
         emails = set()
         for text in email_sources:
-            emails.update(re.findall(
-                r"\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b", 
-                text, 
-                re.IGNORECASE
-            ))
+            emails.update(EMAIL_PATTERN.findall(text))
             
         return {email.lower() for email in emails if self._validate_email(email)}
 
@@ -784,8 +1107,11 @@ class EnterpriseLeadGenerator(GoogleMapsEngine):
                 }
                 
             # Extract emails
-            html = await self._fetch_website(session, url)
-            emails = self._extract_emails(html) if html else set()
+            if self.streaming:
+                emails = await self._scan_website(session, url) or set()
+            else:
+                html = await self._fetch_website(session, url)
+                emails = self._extract_emails(html) if html else set()
             
             return {
                 **standardized,
@@ -805,15 +1131,103 @@ class EnterpriseLeadGenerator(GoogleMapsEngine):
                 'Emails': 'null'
             }
 
+    def _prepared_record(self, lead: Dict) -> Dict:
+        """Lead in the LeadDataProcessor input layout (first email, search country)"""
+        emails = [email for email in lead['Emails'].split(';') if email and email != 'null']
+        return {
+            'Title': lead['Title'],
+            'Address': lead['Address'],
+            'Phone': lead['Phone'],
+            'Country': self.country_code,
+            'Website': lead['Website'],
+            'Email': emails[0] if emails else 'null'
+        }
+
+    async def _in_handoff_thread(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._handoff, func, *args)
+
+    async def _hand_off(self, flush: bool = False) -> None:
+        """Feed buffered leads to the processor in batches, off the event loop and one batch at a time"""
+        while self._preparing and self._pending and (flush or len(self._pending) >= self.prepare_batch_size):
+            batch = self._pending[:self.prepare_batch_size]
+            del self._pending[:len(batch)]
+            try:
+                await self._in_handoff_thread(self.processor.feed_records, batch)
+            except Exception as e:
+                self._stop_preparing('handoff', e)
+
+    def _stop_preparing(self, stage: str, error: Exception) -> None:
+        """Turn lead preparation off for the rest of the run; crawling and the CSV export go on"""
+        if self._preparing:
+            print(f"⚠️ Lead preparation {stage} failed, disabled for the rest of the run: {str(error)[:200]}")
+        self._preparing = False
+        self._pending.clear()
+
+    async def _process_and_hand_off(self, session: aiohttp.ClientSession, lead: Dict) -> Dict:
+        result = await self._process_lead(session, lead)
+        if self._preparing:
+            self._pending.append(self._prepared_record(result))
+            await self._hand_off()
+        return result
+
+    def _build_connector(self) -> aiohttp.TCPConnector:
+        """Pooled connector with global/per-host limits, DNS cache and keep-alive reuse"""
+        return aiohttp.TCPConnector(
+            limit=self.max_concurrent,
+            limit_per_host=self.per_host_limit,
+            use_dns_cache=True,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ssl=False
+        )
+
     async def run(self) -> None:
         """Enterprise execution workflow"""
         await super().run()
-        
-        async with aiohttp.ClientSession() as session:
-            self.leads = await asyncio.gather(*[
-                self._process_lead(session, lead) 
-                for lead in self.entries
-            ])
+
+        timeout = aiohttp.ClientTimeout(
+            total=self.request_timeout,
+            connect=self.connect_timeout,
+            sock_connect=self.connect_timeout,
+            sock_read=self.read_timeout
+        )
+        async with aiohttp.ClientSession(connector=self._build_connector(), timeout=timeout) as session:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+            if not self.processor:
+                self.leads = await asyncio.gather(*[
+                    self._process_lead(session, lead)
+                    for lead in self.entries
+                ])
+                return
+
+            # Platform files grow as leads finish instead of re-reading the CSV afterwards
+            with ThreadPoolExecutor(max_workers=1) as self._handoff:
+                self._preparing = True
+                try:
+                    await self._in_handoff_thread(self.processor.begin_stream)
+                    started = True
+                except Exception as e:
+                    started = False
+                    self._stop_preparing('start', e)
+                completed = False
+                try:
+                    self.leads = await asyncio.gather(*[
+                        self._process_and_hand_off(session, lead)
+                        for lead in self.entries
+                    ])
+                    await self._hand_off(flush=True)
+                    completed = True
+                finally:
+                    if started:
+                        # An aborted stream still closes its files; its contacts are not recorded as exported
+                        prepared = completed and self._preparing
+                        try:
+                            await self._in_handoff_thread(self.processor.end_stream, prepared)
+                            if prepared:
+                                print(f"📦 Prepared platform files in {self.processor.output_dir}")
+                        except Exception as e:
+                            print(f"⚠️ Lead preparation finish failed: {str(e)[:200]}")
+                    self._preparing = False
 
     def export_csv(self, filename: str) -> None:
         """Generate internationalized CSV reports"""
@@ -837,24 +1251,32 @@ def sanitize_filename(text: str) -> str:
     """Generate filesystem-safe names"""
     return re.sub(r'[\\/*?:"<>|]', "", text.replace(",", "_")).strip()[:100]
 
-async def execute_search(query: str, location: str, zoom: int) -> None:
+async def execute_search(query: str, location: str, zoom: int, prepare: bool = PREPARE_LEADS, **engine_options) -> None:
     """Orchestrate complete search workflow"""
     print("\n🚀 Enterprise Lead Generator v7.1")
     print("★★★★★★★★★★★★★★★★★★★★★★★★★★★★")
     
     try:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"leads_{sanitize_filename(query)}_{sanitize_filename(location)}_{zoom}_{timestamp}.csv"
+        processor = None
+        if prepare:
+            LeadDataProcessor = load_lead_processor()
+            if LeadDataProcessor:
+                processor = LeadDataProcessor(filename, PREPARED_OUTPUT_DIR, streaming=True)
+        
         engine = EnterpriseLeadGenerator(
             query=query,
             location=location,
-            zoom=max(min(zoom, VALID_ZOOM_RANGE[1]), VALID_ZOOM_RANGE[0])
+            zoom=max(min(zoom, VALID_ZOOM_RANGE[1]), VALID_ZOOM_RANGE[0]),
+            processor=processor,
+            **engine_options
         )
         
         print("\n🔍 Initiating intelligence gathering...")
         await engine.run()
         
         if engine.leads:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"leads_{sanitize_filename(query)}_{sanitize_filename(location)}_{zoom}_{timestamp}.csv"
             engine.export_csv(filename)
         else:
             print("\n🔍 No results found - recommendations:")
@@ -882,7 +1304,8 @@ def load_configurations(file_path: str) -> List[Dict]:
                 valid_configs.append({
                     'query': config['query'].strip(),
                     'location': config['location'].strip(),
-                    'zoom': max(min(int(config.get('zoom', 15)), VALID_ZOOM_RANGE[1]), VALID_ZOOM_RANGE[0])
+                    'zoom': max(min(int(config.get('zoom', 15)), VALID_ZOOM_RANGE[1]), VALID_ZOOM_RANGE[0]),
+                    **{key: cast(config[key]) for key, cast in ENGINE_OPTION_TYPES.items() if key in config}
                 })
             except Exception as e:
                 print(f"⚠️ Invalid config #{idx}: {str(e)}")
@@ -5,9 +5,11 @@ Enterprise Lead Generation Suite v8.1.1
 - Mobile and WhatsApp number extraction
 - Visit only contact-related pages (about, contact, reach us, etc.)
 - Domain-specific crawling optimization
+- Browser I/O and CPU-bound extraction split across thread and process pools
 """
 import os  # Add this with other imports
 import csv
+import argparse
 import re
 import sys
 import json
@@ -17,7 +19,9 @@ import phonenumbers
 from datetime import datetime
 from urllib.parse import urlparse, urlunparse
 from typing import Dict, List, Set, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -25,9 +29,16 @@ from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
 from py_lead_generation import GoogleMapsEngine
 
+from page_snapshot_store import PageSnapshotStore
+from lead_tracing import LeadTracer
+import sampling_profiler
+from memory_monitor import MemoryMonitor, MEMORY_MONITOR_INTERVAL
+
 # System Configuration
 OUTPUT_FILENAME = "rename_this_file_after_completed.csv"  # User-defined filename
+REPLAY_OUTPUT_FILENAME = "replayed_leads.csv"  # --replay results (rewritten on every replay)
 MAX_CONCURRENT_BROWSERS = 1
+EXTRACTION_PROCESSES = max(1, (os.cpu_count() or 2) - 1)  # CPU stage workers (regex / phonenumbers)
 REQUEST_TIMEOUT = 80
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 DEFAULT_CONFIG_FILE = "search_configs.json"
@@ -75,31 +86,191 @@ LD_WHITELIST = {
 }
 FORBIDDEN_PREFIXES = ('http://www.', 'https://www.', 'http://', 'https://')
 
+# Captures everything the extractors need from a rendered page in a single WebDriver round trip
+SNAPSHOT_SCRIPT = """
+return {
+    url: window.location.href,
+    text: document.body ? document.body.innerText : '',
+    anchors: Array.from(document.querySelectorAll('a[href]')).map(a => [a.href, a.innerText || ''])
+};
+"""
+
+
+class SnapshotElement:
+    """WebElement stand-in for an anchor captured in a page snapshot"""
+
+    def __init__(self, href: str = '', text: str = ''):
+        self.href = href
+        self.text = text
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self.href if name == 'href' else None
+
+
+class SnapshotDriver:
+    """Read-only WebDriver stand-in that serves a captured page snapshot.
+
+    Supports the lookups used by the extractors: the body element, all anchors
+    and ``//a[starts-with(@href, "...")]`` XPath queries.
+    """
+
+    def __init__(self, snapshot: Dict):
+        self.current_url = snapshot.get('url', '')
+        self.body = SnapshotElement(text=snapshot.get('text', ''))
+        self.anchors = [SnapshotElement(href, text) for href, text in snapshot.get('anchors', [])]
+
+    def find_element(self, by: str, value: str) -> SnapshotElement:
+        return self.body
+
+    def find_elements(self, by: str, value: str) -> List[SnapshotElement]:
+        if by == By.TAG_NAME and value == 'a':
+            return list(self.anchors)
+        if by == By.XPATH:
+            prefix = re.search(r'starts-with\(@href,\s*["\']([^"\']+)["\']\)', value)
+            if prefix:
+                return [a for a in self.anchors if a.href.startswith(prefix.group(1))]
+        return []
+
+
+class RecordingDriver:
+    """WebDriver wrapper that saves every page snapshot the crawler takes to a PageSnapshotStore"""
+
+    def __init__(self, driver, store: PageSnapshotStore):
+        self.driver = driver
+        self.store = store
+        self.requested_url = ''
+
+    def get(self, url: str) -> None:
+        self.requested_url = url
+        self.driver.get(url)
+
+    def execute_script(self, script: str, *args):
+        result = self.driver.execute_script(script, *args)
+        if script == SNAPSHOT_SCRIPT and result:
+            try:
+                self.store.put_page(self.requested_url or self.driver.current_url,
+                                    {**result, 'html': self.driver.page_source})
+            except Exception as e:
+                print(f"Snapshot record error: {str(e)[:80]}")
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+
+class TracingDriver:
+    """WebDriver wrapper that traces each page navigation and snapshot"""
+
+    def __init__(self, driver, tracer: LeadTracer):
+        self.driver = driver
+        self.tracer = tracer
+
+    def get(self, url: str) -> None:
+        with self.tracer.span('navigate', url=url) as span:
+            self.driver.get(url)
+            span['outcome'] = 'ok'
+
+    def execute_script(self, script: str, *args):
+        if script != SNAPSHOT_SCRIPT:
+            return self.driver.execute_script(script, *args)
+        with self.tracer.span('snapshot') as span:
+            result = self.driver.execute_script(script, *args)
+            snapshot = result or {}
+            span.update(url=snapshot.get('url', ''), bytes=len((snapshot.get('text') or '').encode('utf-8')),
+                        anchors=len(snapshot.get('anchors') or []))
+            return result
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+
+class ReplayDriver(SnapshotDriver):
+    """SnapshotDriver that navigates by loading pages recorded in a PageSnapshotStore.
+
+    Pages that were never recorded load empty, like an unreachable site.
+    """
+
+    def __init__(self, store: PageSnapshotStore, stats: Dict[str, int]):
+        super().__init__({})
+        self.store = store
+        self.stats = stats
+        self.snapshot = {'url': '', 'text': '', 'anchors': []}
+
+    @property
+    def page_source(self) -> str:
+        return self.snapshot.get('html', '')
+
+    def get(self, url: str) -> None:
+        snapshot = self.store.get_page(url)
+        if snapshot is None:
+            self.stats['missing'] += 1
+            snapshot = {'url': url, 'text': '', 'anchors': []}
+        else:
+            self.stats['served'] += 1
+        super().__init__(snapshot)
+        self.snapshot = snapshot
+
+    def execute_script(self, script: str, *args):
+        return self.snapshot if script == SNAPSHOT_SCRIPT else 0
+
+    def set_page_load_timeout(self, seconds: float) -> None:
+        pass
+
+    def quit(self) -> None:
+        pass
+
+
 class EnterpriseLeadGenerator(GoogleMapsEngine):
     """Enterprise lead processor with single-email extraction"""
+
+    field_map = {
+        'Title': ['title', 'Title'],
+        'Address': ['address', 'Address'],
+        'Phone': ['phone', 'PhoneNumber'],
+        'Website': ['website', 'WebsiteURL']
+    }
     
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, snapshot_store: Optional[PageSnapshotStore] = None,
+                 tracer: Optional[LeadTracer] = None, memory_monitor: Optional[MemoryMonitor] = None, **kwargs):
         super().__init__(*args, **kwargs)
         self.leads = []
         self.country_code = self._detect_country()
-        self.field_map = {
-            'Title': ['title', 'Title'],
-            'Address': ['address', 'Address'],
-            'Phone': ['phone', 'PhoneNumber'],
-            'Website': ['website', 'WebsiteURL']
-        }
+        self.snapshot_store = snapshot_store
+        self.tracer = tracer
+        self.memory_monitor = memory_monitor
+        self._cpu_pool = None
 
     async def run(self) -> None:
-        """Async execution workflow"""
-        await super().run()
-        
+        """Async execution workflow.
+
+        Browser threads only navigate and snapshot pages; the snapshots are
+        queued to a process pool that runs the regex/phonenumbers extractors,
+        so extraction scales with cores instead of contending for the GIL.
+        """
+        with self._span('maps_search', query=self.query, location=self.location) as span:
+            await super().run()
+            span['entries'] = len(self._entries)
+
         loop = asyncio.get_running_loop()
-        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_BROWSERS) as executor:
-            futures = [
-                loop.run_in_executor(executor, self._process_lead, lead)
-                for lead in self.entries
-            ]
-            self.leads = await asyncio.gather(*futures)
+        profile_prefix = sampling_profiler.profiling_prefix()
+        with ProcessPoolExecutor(max_workers=EXTRACTION_PROCESSES,
+                                 mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=sampling_profiler.worker_init if profile_prefix else None,
+                                 initargs=(profile_prefix,) if profile_prefix else ()) as cpu_pool, \
+                ThreadPoolExecutor(max_workers=MAX_CONCURRENT_BROWSERS) as executor:
+            self._cpu_pool = cpu_pool
+            try:
+                futures = [
+                    loop.run_in_executor(executor, self._process_lead, lead)
+                    for lead in self.entries
+                ]
+                self.leads = await asyncio.gather(*futures)
+            finally:
+                self._cpu_pool = None
+
+    def _span(self, name: str, **attrs):
+        """Tracing span around a pipeline step (a no-op without --trace)"""
+        return self.tracer.span(name, **attrs) if self.tracer else nullcontext(attrs)
 
     def _detect_country(self) -> str:
         """Country code detection"""
@@ -465,16 +636,81 @@ class EnterpriseLeadGenerator(GoogleMapsEngine):
 
     def _scroll_page(self, driver: webdriver.Chrome) -> None:
         """Dynamic content loader"""
-        last_height = driver.execute_script("return document.body.scrollHeight")
-        for _ in range(2):  # Limited scroll attempts
-            time.sleep(3)
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-           
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
-                break
-            last_height = new_height
+        with self._span('scroll') as span:
+            last_height = driver.execute_script("return document.body.scrollHeight")
+            for attempt in range(2):  # Limited scroll attempts
+                time.sleep(3)
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                time.sleep(2)
+               
+                new_height = driver.execute_script("return document.body.scrollHeight")
+                span['scrolls'] = attempt + 1
+                if new_height == last_height:
+                    break
+                last_height = new_height
+
+    def _snapshot_page(self, driver: webdriver.Chrome) -> Dict:
+        """I/O stage: capture URL, body text and anchors of the current page"""
+        snapshot = driver.execute_script(SNAPSHOT_SCRIPT) or {}
+        return {
+            'url': snapshot.get('url') or driver.current_url,
+            'text': snapshot.get('text') or '',
+            'anchors': [(href or '', text or '') for href, text in snapshot.get('anchors') or []]
+        }
+
+    def _analyze_snapshot(self, snapshot: Dict, wanted: Set[str]) -> Dict:
+        """Hand a snapshot to the CPU stage and wait for the extracted fields"""
+        with self._span('extract', url=snapshot.get('url', ''), wanted=sorted(wanted)) as span:
+            if self._cpu_pool is None:
+                found = extract_snapshot_contacts(self.country_code, snapshot, wanted)
+            else:
+                found = self._cpu_pool.submit(extract_snapshot_contacts, self.country_code, snapshot, wanted).result()
+            end = time.perf_counter()
+            span['found'] = [field for field in ('email', 'mobile', 'whatsapp') if found.get(field)]
+
+        if self.tracer:
+            # The extractors may have run in a worker process: lay their timings out at the end of the extract span
+            start = end - sum(found['timings'].values())
+            for name, seconds in found['timings'].items():
+                self.tracer.add(f'extract_{name}', start, seconds, {'url': snapshot.get('url', ''),
+                                                                   'outcome': 'found' if found[name] else 'none'})
+                start += seconds
+        return found
+
+    def _extract_page_contacts(self, driver, page_text: str, wanted: Set[str]) -> Dict:
+        """CPU stage: run the email, mobile and WhatsApp extractors on one page (timings are for tracing)"""
+        found = {'email': '', 'mobile': '', 'whatsapp': '', 'timings': {}}
+
+        if 'email' in wanted:
+            start = time.perf_counter()
+            mailto_links = driver.find_elements(By.XPATH, '//a[starts-with(@href, "mailto:")]')
+            for link in mailto_links:
+                href = link.get_attribute('href')
+                if href:
+                    email = href.split('mailto:')[1].split('?')[0].strip().lower()
+                    if self._is_valid_email(email):
+                        found['email'] = email
+
+            # If email not found in mailto links, check page text
+            if not found['email']:
+                potential_emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', page_text)
+                for email in potential_emails:
+                    if self._is_valid_email(email):
+                        found['email'] = email.lower()
+                        break
+            found['timings']['email'] = time.perf_counter() - start
+
+        if 'mobile' in wanted:
+            start = time.perf_counter()
+            found['mobile'] = self._extract_mobile_from_tel_links(driver) or self._extract_mobile_from_text(page_text)
+            found['timings']['mobile'] = time.perf_counter() - start
+
+        if 'whatsapp' in wanted:
+            start = time.perf_counter()
+            found['whatsapp'] = self._extract_whatsapp_from_page(driver, page_text)
+            found['timings']['whatsapp'] = time.perf_counter() - start
+
+        return found
 
     def _extract_emails(self, driver: webdriver.Chrome, base_url: str) -> dict:
         """Extract data from contact-related pages only.
@@ -531,46 +767,20 @@ class EnterpriseLeadGenerator(GoogleMapsEngine):
         try:
             driver.get(base_url)
             self._scroll_page(driver)
-            
-            # Extract email from main page
-            page_text = driver.find_element(By.TAG_NAME, 'body').text
-            mailto_links = driver.find_elements(By.XPATH, '//a[starts-with(@href, "mailto:")]')
-            for link in mailto_links:
-                href = link.get_attribute('href')
-                if href:
-                    email = href.split('mailto:')[1].split('?')[0].strip().lower()
-                    if self._is_valid_email(email):
-                        email_found = email
-            
-            # If email not found in mailto links, check page text
-            if not email_found:
-                potential_emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', page_text)
-                for email in potential_emails:
-                    if self._is_valid_email(email):
-                        email_found = email.lower()
-                        break
-            
-            # Extract mobile and WhatsApp from main page
-            if not mobile_numbers:
-                mobile = self._extract_mobile_from_tel_links(driver)
-                if mobile:
-                    mobile_numbers.append(mobile)
-                else:
-                    mobile = self._extract_mobile_from_text(page_text)
-                    if mobile:
-                        mobile_numbers.append(mobile)
-            
-            if not whatsapp_numbers:
-                whatsapp = self._extract_whatsapp_from_page(driver, page_text)
-                if whatsapp:
-                    whatsapp_numbers.append(whatsapp)
-            
+            snapshot = self._snapshot_page(driver)
+
+            # Extract email, mobile and WhatsApp from main page
+            found = self._analyze_snapshot(snapshot, {'email', 'mobile', 'whatsapp'})
+            email_found = found['email'] or None
+            if found['mobile']:
+                mobile_numbers.append(found['mobile'])
+            if found['whatsapp']:
+                whatsapp_numbers.append(found['whatsapp'])
+
             # Discover all contact-related links on the main page
-            links = driver.find_elements(By.TAG_NAME, 'a')
             contact_urls = []
-            
-            for link in links:
-                href = link.get_attribute('href')
+
+            for href, text in snapshot['anchors']:
                 if href:
                     # Skip if it matches any exclude pattern
                     if any(pattern.search(href) for pattern in exclude_patterns):
@@ -581,7 +791,7 @@ class EnterpriseLeadGenerator(GoogleMapsEngine):
                         # Check if the link is contact-related
                         path_match = contact_pattern.search(parsed.path)
                         query_match = contact_pattern.search(parsed.query)
-                        text_match = contact_pattern.search(link.text.lower())
+                        text_match = contact_pattern.search(text.lower())
                         
                         clean_url = urlunparse(parsed._replace(
                             query='', 
@@ -600,44 +810,23 @@ class EnterpriseLeadGenerator(GoogleMapsEngine):
                 try:
                     driver.get(url)
                     self._scroll_page(driver)
-                    
-                    # Extract email from this page
-                    if not email_found:
-                        mailto_links = driver.find_elements(By.XPATH, '//a[starts-with(@href, "mailto:")]')
-                        for link in mailto_links:
-                            href = link.get_attribute('href')
-                            if href:
-                                email = href.split('mailto:')[1].split('?')[0].strip().lower()
-                                if self._is_valid_email(email):
-                                    email_found = email
-                    
-                    # If email not found in mailto links, check page text
+
+                    # Only ask the CPU stage for the fields still missing
+                    wanted = set()
                     if not email_found:
-                        page_text = driver.find_element(By.TAG_NAME, 'body').text
-                        potential_emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', page_text)
-                        for email in potential_emails:
-                            if self._is_valid_email(email):
-                                email_found = email.lower()
-                                break
-                    else:
-                        # Get page text for phone extraction even if email is found
-                        page_text = driver.find_element(By.TAG_NAME, 'body').text
-                    
-                    # Extract mobile from this page
+                        wanted.add('email')
                     if not mobile_numbers:
-                        mobile = self._extract_mobile_from_tel_links(driver)
-                        if mobile:
-                            mobile_numbers.append(mobile)
-                        else:
-                            mobile = self._extract_mobile_from_text(page_text)
-                            if mobile:
-                                mobile_numbers.append(mobile)
-                    
-                    # Extract WhatsApp from this page
+                        wanted.add('mobile')
                     if not whatsapp_numbers:
-                        whatsapp = self._extract_whatsapp_from_page(driver, page_text)
-                        if whatsapp:
-                            whatsapp_numbers.append(whatsapp)
+                        wanted.add('whatsapp')
+
+                    found = self._analyze_snapshot(self._snapshot_page(driver), wanted)
+                    if found['email']:
+                        email_found = found['email']
+                    if found['mobile']:
+                        mobile_numbers.append(found['mobile'])
+                    if found['whatsapp']:
+                        whatsapp_numbers.append(found['whatsapp'])
                     
                     # If we've found all data, we can stop early
                     if email_found and mobile_numbers and whatsapp_numbers:
@@ -833,48 +1022,80 @@ class EnterpriseLeadGenerator(GoogleMapsEngine):
         tld = email.split('.')[-1]
         return tld in LD_WHITELIST
 
+    def _new_driver(self) -> webdriver.Chrome:
+        """Browser for one lead's website"""
+        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+        driver.set_page_load_timeout(REQUEST_TIMEOUT)
+        return driver
+
     def _process_lead(self, lead: Dict) -> Dict:
         """Lead processing pipeline"""
-        standardized = {
-            key: next((lead[field] for field in fields if field in lead), '')
-            for key, fields in self.field_map.items()
-        }
-        
-        phone_number, country_code = self._process_phone_number(standardized['Phone'])
-        raw_url = standardized['Website']
-        url = self._normalize_url(raw_url)
+        lead_span = self.tracer.lead(title=lead.get('Title', lead.get('title', ''))) if self.tracer else nullcontext({})
+        with sampling_profiler.track('_process_lead'), lead_span as span:
+            with self._span('maps_entry'):
+                standardized = {
+                    key: next((lead[field] for field in fields if field in lead), '')
+                    for key, fields in self.field_map.items()
+                }
+                phone_number, country_code = self._process_phone_number(standardized['Phone'])
 
-        emails = set()
-        mobile = ''
-        whatsapp = ''
+            raw_url = standardized['Website']
+            with self._span('normalize_url', url=raw_url) as url_span:
+                url = self._normalize_url(raw_url)
+                url_span['normalized'] = url
 
-        if url:
-            try:
-                driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-                driver.set_page_load_timeout(REQUEST_TIMEOUT)
-                result = self._extract_emails(driver, url)
-                driver.quit()
-
-                # _extract_emails now returns dict-like info
-                if isinstance(result, dict):
-                    emails = result.get('emails', set()) or set()
-                    mobile = result.get('mobile', '') or ''
-                    whatsapp = result.get('whatsapp', '') or ''
-                else:
-                    # backward-compatible fallback
-                    emails = set(result) if result else set()
-            except Exception as e:
-                print(f"Browser error: {str(e)[:80]}")
+            emails = set()
+            mobile = ''
+            whatsapp = ''
 
-        return {
-            **standardized,
-            'Phone': phone_number,
-            'Country': self.country_code,
-            'Website': url if url else '',
-            'Email': next(iter(emails), 'null'),
-            'mobile_number': mobile,
-            'whatsapp_number': whatsapp
-        }
+            if url:
+                browser = None
+                try:
+                    with self._span('driver_lease'):
+                        browser = driver = self._new_driver()
+                    if self.memory_monitor:
+                        self.memory_monitor.register_driver(browser)
+                    if self.snapshot_store:
+                        driver = RecordingDriver(driver, self.snapshot_store)
+                    if self.tracer:
+                        driver = TracingDriver(driver, self.tracer)
+                    result = self._extract_emails(driver, url)
+
+                    # _extract_emails now returns dict-like info
+                    if isinstance(result, dict):
+                        emails = result.get('emails', set()) or set()
+                        mobile = result.get('mobile', '') or ''
+                        whatsapp = result.get('whatsapp', '') or ''
+                    else:
+                        # backward-compatible fallback
+                        emails = set(result) if result else set()
+                except Exception as e:
+                    print(f"Browser error: {str(e)[:80]}")
+                    span['outcome'] = f"browser error: {str(e)[:80]}"
+                finally:
+                    # Quit even when extraction fails; an unquit driver leaves its Chrome running
+                    if browser is not None:
+                        if self.memory_monitor:
+                            self.memory_monitor.unregister_driver(browser)
+                        try:
+                            browser.quit()
+                        except Exception:
+                            pass
+
+            processed = {
+                **standardized,
+                'Phone': phone_number,
+                'Country': self.country_code,
+                'Website': url if url else '',
+                'Email': next(iter(emails), 'null'),
+                'mobile_number': mobile,
+                'whatsapp_number': whatsapp
+            }
+            if self.snapshot_store:
+                self.snapshot_store.put_lead(lead, self.country_code, processed)
+            span.setdefault('outcome', 'ok' if url else 'no website')
+            span.update(website=url, email=bool(emails), mobile=bool(mobile), whatsapp=bool(whatsapp))
+            return processed
 
     def export_csv(self, filename: str) -> None:
         """Generate consolidated CSV with deduplication"""
@@ -921,11 +1142,74 @@ class EnterpriseLeadGenerator(GoogleMapsEngine):
         except Exception as e:
             print(f"⛔ Export failed: {str(e)}")
 
+def extract_snapshot_contacts(country_code: str, snapshot: Dict, wanted: Set[str]) -> Dict:
+    """Process-pool entry point: extract contact fields from a page snapshot.
+
+    The extractors only depend on the country code, so a bare instance is used
+    instead of constructing a full engine (which would geocode the location).
+    """
+    extractor = EnterpriseLeadGenerator.__new__(EnterpriseLeadGenerator)
+    extractor.country_code = country_code
+    with sampling_profiler.track('extract_snapshot_contacts'):
+        return extractor._extract_page_contacts(SnapshotDriver(snapshot), snapshot['text'], wanted)
+
+class ReplayLeadGenerator(EnterpriseLeadGenerator):
+    """Reruns _process_lead on recorded leads, loading pages from a PageSnapshotStore instead of a browser"""
+
+    def __init__(self, store: PageSnapshotStore, tracer: Optional[LeadTracer] = None):
+        # No Maps search to run, so GoogleMapsEngine.__init__ (geocoding) is skipped
+        self.leads = []
+        self.country_code = ''
+        self.snapshot_store = None
+        self.tracer = tracer
+        self.memory_monitor = None
+        self.replay_store = store
+        self.replay_stats = {'served': 0, 'missing': 0}
+        self._cpu_pool = None
+
+    def _new_driver(self) -> ReplayDriver:
+        return ReplayDriver(self.replay_store, self.replay_stats)
+
+    def _scroll_page(self, driver) -> None:
+        pass  # recorded pages are already fully loaded
+
+def replay_snapshots(store_dir: str, filename: str, tracer: Optional[LeadTracer] = None) -> None:
+    """Rerun the extractors on a recorded crawl and report how many leads' contact fields changed"""
+    print("\n🔁 Replaying recorded crawl...")
+    store = PageSnapshotStore(store_dir)
+    engine = ReplayLeadGenerator(store, tracer)
+    changed = {'Email': 0, 'mobile_number': 0, 'whatsapp_number': 0}
+    start = time.time()
+
+    for record in store.leads():
+        engine.country_code = record['country_code']
+        lead = engine._process_lead(record['entry'])
+        engine.leads.append(lead)
+        for field in changed:
+            if str(lead.get(field, '')) != str(record['result'].get(field, '')):
+                changed[field] += 1
+
+    if not engine.leads:
+        print(f"⛔ No recorded leads in {store_dir}")
+        return
+    stats = engine.replay_stats
+    print(f"✅ Replayed {len(engine.leads)} leads in {time.time() - start:.1f}s "
+          f"({stats['served']} pages from the store, {stats['missing']} never recorded)")
+    print("   Changed vs recording: " + ', '.join(f"{field} {count}" for field, count in changed.items()))
+
+    full_path = os.path.join('Leads_Generated', filename)
+    if os.path.exists(full_path):
+        os.remove(full_path)
+    engine.export_csv(filename)
+
 def sanitize_filename(text: str) -> str:
     """Filename sanitization"""
     return re.sub(r'[\\/*?:"<>|]', "", text.replace(",", "_")).strip()[:100]
 
-async def execute_search(query: str, location: str, zoom: int) -> None:
+async def execute_search(query: str, location: str, zoom: int,
+                         snapshot_store: Optional[PageSnapshotStore] = None,
+                         tracer: Optional[LeadTracer] = None,
+                         memory_monitor: Optional[MemoryMonitor] = None) -> None:
     """Async search orchestration"""
     print("\n🚀 Enterprise Lead Generator v8.1.1")
     print("★★★★★★★★★★★★★★★★★★★★★★★★★★★★")
@@ -935,14 +1219,18 @@ async def execute_search(query: str, location: str, zoom: int) -> None:
         engine = EnterpriseLeadGenerator(
             query=query,
             location=location,
-            zoom=max(min(zoom, VALID_ZOOM_RANGE[1]), VALID_ZOOM_RANGE[0])
+            zoom=max(min(zoom, VALID_ZOOM_RANGE[1]), VALID_ZOOM_RANGE[0]),
+            snapshot_store=snapshot_store,
+            tracer=tracer,
+            memory_monitor=memory_monitor
         )
         
         print("\n🔍 Initiating intelligence gathering...")
         await engine.run()
         
         if engine.leads:
-            engine.export_csv(OUTPUT_FILENAME)  # Use predefined filename
+            with engine._span('export', file=OUTPUT_FILENAME, leads=len(engine.leads)):
+                engine.export_csv(OUTPUT_FILENAME)  # Use predefined filename
 
     except KeyboardInterrupt:
         print("\n🛑 Operation terminated by user")
@@ -973,9 +1261,35 @@ def load_configurations(file_path: str) -> List[Dict]:
 
 async def main():
     """Main executor"""
+    tracer = None
+    memory_monitor = None
     try:
-        config_file = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CONFIG_FILE
-        configs = load_configurations(config_file)
+        parser = argparse.ArgumentParser(description="Google Maps lead crawler")
+        parser.add_argument('config_file', nargs='?', default=DEFAULT_CONFIG_FILE)
+        parser.add_argument('--record', metavar='STORE', help="also save every visited page to this snapshot store")
+        parser.add_argument('--replay', metavar='STORE',
+                            help="rerun the extractors on a recorded snapshot store instead of crawling")
+        parser.add_argument('--trace', metavar='FILE',
+                            help="write per-lead spans to FILE (.jsonl, or Chrome trace-event JSON otherwise)")
+        parser.add_argument('--profile', metavar='DIR', nargs='?', const='profiles',
+                            help="sample where the run spends its time; writes collapsed stacks and a report to DIR")
+        parser.add_argument('--memory-monitor', metavar='SECONDS', type=float, nargs='?',
+                            const=MEMORY_MONITOR_INTERVAL,
+                            help="report memory growth every SECONDS and after each config; reaps leaked Chrome")
+        args = parser.parse_args()
+        if args.trace:
+            tracer = LeadTracer(args.trace)
+        if args.profile:
+            sampling_profiler.enable(sampling_profiler.run_prefix(args.profile, __file__))
+        if args.memory_monitor:
+            memory_monitor = MemoryMonitor(interval=args.memory_monitor).start()
+
+        if args.replay:
+            replay_snapshots(args.replay, REPLAY_OUTPUT_FILENAME, tracer)
+            return
+
+        configs = load_configurations(args.config_file)
+        snapshot_store = PageSnapshotStore(args.record) if args.record else None
         
         if not configs:
             print("No valid configs")
@@ -983,10 +1297,21 @@ async def main():
             
         for config in configs:
             print(f"\nProcessing: {config['query']}")
-            await execute_search(**config)
+            await execute_search(**config, snapshot_store=snapshot_store, tracer=tracer,
+                                 memory_monitor=memory_monitor)
+            if memory_monitor:
+                memory_monitor.checkpoint(f"after {config['query']} in {config['location']}")
             
     except Exception as e:
         print(f"Critical error: {str(e)}")
+    finally:
+        if memory_monitor:
+            memory_monitor.stop()
+        if tracer:
+            tracer.close()
+        profile = sampling_profiler.finish()
+        if profile:
+            print(f"🔬 Profile written to {profile}.txt and {profile}.collapsed")
 
 if __name__ == "__main__":
     try:
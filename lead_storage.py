@@ -0,0 +1,418 @@
+"""
+Indexes and writers behind prepare_leads.py
+- FileLock: cross-process lock for the manifest and suppression indexes shared by parallel runs
+- DisjointSet: union-find used to cluster duplicate leads
+- HashIndex / OnDiskHashIndex: first-seen deduplication of WhatsApp numbers, in RAM or in SQLite
+- BloomFilter / SuppressionIndex: contacts already exported to a platform (--suppress-exported)
+- StreamingXlsxWriter / RollingCsvWriter: constant-memory output files, split at the row limits
+"""
+import math
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Cross-process file locks for state shared by parallel runs (fcntl on POSIX, msvcrt on Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# Optional: xlsxwriter's constant_memory mode for the WhatsApp export (openpyxl write-only otherwise)
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+    import openpyxl
+
+EXCEL_MAX_ROWS = 1048576  # rows per worksheet, header included
+SUPPRESSION_MIN_CAPACITY = 1000000  # identifiers the Bloom filter is sized for before it grows
+SUPPRESSION_ERROR_RATE = 0.01  # Bloom filter false-positive rate (positives are confirmed in SQLite)
+BLOOM_BATCH = 1000000  # hashes per vectorized Bloom filter pass
+SUPPRESSION_CACHE_KB = 256 * 1024  # SQLite page cache per suppression index
+SQLITE_MAX_PARAMS = 999  # bound parameters per statement (SQLite's historical default limit)
+
+
+class FileLock:
+    """Exclusive lock on a file, held across processes (released by the OS if the holder dies)."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.file = None
+    
+    def acquire(self):
+        self.file = open(self.path, 'a+b')
+        if fcntl:
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+            return
+        while True:
+            try:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:  # LK_LOCK gives up after ~10 s
+                continue
+    
+    def release(self):
+        if fcntl:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.file.close()
+        self.file = None
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc):
+        self.release()
+
+
+class DisjointSet:
+    """Union-find over row positions (path halving), used to cluster duplicate leads."""
+    
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+    
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+    
+    def union(self, a: int, b: int):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # Keep the earliest row as the root so merged leads stay at its position
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+    
+    def roots(self) -> np.ndarray:
+        return np.array([self.find(item) for item in range(len(self.parent))], dtype=np.int64)
+
+
+class HashIndex:
+    """Set of 64-bit value hashes held in a sorted NumPy array (8 bytes per member)."""
+    
+    def __init__(self):
+        self.hashes = np.empty(0, dtype=np.uint64)
+    
+    def __len__(self) -> int:
+        return len(self.hashes)
+    
+    def add_new(self, values: np.ndarray) -> np.ndarray:
+        """Add a chunk of strings; return the ones not seen before, in first-seen order."""
+        values = np.asarray(values, dtype=object)
+        hashes = pd.util.hash_array(values)
+        _, first = np.unique(hashes, return_index=True)
+        first.sort()
+        
+        # Binary search against the members collected from earlier chunks
+        candidates = hashes[first]
+        positions = np.searchsorted(self.hashes, candidates)
+        known = positions < len(self.hashes)
+        known[known] = self.hashes[positions[known]] == candidates[known]
+        
+        fresh = first[~known]
+        self.hashes = np.sort(np.concatenate([self.hashes, hashes[fresh]]), kind='stable')
+        return values[fresh]
+    
+    def close(self):
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+
+class OnDiskHashIndex:
+    """HashIndex variant that keeps the 64-bit hashes in a SQLite file instead of RAM.
+    
+    Additions are only committed by close(commit=True), so a persistent index only remembers
+    completed runs.
+    """
+    
+    def __init__(self, path: str, scratch: bool = True):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        if scratch:
+            # Scratch data: skip journaling and fsync
+            self.conn.execute('PRAGMA journal_mode=OFF')
+            self.conn.execute('PRAGMA synchronous=OFF')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS members (hash INTEGER PRIMARY KEY)')
+        self.conn.execute('CREATE TEMP TABLE batch (pos INTEGER PRIMARY KEY, hash INTEGER)')
+    
+    def __len__(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM members').fetchone()[0]
+    
+    def add_new(self, values: np.ndarray) -> np.ndarray:
+        """Add a chunk of strings; return the ones not seen before, in first-seen order."""
+        values = np.asarray(values, dtype=object)
+        hashes = pd.util.hash_array(values).view(np.int64)
+        _, first = np.unique(hashes, return_index=True)
+        first.sort()
+        
+        self.conn.execute('DELETE FROM batch')
+        self.conn.executemany('INSERT INTO batch VALUES (?, ?)', zip(first.tolist(), hashes[first].tolist()))
+        known = {pos for (pos,) in self.conn.execute(
+            'SELECT pos FROM batch WHERE hash IN (SELECT hash FROM members)')}
+        self.conn.execute('INSERT OR IGNORE INTO members SELECT hash FROM batch')
+        return values[[pos for pos in first.tolist() if pos not in known]]
+    
+    def close(self, remove: bool = True, commit: bool = False):
+        if commit and not remove:
+            self.conn.commit()
+        self.conn.close()
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class BloomFilter:
+    """Bit-array Bloom filter over 64-bit hashes, vectorized with NumPy (double hashing)."""
+    
+    def __init__(self, capacity: int, error_rate: float = SUPPRESSION_ERROR_RATE, bits: Optional[np.ndarray] = None):
+        self.capacity = capacity
+        self.size = int(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bits if bits is not None else np.zeros((self.size + 7) // 8, dtype=np.uint8)
+    
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        """Bit positions, one row of hash_count per hash."""
+        h1 = hashes & np.uint64(0xffffffff)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        rounds = np.arange(self.hash_count, dtype=np.uint64)
+        return (h1[:, None] + rounds[None, :] * h2[:, None]) % np.uint64(self.size)
+    
+    def add(self, hashes: np.ndarray):
+        for start in range(0, len(hashes), BLOOM_BATCH):
+            positions = self._positions(hashes[start:start + BLOOM_BATCH]).ravel()
+            masks = np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+            np.bitwise_or.at(self.bits, positions >> np.uint64(3), masks)
+    
+    def might_contain(self, hashes: np.ndarray) -> np.ndarray:
+        found = np.empty(len(hashes), dtype=bool)
+        for start in range(0, len(hashes), BLOOM_BATCH):
+            positions = self._positions(hashes[start:start + BLOOM_BATCH])
+            bits = self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)
+            found[start:start + BLOOM_BATCH] = (bits & 1).all(axis=1)
+        return found
+
+
+class SuppressionIndex:
+    """64-bit hashes of identifiers already exported to one platform, kept across runs.
+    
+    SQLite holds the members; an in-memory Bloom filter (saved next to it) answers most
+    lookups so only its positives are confirmed with a query. Additions become permanent
+    when the index is closed with commit=True.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.bloom_path = os.path.splitext(path)[0] + '.bloom.npz'
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(f'PRAGMA cache_size=-{SUPPRESSION_CACHE_KB}')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS exported (hash INTEGER PRIMARY KEY)')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)')
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'count'").fetchone()
+        self.count = row[0] if row else 0
+        self.bloom = self._load_bloom()
+    
+    def _load_bloom(self) -> BloomFilter:
+        """Saved filter if it matches the table, otherwise rebuilt from the exported hashes."""
+        if os.path.exists(self.bloom_path):
+            saved = np.load(self.bloom_path)
+            if int(saved['count']) == self.count:
+                return BloomFilter(int(saved['capacity']), bits=saved['bits'])
+        
+        bloom = BloomFilter(max(SUPPRESSION_MIN_CAPACITY, 2 * self.count))
+        cursor = self.conn.execute('SELECT hash FROM exported')
+        while True:
+            rows = cursor.fetchmany(BLOOM_BATCH)
+            if not rows:
+                break
+            bloom.add(np.fromiter((value for (value,) in rows), dtype=np.int64, count=len(rows)).view(np.uint64))
+        return bloom
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Vectorized membership test for an array of uint64 hashes."""
+        found = self.bloom.might_contain(hashes)
+        if found.any():
+            # Confirm the Bloom filter's positives with batched primary-key lookups (SQLite keys are signed)
+            candidates = np.unique(hashes[found].view(np.int64)).tolist()
+            known = []
+            for start in range(0, len(candidates), SQLITE_MAX_PARAMS):
+                batch = candidates[start:start + SQLITE_MAX_PARAMS]
+                known.extend(value for (value,) in self.conn.execute(
+                    f"SELECT hash FROM exported WHERE hash IN ({','.join('?' * len(batch))})", batch))
+            found[found] = np.isin(hashes[found], np.array(known, dtype=np.int64).view(np.uint64))
+        return found
+    
+    def add(self, hashes: np.ndarray):
+        keys = np.unique(hashes.view(np.int64))
+        if not len(keys):
+            return
+        before = self.conn.total_changes
+        self.conn.executemany('INSERT OR IGNORE INTO exported VALUES (?)', ((value,) for value in keys.tolist()))
+        self.count += self.conn.total_changes - before
+        if self.count > self.bloom.capacity:
+            self.bloom = self._load_bloom()
+        else:
+            self.bloom.add(keys.view(np.uint64))
+    
+    def close(self, commit: bool = True):
+        if commit:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('count', ?)", (self.count,))
+            self.conn.commit()
+            np.savez(self.bloom_path, bits=self.bloom.bits, capacity=self.bloom.capacity, count=self.count)
+        else:
+            self.conn.rollback()
+        self.conn.close()
+
+
+class StreamingXlsxWriter:
+    """Single-column workbook written row by row in constant memory.
+    
+    Starts a new '<stem>_part_N.xlsx' file at Excel's row limit; a single part is
+    renamed to '<stem>.xlsx' on close.
+    """
+    
+    def __init__(self, stem: str, header: str, max_rows: int = EXCEL_MAX_ROWS, write_empty: bool = True):
+        self.stem = stem
+        self.header = header
+        self.max_rows = max_rows  # including the header row
+        self.write_empty = write_empty  # False: no file at all when nothing was written
+        self.part = 0
+        self.row = 0
+        self.rows = 0
+        self.workbook = None
+        self.worksheet = None
+    
+    def _part_path(self, part: int) -> str:
+        return f"{self.stem}_part_{part}.xlsx"
+    
+    def _open_part(self):
+        self._close_part()
+        self.part += 1
+        if xlsxwriter:
+            self.workbook = xlsxwriter.Workbook(self._part_path(self.part), {'constant_memory': True})
+            self.worksheet = self.workbook.add_worksheet()
+            self.worksheet.write_string(0, 0, self.header)
+        else:
+            self.workbook = openpyxl.Workbook(write_only=True)
+            self.worksheet = self.workbook.create_sheet()
+            self.worksheet.append([self.header])
+        self.row = 1
+    
+    def _close_part(self):
+        if self.workbook is None:
+            return
+        if xlsxwriter:
+            self.workbook.close()
+        else:
+            self.workbook.save(self._part_path(self.part))
+        self.workbook = self.worksheet = None
+    
+    def write(self, values):
+        for value in values:
+            if self.part == 0 or self.row == self.max_rows:
+                self._open_part()
+            if xlsxwriter:
+                self.worksheet.write_string(self.row, 0, value)
+            else:
+                self.worksheet.append([value])
+            self.row += 1
+            self.rows += 1
+    
+    def close(self) -> List[str]:
+        """Finish the open part and return the written paths."""
+        if self.part == 0:
+            if not self.write_empty:
+                return []
+            self._open_part()
+        self._close_part()
+        if self.part == 1:
+            os.replace(self._part_path(1), f"{self.stem}.xlsx")
+            return [f"{self.stem}.xlsx"]
+        return [self._part_path(part) for part in range(1, self.part + 1)]
+    
+    def discard(self):
+        """Close and delete every part written so far."""
+        self._close_part()
+        for path in [f"{self.stem}.xlsx", *(self._part_path(part) for part in range(1, self.part + 1))]:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class RollingCsvWriter:
+    """Appends frames to '<stem>_part_N.csv', starting a new part every max_rows rows.
+    
+    A single part is renamed to '<stem>.csv' on close, matching the in-memory writer's names.
+    """
+    
+    def __init__(self, stem: str, max_rows: int, part: int = 0, rows_in_part: int = 0, rows: int = 0):
+        self.stem = stem
+        self.max_rows = max_rows
+        # A saved state() resumes appending to the files of an earlier run
+        self.part = part
+        self.rows_in_part = rows_in_part
+        self.rows = rows
+        # Where rollback() returns to: the resumed state and the size of its last part
+        self._start = self.state()
+        self._start_size = os.path.getsize(self._existing_path(part)) if part else 0
+    
+    def _part_path(self, part: int) -> str:
+        return f"{self.stem}_part_{part}.csv"
+    
+    def _existing_path(self, part: int) -> str:
+        """Path of a part on disk; a closed single part has been renamed to '<stem>.csv'."""
+        path = self._part_path(part)
+        return f"{self.stem}.csv" if part == 1 and not os.path.exists(path) else path
+    
+    def state(self) -> Dict[str, int]:
+        return {'part': self.part, 'rows_in_part': self.rows_in_part, 'rows': self.rows}
+    
+    def write(self, df: pd.DataFrame):
+        if self.part == 0:
+            self.part = 1
+            df.iloc[:0].to_csv(self._part_path(1), index=False, header=True)
+        elif self.part == 1 and not os.path.exists(self._part_path(1)):
+            # Resuming: the single part was renamed to '<stem>.csv' when it was closed
+            os.replace(f"{self.stem}.csv", self._part_path(1))
+        while len(df):
+            if self.rows_in_part == self.max_rows:
+                self.part += 1
+                self.rows_in_part = 0
+                df.iloc[:0].to_csv(self._part_path(self.part), index=False, header=True)
+            piece = df.iloc[:self.max_rows - self.rows_in_part]
+            piece.to_csv(self._part_path(self.part), mode='a', index=False, header=False)
+            self.rows_in_part += len(piece)
+            self.rows += len(piece)
+            df = df.iloc[len(piece):]
+    
+    def close(self) -> List[str]:
+        """Finalize file names and return the written paths."""
+        if self.part == 0:
+            return []
+        if self.part == 1:
+            if os.path.exists(self._part_path(1)):
+                os.replace(self._part_path(1), f"{self.stem}.csv")
+            return [f"{self.stem}.csv"]
+        return [self._part_path(part) for part in range(1, self.part + 1)]
+    
+    def rollback(self) -> List[str]:
+        """Drop every row written since the writer was created and close it again."""
+        start = self._start['part']
+        for part in range(start + 1, self.part + 1):
+            path = self._existing_path(part)
+            if os.path.exists(path):
+                os.remove(path)
+        if start:
+            with open(self._existing_path(start), 'r+b') as f:
+                f.truncate(self._start_size)
+        self.part, self.rows_in_part, self.rows = start, self._start['rows_in_part'], self._start['rows']
+        return self.close()
@@ -0,0 +1,87 @@
+"""
+Per-lead span tracing for the Selenium crawlers (--trace FILE)
+- Spans: Maps search and entry, URL normalization, driver lease, page navigation, scroll, snapshot,
+  each extractor, export; every span carries its lead number and attributes (URL, bytes, outcome)
+- FILE ending in .jsonl: one span per line, for grep/pandas
+- Any other FILE: Chrome trace-event JSON, for chrome://tracing, Perfetto or speedscope
+  (one row per browser thread, so a slow lead shows as one long bar with its pages nested under it)
+"""
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class LeadTracer:
+    """Thread-safe span writer; spans are flushed to FILE as they finish"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.jsonl = path.endswith('.jsonl')
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._leads = 0
+        self._events = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'w', encoding='utf-8')
+        if not self.jsonl:
+            self._file.write('[\n')
+
+    def _write(self, event: Dict) -> None:
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file.closed:
+                return
+            if not self.jsonl and self._events:
+                self._file.write(',\n')
+            self._file.write(line if not self.jsonl else line + '\n')
+            self._events += 1
+
+    def add(self, name: str, start: float, duration: float, attrs: Optional[Dict] = None) -> None:
+        """Record a finished span; start is a time.perf_counter() value"""
+        args = {'lead': getattr(self._local, 'lead', None), **(attrs or {})}
+        if self.jsonl:
+            self._write({'span': name, 'start_s': round(start - self._origin, 6), 'duration_s': round(duration, 6),
+                         'thread': threading.current_thread().name, **args})
+        else:
+            self._write({'name': name, 'cat': 'lead', 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                         'ts': round((start - self._origin) * 1e6, 1), 'dur': round(duration * 1e6, 1), 'args': args})
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Time the block; the yielded dict can be given more attributes (e.g. outcome) before it ends"""
+        start = time.perf_counter()
+        try:
+            yield attrs
+        except Exception as e:
+            attrs.setdefault('outcome', f'error: {str(e)[:80]}')
+            raise
+        finally:
+            self.add(name, start, time.perf_counter() - start, attrs)
+
+    @contextmanager
+    def lead(self, **attrs):
+        """Span of one lead; spans started on this thread inside it are tagged with its number"""
+        with self._lock:
+            self._leads += 1
+            number = self._leads
+        previous = getattr(self._local, 'lead', None)
+        self._local.lead = number
+        try:
+            with self.span('lead', **attrs) as span_attrs:
+                yield span_attrs
+        finally:
+            self._local.lead = previous
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            if not self.jsonl:
+                self._file.write('\n]\n')
+            self._file.close()
+        print(f"🧭 Trace: {self._events} spans from {self._leads} leads written to {self.path}")
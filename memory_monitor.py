@@ -0,0 +1,212 @@
+"""
+Memory monitor for long multi-config crawler runs (--memory-monitor [SECONDS])
+- Periodic tracemalloc snapshots of the Python process; each report lists the top allocation growth sites
+  since the previous snapshot (and checkpoint() adds one between search configs)
+- RSS of the process and of the Selenium drivers' chromedriver/Chrome processes (needs psutil)
+- Alerts when the process or Chrome RSS passes its threshold; processes of released drivers that are
+  still running (left behind by crashed or unquit drivers) are then terminated, recycling their memory.
+  Only processes seen under a registered chromedriver are ever reaped, never other Chromium instances
+  (such as Playwright's for the Maps search)
+"""
+import os
+import time
+import threading
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+# Optional: process and Chrome RSS, and reaping leaked Chrome processes
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MEMORY_MONITOR_INTERVAL = 60  # seconds between snapshots
+TRACE_FRAMES = 1  # stack depth tracemalloc keeps per allocation (deeper is slower)
+TOP_GROWTH = 10  # growth sites listed per report
+MIN_GROWTH_KB = 64  # smaller growth sites are noise between snapshots
+PROCESS_RSS_ALERT_MB = 2048
+CHROME_RSS_ALERT_MB = 4096
+LEAK_GRACE_SECONDS = 30  # a released driver's processes may take this long to exit after quit()
+IGNORED_FILES = (tracemalloc.__file__, __file__, '<frozen importlib._bootstrap>', '<frozen importlib._bootstrap_external>')
+
+
+class MemoryMonitor:
+    """Background memory reporter; drivers are registered while in use so their leftover processes can be found"""
+
+    def __init__(self, interval: float = MEMORY_MONITOR_INTERVAL, top: int = TOP_GROWTH,
+                 process_alert_mb: float = PROCESS_RSS_ALERT_MB, chrome_alert_mb: float = CHROME_RSS_ALERT_MB):
+        self.interval = interval
+        self.top = top
+        self.process_alert_mb = process_alert_mb
+        self.chrome_alert_mb = chrome_alert_mb
+        self.process = psutil.Process() if psutil else None
+        self.alerts = 0
+        self.reaped = 0
+        self._drivers: Dict[int, List] = {}  # id(driver) -> [chromedriver process, processes seen under it]
+        self._released: List[Tuple[float, object]] = []  # (release time, process) of unregistered drivers
+        self._started_tracing = False
+        self._lock = threading.Lock()
+        self._checkpoint_lock = threading.Lock()  # the thread and checkpoint() callers share the last snapshot
+        self._snapshot = None
+        self._rss_mb = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='memory-monitor', daemon=True)
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._started_tracing = True
+        self._snapshot = self._take_snapshot()
+        self._rss_mb = self._process_rss_mb()
+        if not self.process:
+            print("⚠️ Memory monitor: psutil not installed, Chrome RSS and leak reaping are off")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.checkpoint('final')
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def register_driver(self, driver) -> None:
+        """Track a driver's chromedriver process and the Chrome processes under it while the driver is in use"""
+        service_process = getattr(getattr(driver, 'service', None), 'process', None)
+        pid = getattr(service_process, 'pid', None)
+        if not (pid and self.process):
+            return
+        try:
+            processes = self._with_children([psutil.Process(pid)])
+        except psutil.Error:
+            return
+        with self._lock:
+            self._drivers[id(driver)] = processes
+
+    def unregister_driver(self, driver) -> None:
+        """Call before quit(): the driver's processes still running LEAK_GRACE_SECONDS later are leaks"""
+        with self._lock:
+            processes = self._drivers.pop(id(driver), None)
+        if processes:
+            released = [(time.time(), process) for process in self._with_children(processes)]
+            with self._lock:
+                self._released.extend(released)
+
+    @staticmethod
+    def _running(process) -> bool:
+        try:
+            return process.is_running() and process.status() != psutil.STATUS_ZOMBIE
+        except psutil.Error:
+            return False
+
+    @staticmethod
+    def _with_children(processes: List) -> List:
+        """processes plus any running descendants not listed yet (Chrome starts renderers as it goes)"""
+        found = {process.pid: process for process in processes}
+        for process in processes:
+            try:
+                for child in process.children(recursive=True):
+                    found.setdefault(child.pid, child)
+            except psutil.Error:
+                pass
+        return list(found.values())
+
+    def _take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in IGNORED_FILES])
+
+    def _process_rss_mb(self) -> Optional[float]:
+        return self.process.memory_info().rss / 2**20 if self.process else None
+
+    def _chrome_processes(self) -> List:
+        """Running processes of registered drivers and of released drivers that have not exited"""
+        if not self.process:
+            return []
+        with self._lock:
+            drivers = list(self._drivers.items())
+        for key, processes in drivers:
+            processes = self._with_children(processes)
+            with self._lock:
+                if key in self._drivers:
+                    self._drivers[key] = processes
+        with self._lock:
+            self._released = [(released, process) for released, process in self._released if self._running(process)]
+            tracked = [process for processes in self._drivers.values() for process in processes]
+            tracked += [process for _, process in self._released]
+        return [process for process in {process.pid: process for process in tracked}.values() if self._running(process)]
+
+    def _chrome_rss_mb(self, processes: List) -> float:
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / 2**20
+
+    def reap_leaked_chrome(self) -> int:
+        """Terminate processes of drivers released more than LEAK_GRACE_SECONDS ago that are still running"""
+        if not self.process:
+            return 0
+        now = time.time()
+        with self._lock:
+            live = {process.pid for processes in self._drivers.values() for process in processes}
+            leaked = [process for released, process in self._released
+                      if now - released > LEAK_GRACE_SECONDS and process.pid not in live and self._running(process)]
+        for process in leaked:
+            try:
+                process.terminate()
+            except psutil.Error:
+                pass
+        _, alive = psutil.wait_procs(leaked, timeout=5)
+        for process in alive:
+            try:
+                process.kill()
+            except psutil.Error:
+                pass
+        self.reaped += len(leaked)
+        return len(leaked)
+
+    def checkpoint(self, label: str = '') -> None:
+        """Report memory now: RSS, traced Python memory and the top growth sites since the last report"""
+        with self._checkpoint_lock:
+            self._checkpoint(label)
+
+    def _checkpoint(self, label: str) -> None:
+        snapshot = self._take_snapshot()
+        growth = [stat for stat in snapshot.compare_to(self._snapshot, 'lineno') if stat.size_diff >= MIN_GROWTH_KB * 1024][:self.top]
+        self._snapshot = snapshot
+        traced_mb = sum(stat.size for stat in snapshot.statistics('filename')) / 2**20
+
+        rss_mb = self._process_rss_mb()
+        line = f"🧠 Memory{f' ({label})' if label else ''}: traced {traced_mb:.1f} MB"
+        if rss_mb is not None:
+            line += f", RSS {rss_mb:.0f} MB ({rss_mb - self._rss_mb:+.0f})"
+            self._rss_mb = rss_mb
+        chrome = self._chrome_processes()
+        chrome_mb = self._chrome_rss_mb(chrome)
+        if self.process:
+            line += f", Chrome {len(chrome)} processes {chrome_mb:.0f} MB"
+        print(line)
+        for stat in growth:
+            frame = stat.traceback[0]
+            print(f"   {stat.size_diff / 2**20:+.1f} MB ({stat.count_diff:+d} blocks) "
+                  f"{os.path.relpath(frame.filename) if frame.filename.startswith(os.getcwd()) else frame.filename}"
+                  f":{frame.lineno}")
+
+        if rss_mb is not None and rss_mb > self.process_alert_mb:
+            self.alerts += 1
+            print(f"⚠️ Memory alert: process RSS {rss_mb:.0f} MB is over {self.process_alert_mb:.0f} MB")
+        if chrome_mb > self.chrome_alert_mb:
+            self.alerts += 1
+            reaped = self.reap_leaked_chrome()
+            print(f"⚠️ Memory alert: Chrome RSS {chrome_mb:.0f} MB is over {self.chrome_alert_mb:.0f} MB; "
+                  f"terminated {reaped} leaked Chrome processes")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.checkpoint()
+            except Exception as e:
+                print(f"Memory monitor error: {str(e)[:80]}")
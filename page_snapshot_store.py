@@ -0,0 +1,99 @@
+"""
+Record-and-replay store of crawled page snapshots
+- objects/ab/<sha256>.json.gz: one page (final URL, body text, anchors, raw HTML), named by its content hash,
+  so a page seen by several crawls is stored once
+- pages.jsonl: requested URL -> snapshot hash, one line per visit (the latest visit wins on replay)
+- leads.jsonl: Maps entry, country code and crawler result per lead, replayed through the extractors
+
+Used by the Selenium crawlers' --record and --replay options.
+"""
+import os
+import gzip
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+
+class PageSnapshotStore:
+    """Append-only, content-addressed snapshot store; safe to share between browser threads"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.pages_file = os.path.join(root, 'pages.jsonl')
+        self.leads_file = os.path.join(root, 'leads.jsonl')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pages = None  # requested URL -> hash, loaded on first lookup
+
+    @staticmethod
+    def page_key(url: str) -> str:
+        """Lookup key of a requested URL (the crawlers strip trailing slashes inconsistently)"""
+        return url.split('#', 1)[0].rstrip('/')
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f'{digest}.json.gz')
+
+    def _append(self, path: str, record: Dict) -> None:
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock, open(path, 'a', encoding='utf-8') as f:
+            f.write(line)
+
+    def put_page(self, requested_url: str, snapshot: Dict) -> str:
+        """Store one visited page; returns its content hash"""
+        payload = json.dumps({
+            'url': snapshot.get('url') or requested_url,
+            'text': snapshot.get('text') or '',
+            'anchors': [[href or '', text or ''] for href, text in snapshot.get('anchors') or []],
+            'html': snapshot.get('html') or ''
+        }, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        digest = hashlib.sha256(payload).hexdigest()
+
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+
+        self._append(self.pages_file, {
+            'url': requested_url,
+            'object': digest,
+            'recorded': datetime.now().isoformat(timespec='seconds')
+        })
+        if self._pages is not None:
+            self._pages[self.page_key(requested_url)] = digest
+        return digest
+
+    def put_lead(self, entry: Dict, country_code: str, result: Dict) -> None:
+        """Store the Maps entry a lead was processed from, with the crawler's result for comparison"""
+        self._append(self.leads_file, {'entry': entry, 'country_code': country_code, 'result': result})
+
+    def get_page(self, url: str) -> Optional[Dict]:
+        """Latest snapshot recorded for a requested URL, or None"""
+        if self._pages is None:
+            pages = {}
+            if os.path.exists(self.pages_file):
+                with open(self.pages_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            pages[self.page_key(record['url'])] = record['object']
+            self._pages = pages
+        digest = self._pages.get(self.page_key(url))
+        if not digest:
+            return None
+        with gzip.open(self._object_path(digest), 'rb') as f:
+            return json.loads(f.read())
+
+    def leads(self) -> Iterator[Dict]:
+        """Recorded leads in crawl order"""
+        if not os.path.exists(self.leads_file):
+            return
+        with open(self.leads_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -1,11 +1,36 @@
 import pandas as pd
+import numpy as np
+import argparse
+import glob
 import hashlib
+import io
+import json
 import re
 import os
-from typing import Dict, List, Tuple, Optional
+import time
+from typing import Callable, Dict, List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime
+import multiprocessing
 import logging
 
+import sampling_profiler
+from lead_storage import (DisjointSet, FileLock, HashIndex, OnDiskHashIndex, RollingCsvWriter,
+                          StreamingXlsxWriter, SuppressionIndex)
+
+# Optional: calling codes for E.164 phone normalization of national-format numbers
+try:
+    import phonenumbers
+except ImportError:
+    phonenumbers = None
+
+# Optional: pyarrow for the Parquet cache of enriched leads
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -15,47 +40,361 @@ logging.basicConfig(
     ]
 )
 
+HASH_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # processes for large hashing batches
+HASH_PARALLEL_MIN = 500000  # distinct values below this are hashed in-process
+MANIFEST_FILE = 'manifest.json'  # per-input watermarks for incremental runs, in the output root
+FINGERPRINT_BYTES = 4096  # bytes before the watermark hashed to detect rewritten inputs
+DELTA_BLOCK_BYTES = 16 * 1024 * 1024  # appended bytes parsed per incremental chunk
+WATCH_INTERVAL = 30  # seconds between directory scans in --watch mode
+SUPPRESSION_DIR = 'suppression'  # per-platform exported-contact indexes, in the output root
+CACHE_DIR = 'cache'  # Parquet copies of enriched frames, in the output root
+CACHE_VERSION = 1  # bump when the enriched columns change so stale caches are ignored
+CACHE_ROW_GROUP = 100000  # rows per Parquet row group (the unit predicate pushdown skips)
+CACHE_HASH_BLOCK = 1024 * 1024  # bytes read per step when hashing the input
+CACHE_CATEGORICAL = ['Country', 'segment']  # low-cardinality columns stored and loaded as categories
+PREPARE_WORKERS = os.cpu_count() or 1  # processes preparing input files in parallel
+MERGED_NAME = 'merged_leads'  # output name of --merge runs
+
+
+def sha256_hex_batch(values: List[str]) -> List[str]:
+    """SHA-256 hex digests of normalized identifiers ('' stays '')."""
+    sha256 = hashlib.sha256
+    return [sha256(value.encode('utf-8')).hexdigest() if value else '' for value in values]
+
+
+def sha256_hex(values: np.ndarray, workers: Optional[int] = None) -> np.ndarray:
+    """Hash an array of strings, fanning large arrays out over a process pool (HASH_WORKERS by default)."""
+    workers = workers or HASH_WORKERS
+    if workers <= 1 or len(values) < HASH_PARALLEL_MIN:
+        return np.array(sha256_hex_batch(values.tolist()), dtype=object)
+    
+    batches = [batch.tolist() for batch in np.array_split(values, workers * 4)]
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        digests = [digest for batch in pool.map(sha256_hex_batch, batches) for digest in batch]
+    return np.array(digests, dtype=object)
+
+
+def last_record_end(data: bytes) -> int:
+    """Offset just past the last newline outside a quoted CSV field (0 if there is none)."""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buf == ord('\n'))
+    if not len(newlines):
+        return 0
+    quotes = np.cumsum(buf == ord('"'))
+    closed = newlines[quotes[newlines] % 2 == 0]
+    return int(closed[-1]) + 1 if len(closed) else 0
+
+
+def read_enriched(path: str, columns: Optional[List[str]] = None, filters=None) -> pd.DataFrame:
+    """Load an enriched-lead Parquet cache, reading only the requested columns and row groups.
+    
+    filters use the pyarrow form, e.g. [('segment', '==', 'both_email_phone')].
+    """
+    df = pd.read_parquet(path, engine='pyarrow', columns=columns, filters=filters)
+    return df.sort_index()  # rows are stored grouped by segment
+
+
 class LeadDataProcessor:
     """Professional lead data processor for multiple marketing platforms"""
+
+    # Universal postal code formats (ordered from most specific to most general), used as one
+    # combined alternation when the lead's country has no entry in COUNTRY_POSTAL_FORMATS
+    POSTAL_FORMATS = [
+        r'\d{5}(?:-\d{4})?',                    # US ZIP code (5 digits or 5+4)
+        r'[A-Z]\d[A-Z] ?\d[A-Z]\d',             # Canadian postal code (A1A 1A1)
+        r'[A-Z]{1,2}\d[A-Z\d]? ?\d[A-Z]{2}',    # UK postal code (various formats)
+        r'[A-Z]\d{2} ?[A-Z]\d{3}',              # Irish postal code (D01 W123 or A12 B345)
+        r'\d{4} ?[A-Z]{2}',                     # Dutch postal code (1234 AB)
+        r'[A-Z]\d{4}[A-Z]{3}',                  # Argentine postal code (A1234ABC)
+        r'JM[A-Z]{3}\s?\d{2}',                  # Jamaican postal code (JMABC 12)
+        r'BB\d{5}',                             # Barbados postal code (BB12345)
+        r'HT\d{4}',                             # Haitian postal code (HT1234)
+        r'AD\d{3}',                             # Andorran postal code (AD123)
+        r'M[TA][A-Z]\s?\d{4}',                  # Maltese postal code (MTA 1234 or MTB 1234)
+        r'AZ\s?\d{4}',                          # Azerbaijani postal code (AZ 1234)
+        r'MD-\d{4}',                            # Moldovan postal code (MD-1234)
+        r'\d{4}-\d{3}',                         # Portuguese postal code (1234-567)
+        r'\d{5}-\d{3}',                         # Brazilian postal code (12345-678)
+        r'\d{3}-\d{4}',                         # Japanese postal code (123-4567)
+        r'\d{2}-\d{3}',                         # Polish postal code (12-345)
+        r'\d{3}\s?\d{2}',                       # Czech, Slovak, Swedish, Greek, Taiwanese (123 45)
+        r'\d{5}-?\d{5}',                        # Iranian postal code (12345-6789)
+        r'\d{5}',                               # 5-digit codes (Germany, France, South Korea, etc.)
+        r'\d{6}',                               # 6-digit codes (India, China, Russia, Singapore, etc.)
+        r'\d{7}',                               # Chilean postal code (7 digits)
+        r'\d{4}',                               # 4-digit codes (Australia, South Africa, Switzerland, etc.)
+        r'\d{3}',                               # Icelandic postal code (3 digits)
+        r'\d{3,10}(?:[-\s]\d{3,10})*'           # Generic (3-10 digits, optionally with dash or space)
+    ]
     
-    def __init__(self, input_file: str, output_dir: str = "Prepared_Data_Platform_Specific"):
+    # Postal code format by ISO country code (the Country column written by the crawlers);
+    # None marks countries without postal codes
+    COUNTRY_POSTAL_FORMATS = {
+        'US': r'\d{5}(?:-\d{4})?',
+        'CA': r'[A-Z]\d[A-Z] ?\d[A-Z]\d',
+        **dict.fromkeys(['GB', 'IM', 'JE', 'GG'], r'[A-Z]{1,2}\d[A-Z\d]? ?\d[A-Z]{2}'),
+        'IE': r'[A-Z]\d[\dW] ?[A-Z\d]{4}',
+        'NL': r'\d{4} ?[A-Z]{2}',
+        'AR': r'[A-Z]\d{4}[A-Z]{3}|\d{4}',
+        'JM': r'JM[A-Z]{3}\s?\d{2}',
+        'BB': r'BB\d{5}',
+        'HT': r'(?:HT)?\d{4}',
+        'AD': r'AD\d{3}',
+        'MT': r'[A-Z]{3}\s?\d{4}',
+        'AZ': r'AZ\s?\d{4}',
+        'MD': r'MD-?\d{4}',
+        'LV': r'LV-?\d{4}',
+        'LT': r'(?:LT-)?\d{5}',
+        'PT': r'\d{4}-\d{3}',
+        'BR': r'\d{5}-?\d{3}',
+        'JP': r'\d{3}-\d{4}',
+        'PL': r'\d{2}-\d{3}',
+        **dict.fromkeys(['CZ', 'SK', 'SE', 'GR'], r'\d{3}\s?\d{2}'),
+        'TW': r'\d{3}(?:\d{2,3})?',
+        'IR': r'\d{5}-?\d{5}',
+        'CL': r'\d{7}',
+        **dict.fromkeys(['IS', 'FO'], r'\d{3}'),
+        **dict.fromkeys([
+            'DE', 'FR', 'IT', 'ES', 'MX', 'KR', 'NP', 'FI', 'EE', 'HR', 'MY', 'TH', 'ID', 'UA', 'PK',
+            'SA', 'TR', 'EG', 'DZ', 'MA', 'KW', 'JO', 'LK', 'KE', 'GT', 'CR', 'DO', 'UY', 'PE', 'RS',
+            'BA', 'ME', 'CU', 'SV', 'IQ', 'MC', 'SM', 'VA'
+        ], r'\d{5}'),
+        **dict.fromkeys([
+            'IN', 'CN', 'RU', 'VN', 'RO', 'SG', 'CO', 'NG', 'KZ', 'BY', 'KG', 'TJ', 'UZ', 'TM', 'EC'
+        ], r'\d{6}'),
+        **dict.fromkeys([
+            'AU', 'ZA', 'CH', 'AT', 'BE', 'DK', 'NO', 'HU', 'BG', 'NZ', 'PH', 'BD', 'TN', 'CY', 'LU',
+            'GE', 'AM', 'MK', 'SI', 'AL', 'VE', 'PY', 'ET', 'LI', 'GL'
+        ], r'\d{4}'),
+        **dict.fromkeys(['AE', 'HK', 'QA'], None)
+    }
+    
+    # Precompiled once per class: one regex per country, and the fallback formats in priority
+    # order (tried one at a time: a single alternation would return the earliest match, often a
+    # street number, instead of the highest-priority format)
+    FALLBACK_POSTAL_REGEXES = [re.compile(r'\b(' + fmt + r')\b') for fmt in POSTAL_FORMATS]
+    COUNTRY_POSTAL_REGEXES = {
+        code: [re.compile(r'\b(' + fmt + r')\b')] if fmt else []
+        for code, fmt in COUNTRY_POSTAL_FORMATS.items()
+    }
+    
+    # Segment labels in assignment priority order
+    SEGMENT_NAMES = ['both_email_phone', 'no_website', 'single_contact']
+    
+    # Entity resolution: a shared listing Phone merges leads outright; the other blocks only group
+    # candidates, which must then have no conflicting phones, similar titles and (optionally)
+    # agreeing addresses. Branches of a chain with their own listing phones stay separate.
+    RESOLUTION_PHONE_KEYS = ['Phone', 'mobile_number', 'whatsapp_number']
+    RESOLUTION_BLOCKS = {  # block key -> (min title similarity, addresses must agree)
+        # Scraped from a website, so a chain's branches can share one
+        'mobile_number': (0.0, False),
+        'whatsapp_number': (0.0, False),
+        'email': (0.0, False),
+        'website_domain': (0.3, True),
+        'email_domain': (0.5, True),
+        'title_signature': (0.6, True)
+    }
+    ADDRESS_SIMILARITY = 0.5  # Jaccard over address tokens that are not numbers or common (city, zip, ...)
+    ADDRESS_COMMON_SHARE = 0.02  # tokens in more than this share of addresses are ignored
+    MAX_BLOCK_SIZE = 50  # larger fuzzy blocks are too generic to compare (keeps resolution near-linear)
+    RESOLUTION_FIELDS = ['Email', 'Phone', 'mobile_number', 'whatsapp_number', 'Website', 'Address']
+    TITLE_STOPWORDS = {'the', 'and', 'of', 'in', 'at', 'by', 'pvt', 'ltd', 'llc', 'inc', 'co', 'company',
+                       'private', 'limited', 'best'}
+    # Shared by unrelated businesses, so never used as blocking keys
+    GENERIC_WEBSITE_DOMAINS = {'facebook.com', 'm.facebook.com', 'instagram.com', 'linkedin.com', 'twitter.com',
+                               'x.com', 'youtube.com', 'tiktok.com', 'wa.me', 'whatsapp.com', 'google.com',
+                               'business.site', 'linktr.ee', 'sites.google.com'}
+    FREE_EMAIL_DOMAINS = {'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'live.com', 'icloud.com',
+                          'aol.com', 'protonmail.com', 'proton.me', 'mail.com', 'gmx.com', 'yandex.com',
+                          'ymail.com', 'msn.com'}
+    
+    # Upload layout per platform: output column -> enriched column, plus the identifier
+    # columns of which at least one must be non-empty for a row to be written and the
+    # normalized contact keys the suppression index remembers per platform
+    AD_AUDIENCE_COLUMNS = {
+        'Email': 'Email',
+        'Phone': 'best_phone',
+        'First Name': 'first_name',
+        'Last Name': 'last_name',
+        'Country': 'Country',
+        'Zip': 'zip'
+    }
+    PLATFORM_OUTPUTS = {
+        'meta_ads': {
+            'label': 'Meta Ads', 'suffix': 'meta',
+            'columns': AD_AUDIENCE_COLUMNS,
+            # Custom Audiences: every field hashed, phone as digits with country code
+            'hashed_columns': {
+                'Email': 'email_sha256',
+                'Phone': 'phone_digits_sha256',
+                'First Name': 'first_name_sha256',
+                'Last Name': 'last_name_sha256',
+                'Country': 'country_sha256',
+                'Zip': 'zip_sha256'
+            },
+            'identifiers': ['Email', 'Phone'],
+            'contact_keys': [('Email', 'email'), ('best_phone', 'phone_e164')]
+        },
+        'google_ads': {
+            'label': 'Google Ads', 'suffix': 'google',
+            'columns': AD_AUDIENCE_COLUMNS,
+            # Customer Match: contact fields hashed, phone in E.164, country and zip in plain text
+            'hashed_columns': {
+                'Email': 'email_sha256',
+                'Phone': 'phone_sha256',
+                'First Name': 'first_name_sha256',
+                'Last Name': 'last_name_sha256',
+                'Country': 'Country',
+                'Zip': 'zip'
+            },
+            'identifiers': ['Email', 'Phone'],
+            'contact_keys': [('Email', 'email'), ('best_phone', 'phone_e164')]
+        },
+        'mautic': {
+            'label': 'Mautic', 'suffix': 'mautic',
+            'columns': {
+                'firstname': 'first_name',
+                'lastname': 'last_name',
+                'email': 'Email',
+                'phone1': 'Phone',
+                'phone2': 'mobile_number',
+                'phone3': 'whatsapp_number',
+                'address1': 'street_address',
+                'city': 'city',
+                'zipcode': 'zip',
+                'country': 'Country',
+                'website': 'Website',
+                'company': 'Title',
+                'tags': 'segment'
+            },
+            'identifiers': ['email', 'phone1', 'phone2', 'phone3'],
+            'contact_keys': [('Email', 'email'), ('Phone', 'phone_e164'),
+                             ('mobile_number', 'phone_e164'), ('whatsapp_number', 'phone_e164')]
+        }
+    }
+    
+    # Hashed identifier columns: derived column -> (enriched column, normalization)
+    HASHED_IDENTIFIERS = {
+        'email_sha256': ('Email', 'email'),
+        'phone_sha256': ('best_phone', 'phone_e164'),
+        'phone_digits_sha256': ('best_phone', 'phone_digits'),
+        'first_name_sha256': ('first_name', 'name'),
+        'last_name_sha256': ('last_name', 'name'),
+        'country_sha256': ('Country', 'name'),
+        'zip_sha256': ('zip', 'zip')
+    }
+    
+    # Parallel writers for the platform CSV/XLSX files
+    OUTPUT_WORKERS = 4
+    
+    # Keep phone columns as text so leading zeros and '+' survive
+    INPUT_DTYPES = {
+        'Phone': str,
+        'mobile_number': str,
+        'whatsapp_number': str,
+        'country_code': str
+    }
+    WHATSAPP_COLUMNS = ['Phone', 'mobile_number', 'whatsapp_number']
+    # Crawler CSV layout; columns an input does not have are blank (see _conform_columns)
+    RECORD_COLUMNS = ['Title', 'Address', 'Phone', 'Country', 'Website', 'Email', 'mobile_number', 'whatsapp_number']
+    WHATSAPP_HEADER = 'WhatsApp Number (with country code)'
+    
+    def __init__(self, input_file: str, output_dir: str = "Prepared_Data_Platform_Specific",
+                 vectorized: bool = True, chunksize: Optional[int] = None, hash_identifiers: bool = True,
+                 incremental: bool = False, suppress_exported: bool = False, resolve_entities: bool = False,
+                 cache_enriched: bool = False, streaming: bool = False):
         self.input_file = input_file
+        self.vectorized = vectorized  # False selects the original row-wise parsing path
+        self.chunksize = chunksize  # rows per chunk; set it to stream files larger than memory
+        self.hash_identifiers = hash_identifiers  # False writes plain-text ad audiences
+        self.incremental = incremental  # only prepare rows appended since the last run
+        self.suppress_exported = suppress_exported  # skip contacts exported to the platform by earlier runs
+        self.resolve_entities = resolve_entities  # merge leads that describe the same business
+        self.cache_enriched = cache_enriched  # reuse the enriched frame of an unchanged input (Parquet)
+        self.streaming = streaming  # leads arrive through feed_records(); input_file only names the outputs
         self.base_name = os.path.splitext(os.path.basename(input_file))[0]
+        self.sources = [input_file]  # inputs listed in the summary report
+        self._stream = None
         
         # Create main directory if it doesn't exist
         main_dir = output_dir
         if not os.path.exists(main_dir):
             os.makedirs(main_dir, exist_ok=True)
         
-        # Create subdirectory with filename and timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.output_dir = os.path.join(main_dir, f"{self.base_name}_completed_{timestamp}")
-        os.makedirs(self.output_dir, exist_ok=True)
+        # Incremental runs append to the output folder recorded in the manifest
+        self.manifest_path = os.path.join(main_dir, MANIFEST_FILE)
+        self.suppression_dir = os.path.join(main_dir, SUPPRESSION_DIR)
+        self.cache_dir = os.path.join(main_dir, CACHE_DIR)
+        self.watermark = self._load_watermark() if incremental else None
+        if self.watermark:
+            self.output_dir = self.watermark['output_dir']
+        else:
+            # Create subdirectory with filename and timestamp
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.output_dir = os.path.join(main_dir, f"{self.base_name}_completed_{timestamp}")  # created on first write
+        
+        # Define segment thresholds
+        self.MAX_ROWS_PER_FILE = 40000
+        
+        # In chunked and incremental modes the file is read by process_streaming()/process_incremental()
+        if chunksize or incremental or streaming:
+            self.df = None
+            if not streaming:
+                logging.info(f"📖 Streaming leads from {input_file}" + (f" in chunks of {chunksize}" if chunksize else ""))
+            return
+        
+        cache_file = self._cache_file_for_input() if cache_enriched else None
+        if cache_file and os.path.exists(cache_file):
+            self._load_cache(cache_file)
+            return
         
         # Load the data
         try:
-            dtype_dict = {
-                'Phone': str,
-                'mobile_number': str,
-                'whatsapp_number': str
-            }
-            self.df = pd.read_csv(input_file, dtype=dtype_dict)
+            self.df = self._conform_columns(pd.read_csv(input_file, dtype=self.INPUT_DTYPES))
             logging.info(f"📖 Loaded {len(self.df)} leads from {input_file}")
-            # Remove rows without Email AND Phone
-            self.df = self.df[(self.df['Email'].notna() & (self.df['Email'] != '') & (self.df['Email'] != 'null')) |
-                            (self.df['Phone'].notna() & (self.df['Phone'] != '') & (self.df['Phone'] != 'null'))]
+            self.df = self._filter_contactable(self.df)
             logging.info(f"📌 Filtered leads with at least Email or Phone: {len(self.df)} leads remaining")
         except Exception as e:
             logging.error(f"Error loading input file: {e}")
             raise
         
-        # Define segment thresholds
-        self.MAX_ROWS_PER_FILE = 40000
-        
         # Log file structure
         logging.info(f"Input file columns: {list(self.df.columns)}")
+        self._cache_file = cache_file
+    
+    @property
+    def df(self) -> pd.DataFrame:
+        """Filtered input leads. Assigning a new frame invalidates the cached segments."""
+        return self._df
+    
+    @df.setter
+    def df(self, value: pd.DataFrame):
+        self._df = value
+        self.invalidate_cache()
     
-  
+    def invalidate_cache(self):
+        """Drop the memoized enriched frame and segments (call after mutating self.df in place)."""
+        self._enriched = None
+        self._segments = None
+        self._cache_file = None  # self.df may no longer match the input file
+    
+    def _conform_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Map the aiohttp crawler's layout (Emails, calling-code country_code) onto RECORD_COLUMNS and blank-fill the rest."""
+        if 'Email' not in df.columns and 'Emails' in df.columns:
+            df = df.assign(Email=df['Emails'].where(df['Emails'].isna(), df['Emails'].astype(str).str.split(';').str[0]))
+        if 'Country' not in df.columns and 'country_code' in df.columns:
+            codes = df['country_code'].fillna('').astype(str).str.strip().str.upper()
+            regions = {code: code if code.isalpha() else
+                       phonenumbers.region_code_for_country_code(int(code)) if phonenumbers and code.isdigit() else ''
+                       for code in codes.unique()}
+            df = df.assign(Country=codes.map({code: '' if region == 'ZZ' else region for code, region in regions.items()}))
+        missing = [column for column in self.RECORD_COLUMNS if column not in df.columns]
+        return df.assign(**dict.fromkeys(missing, '')) if missing else df
+    
+    def _filter_contactable(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Remove rows without Email AND Phone."""
+        return df[(df['Email'].notna() & (df['Email'] != '') & (df['Email'] != 'null')) |
+                  (df['Phone'].notna() & (df['Phone'] != '') & (df['Phone'] != 'null'))]
     
     def parse_name(self, title: str) -> Tuple[str, str]:
         """
@@ -86,85 +425,29 @@ class LeadDataProcessor:
         else:
             return '', ''
     
-    def extract_postal_code(self, address: str) -> str:
-        """Extract postal code from address using universal patterns optimized for Google Maps data."""
+    def postal_regexes(self, country) -> List[re.Pattern]:
+        """Compiled postal code regexes for an ISO country code, in priority order (empty if the country has no codes)."""
+        code = '' if pd.isna(country) else str(country).strip().upper()
+        return self.COUNTRY_POSTAL_REGEXES.get(code, self.FALLBACK_POSTAL_REGEXES)
+    
+    def extract_postal_code(self, address: str, country: str = '') -> str:
+        """Extract postal code from address using the format of the lead's country."""
         if not address or address == 'null' or pd.isna(address):
             return ''
         
-        # Universal postal code patterns by country (ordered from most specific to most general)
-        postal_patterns = [
-            # US ZIP code (5 digits or 5+4)
-            r'\b(\d{5}(?:-\d{4})?)\b',
-            # Canadian postal code (A1A 1A1)
-            r'\b([A-Z]\d[A-Z] ?\d[A-Z]\d)\b',
-            # UK postal code (various formats)
-            r'\b([A-Z]{1,2}\d[A-Z\d]? ?\d[A-Z]{2})\b',
-            # Irish postal code (D01 W123 or A12 B345)
-            r'\b([A-Z]\d{2} ?[A-Z]\d{3})\b',
-            # Dutch postal code (1234 AB)
-            r'\b(\d{4} ?[A-Z]{2})\b',
-            # Argentine postal code (A1234ABC or old 4-digit)
-            r'\b([A-Z]\d{4}[A-Z]{3})\b',
-            # Jamaican postal code (JMABC 12)
-            r'\b(JM[A-Z]{3}\s?\d{2})\b',
-            # Barbados postal code (BB12345)
-            r'\b(BB\d{5})\b',
-            # Haitian postal code (HT1234)
-            r'\b(HT\d{4})\b',
-            # Andorran postal code (AD123)
-            r'\b(AD\d{3})\b',
-            # Maltese postal code (MTA 1234 or MTB 1234)
-            r'\b(M[TA][A-Z]\s?\d{4})\b',
-            # Azerbaijani postal code (AZ 1234)
-            r'\b(AZ\s?\d{4})\b',
-            # Moldovan postal code (MD-1234)
-            r'\b(MD-\d{4})\b',
-            # Portuguese postal code (1234-567)
-            r'\b(\d{4}-\d{3})\b',
-            # Brazilian postal code (12345-678)
-            r'\b(\d{5}-\d{3})\b',
-            # Japanese postal code (123-4567)
-            r'\b(\d{3}-\d{4})\b',
-            # Polish postal code (12-345)
-            r'\b(\d{2}-\d{3})\b',
-            # Czech postal code (123 45)
-            r'\b(\d{3}\s?\d{2})\b',
-            # Iranian postal code (12345-6789)
-            r'\b(\d{5}-?\d{5})\b',
-            # Slovakian postal code (123 45)
-            r'\b(\d{3}\s?\d{2})\b',
-            # Swedish, Greek, Taiwanese postal code (123 45)
-            r'\b(\d{3}\s?\d{2})\b',
-            # South Korean postal code (12345)
-            r'\b(\d{5})\b',
-            # 5-digit postal codes (Germany, France, Italy, Spain, Mexico, etc.)
-            r'\b(\d{5})\b',
-            # Indian, Chinese, Russian, Vietnamese, Romanian, Singaporean, Colombian, Nigerian postal codes (6 digits)
-            r'\b(\d{6})\b',
-            # Chilean postal code (7 digits)
-            r'\b(\d{7})\b',
-            # 4-digit postal codes (Australia, South Africa, Switzerland, etc.)
-            r'\b(\d{4})\b',
-            # Icelandic postal code (3 digits)
-            r'\b(\d{3})\b',
-            # Generic pattern for other countries (3-10 digits, optionally with dash or space)
-            r'\b(\d{3,10}(?:[-\s]\d{3,10})*)\b'
-        ]
-        # Try each pattern
-        for pattern in postal_patterns:
-            match = re.search(pattern, address)
+        for pattern in self.postal_regexes(country):
+            match = pattern.search(address)
             if match:
                 return match.group(1)
-        
         return ''
     
-    def parse_address(self, address: str) -> Tuple[str, str, str]:
+    def parse_address(self, address: str, country: str = '') -> Tuple[str, str, str]:
         """Parse address into street address, city, and zip code."""
         if not address or address == 'null' or pd.isna(address):
             return '', '', ''
         
-        # Extract postal code using universal patterns
-        zip_code = self.extract_postal_code(address)
+        # Extract postal code using the country's format
+        zip_code = self.extract_postal_code(address, country)
         
         # The rest is the street address
         street_address = address
@@ -189,27 +472,240 @@ class LeadDataProcessor:
         else:
             return ''
     
-    def segment_data(self) -> Dict[str, pd.DataFrame]:
-        """Segment data into three categories with mutually exclusive segments."""
-        # Create a copy to avoid SettingWithCopyWarning
-        df = self.df.copy()
+    def _has_value(self, series: pd.Series) -> pd.Series:
+        """Vectorized 'not NaN, empty or the string null' check."""
+        return series.notna() & (series != '') & (series != 'null')
+    
+    def _extract_postal_codes(self, addresses: pd.Series, countries: pd.Series) -> pd.Series:
+        """Vectorized extract_postal_code: per country group, one Series.str.extract per pattern
+        over the rows no higher-priority pattern matched."""
+        zip_codes = pd.Series('', index=addresses.index, dtype=object)
+        codes = countries.fillna('').astype(str).str.strip().str.upper()
+        for code, index in codes.groupby(codes).groups.items():
+            unmatched = addresses.loc[index]
+            for pattern in self.COUNTRY_POSTAL_REGEXES.get(code, self.FALLBACK_POSTAL_REGEXES):
+                found = unmatched.str.extract(pattern, expand=False).dropna()
+                zip_codes[found.index] = found
+                unmatched = unmatched.drop(found.index)
+                if unmatched.empty:
+                    break
+        return zip_codes
+    
+    def _countries(self, df: pd.DataFrame) -> pd.Series:
+        """Country column, or blanks (combined fallback patterns) for files without one."""
+        if 'Country' in df.columns:
+            return df['Country'].astype(object) if isinstance(df['Country'].dtype, pd.CategoricalDtype) else df['Country']
+        return pd.Series('', index=df.index, dtype=object)
+    
+    def _remove_postal_code(self, address: str, zip_code: str) -> str:
+        """Street part of parse_address; the regex pass only runs if the code survives replace()."""
+        if not zip_code:
+            return address
+        street_address = address.replace(zip_code, '')
+        if zip_code in street_address:
+            street_address = re.sub(r',?\s*' + re.escape(zip_code), '', street_address)
+        return street_address
+    
+    def _tokens(self, series: pd.Series, stopwords=frozenset()) -> pd.Series:
+        """Lowercase word tokens per value (unicode-aware), without stopwords."""
+        words = series.where(self._has_value(series), '').astype(str).str.lower().str.findall(r'\w+')
+        return words.map(lambda tokens: [token for token in tokens if token not in stopwords])
+    
+    def _domains(self, series: pd.Series, generic) -> pd.Series:
+        """Host of a URL or email, without 'www.'; blank for generic domains."""
+        text = series.where(self._has_value(series), '').astype(str).str.strip().str.lower()
+        domains = text.str.extract(r'^(?:[a-z][a-z0-9+.-]*://)?(?:[^@/]*@)?(?:www\.)?([^/:?#@\s]+)', expand=False)
+        domains = domains.fillna('')
+        return domains.where(~domains.isin(generic), '')
+    
+    def _resolution_keys(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Normalized blocking keys and token sets per lead."""
+        countries = self._countries(df)
+        keys = pd.DataFrame(index=df.index)
+        for column in self.RESOLUTION_PHONE_KEYS:
+            keys[column] = self._normalize_phones(df[column], countries) if column in df.columns else ''
+        keys['email'] = self._normalize_identifier(df, 'Email', 'email')
+        keys['email_domain'] = self._domains(keys['email'].str.split('@').str[-1], self.FREE_EMAIL_DOMAINS)
+        keys.loc[keys['email'] == '', 'email_domain'] = ''
+        keys['website_domain'] = self._domains(df['Website'], self.GENERIC_WEBSITE_DOMAINS)
         
-        # Parse names and addresses
-        df['first_name'], df['last_name'] = zip(*df['Title'].apply(self.parse_name))
-        df['street_address'], df['city'], df['zip'] = zip(*df['Address'].apply(self.parse_address))
+        title_tokens = self._tokens(df['Title'], self.TITLE_STOPWORDS)
+        keys['title_signature'] = title_tokens.map(lambda tokens: ' '.join(sorted(tokens[:2])))
+        keys['title_tokens'] = title_tokens.map(frozenset)
         
-        # Get best phone (keeping original format)
-        df['best_phone'] = df.apply(self.get_best_phone, axis=1)
+        # Address tokens that tell places apart: drop numbers and tokens most addresses share
+        address_tokens = self._tokens(df['Address']).map(lambda tokens: {token for token in tokens if not token.isdigit()})
+        frequency = address_tokens.explode().value_counts()
+        common = set(frequency[frequency > max(1, self.ADDRESS_COMMON_SHARE * len(df))].index)
+        keys['address_tokens'] = address_tokens.map(lambda tokens: frozenset(tokens - common))
+        keys['phones'] = [frozenset(phone for phone in row if phone) for row in
+                          zip(*(keys[column] for column in self.RESOLUTION_PHONE_KEYS))]
+        return keys
+    
+    @staticmethod
+    def _jaccard(a: frozenset, b: frozenset) -> float:
+        return len(a & b) / len(a | b) if a and b else 0.0
+    
+    def resolve_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Merge leads that describe the same business, keeping the richest contact fields.
         
-        # Check if email is valid (not null or empty)
-        df['has_email'] = ~((df['Email'] == '') | (df['Email'] == 'null') | pd.isna(df['Email']))
+        Leads sharing a normalized listing Phone are merged outright. Leads sharing a mobile or
+        WhatsApp number, an email, website domain, business email domain or title signature are
+        compared pairwise, but only within blocks of at most MAX_BLOCK_SIZE, so the cost stays
+        near-linear. Clusters with different listing phones (branches) are never merged.
+        """
+        if len(df) < 2:
+            return df
+        keys = self._resolution_keys(df).reset_index(drop=True)
+        clusters = DisjointSet(len(keys))
         
-        # Check if phone is valid (not null or empty)
-        df['has_phone'] = (df['best_phone'] != '')
+        values = keys['Phone']
+        present = values[values != '']
+        firsts = pd.Series(present.index, index=present.index).groupby(present).transform('min')
+        for row, first in zip(firsts.index, firsts):
+            if row != first:
+                clusters.union(row, first)
+        # Listing phone per cluster root, so a lead without one cannot bridge two branches
+        listing = {clusters.find(row): phone for row, phone in present.items()}
         
-        # Check if website is valid
-        df['has_website'] = ~((df['Website'] == '') | (df['Website'] == 'null') | pd.isna(df['Website']))
+        phones = keys['phones'].tolist()
+        title_tokens = keys['title_tokens'].tolist()
+        address_tokens = keys['address_tokens'].tolist()
+        for column, (min_title, check_address) in self.RESOLUTION_BLOCKS.items():
+            values = keys[column]
+            values = values[values != '']
+            sizes = values.map(values.value_counts())
+            for block in values[(sizes > 1) & (sizes <= self.MAX_BLOCK_SIZE)].groupby(values).groups.values():
+                block = list(block)
+                for i, a in enumerate(block):
+                    for b in block[i + 1:]:
+                        if phones[a] and phones[b] and not phones[a] & phones[b]:
+                            continue  # different lines: separate locations
+                        if min_title and self._jaccard(title_tokens[a], title_tokens[b]) < min_title:
+                            continue
+                        if (check_address and address_tokens[a] and address_tokens[b]
+                                and self._jaccard(address_tokens[a], address_tokens[b]) < self.ADDRESS_SIMILARITY):
+                            continue
+                        root_a, root_b = clusters.find(a), clusters.find(b)
+                        phone_a, phone_b = listing.get(root_a, ''), listing.get(root_b, '')
+                        if root_a == root_b or (phone_a and phone_b and phone_a != phone_b):
+                            continue
+                        clusters.union(a, b)
+                        listing[clusters.find(a)] = phone_a or phone_b
         
+        roots = clusters.roots()
+        duplicated = pd.Series(roots).duplicated(keep=False).to_numpy()
+        if not duplicated.any():
+            return df
+        
+        merged = self._merge_clusters(df.iloc[duplicated], roots[duplicated])
+        result = pd.concat([df.iloc[~duplicated], merged])
+        order = np.concatenate([np.flatnonzero(~duplicated), merged.index.to_numpy()])
+        result = result.iloc[np.argsort(order, kind='stable')]
+        result.index = df.index[np.sort(order)]
+        logging.info(f"🔗 Merged {duplicated.sum()} duplicate leads into {len(merged)} businesses")
+        return result
+    
+    def _merge_clusters(self, df: pd.DataFrame, roots: np.ndarray) -> pd.DataFrame:
+        """One record per cluster: every field from the most complete lead that has it.
+        
+        The result is indexed by each cluster's first row position.
+        """
+        fields = [column for column in self.RESOLUTION_FIELDS if column in df.columns]
+        present = pd.DataFrame({column: self._has_value(df[column]) for column in fields})
+        specific_website = self._domains(df['Website'], self.GENERIC_WEBSITE_DOMAINS) != ''
+        richness = present.sum(axis=1) + specific_website.astype(int)
+        
+        ranked = df.where(pd.DataFrame({
+            column: self._has_value(df[column]) if column in fields or column == 'Title' else df[column].notna()
+            for column in df.columns
+        }))
+        ranked = ranked.assign(_cluster=roots, _richness=richness.to_numpy(), _position=np.arange(len(df)))
+        ranked = ranked.sort_values(['_cluster', '_richness', '_position'], ascending=[True, False, True])
+        merged = ranked.groupby('_cluster', sort=True)[list(df.columns)].first()
+        
+        # Prefer a business's own site over a social-media page from a richer duplicate
+        own_site = ranked['Website'].where(specific_website.reindex(ranked.index).to_numpy())
+        merged['Website'] = own_site.groupby(ranked['_cluster']).first().combine_first(merged['Website'])
+        self._keep_cluster_phones(merged, ranked)
+        return merged
+    
+    def _keep_cluster_phones(self, merged: pd.DataFrame, ranked: pd.DataFrame) -> None:
+        """Move numbers the merged record left out into its empty phone slots.
+        
+        Phone and mobile_number take any number; whatsapp_number only WhatsApp numbers.
+        """
+        columns = [column for column in self.RESOLUTION_PHONE_KEYS if column in merged.columns]
+        countries = self._countries(ranked)
+        numbers = pd.concat([
+            pd.DataFrame({'_cluster': ranked['_cluster'], 'column': column, 'value': ranked[column],
+                          'key': self._normalize_phones(ranked[column], countries)})
+            for column in columns
+        ], ignore_index=True)
+        numbers = numbers[numbers['key'] != '']
+        if numbers.empty:
+            return
+        for cluster, found in numbers.groupby('_cluster', sort=False):
+            found = found.drop_duplicates('key')
+            if len(found) < 2:
+                continue
+            record = merged.loc[cluster]
+            kept = set(found.loc[found['value'].isin(record[columns].tolist()), 'key'])
+            spare = found[~found['key'].isin(kept)]
+            for column in columns:
+                if spare.empty:
+                    break
+                if self._has_value(pd.Series([record[column]])).iloc[0]:
+                    continue
+                fits = spare if column != 'whatsapp_number' else spare[spare['column'] == 'whatsapp_number']
+                if not fits.empty:
+                    merged.loc[cluster, column] = fits['value'].iloc[0]
+                    spare = spare.drop(fits.index[:1])
+    
+    def _enrich_vectorized(self, df: pd.DataFrame) -> None:
+        """Add name, address and best-phone columns using pandas string methods."""
+        # Names: split on the first space (same rules as parse_name)
+        df['first_name'] = ''
+        df['last_name'] = ''
+        has_title = self._has_value(df['Title'])
+        if has_title.any():
+            parts = (df.loc[has_title, 'Title'].astype(str).str.strip()
+                     .str.split(' ', n=1, expand=True).reindex(columns=[0, 1]))
+            df.loc[has_title, 'first_name'] = parts[0].str.strip()
+            df.loc[has_title, 'last_name'] = parts[1].fillna('').str.strip()
+        
+        # Addresses: postal code plus the remaining street address (same rules as parse_address)
+        df['street_address'] = ''
+        df['city'] = ''
+        df['zip'] = ''
+        has_address = self._has_value(df['Address'])
+        if has_address.any():
+            addresses = df.loc[has_address, 'Address'].astype(str)
+            zip_codes = self._extract_postal_codes(addresses, self._countries(df).loc[has_address])
+            streets = [self._remove_postal_code(address, zip_code) for address, zip_code in zip(addresses, zip_codes)]
+            df.loc[has_address, 'street_address'] = pd.Series(streets, index=addresses.index).str.strip().str.strip(',')
+            df.loc[has_address, 'zip'] = zip_codes
+        
+        # Best phone: WhatsApp > Mobile > General
+        df['best_phone'] = np.select(
+            [self._has_value(df['whatsapp_number']), self._has_value(df['mobile_number']), self._has_value(df['Phone'])],
+            [df['whatsapp_number'], df['mobile_number'], df['Phone']],
+            default=''
+        )
+    
+    def _enrich_rowwise(self, df: pd.DataFrame) -> None:
+        """Add name, address and best-phone columns one row at a time (original path)."""
+        # Parse names and addresses
+        df['first_name'], df['last_name'] = zip(*df['Title'].apply(self.parse_name))
+        df['street_address'], df['city'], df['zip'] = zip(*[
+            self.parse_address(address, country) for address, country in zip(df['Address'], self._countries(df))
+        ])
+        
+        # Get best phone (keeping original format)
+        df['best_phone'] = df.apply(self.get_best_phone, axis=1)
+    
+    def _segment_rowwise(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Assign segments by tracking unassigned index sets (original path)."""
         # Create a copy of indices to track which leads have been assigned
         unassigned_indices = set(df.index)
         
@@ -238,282 +734,935 @@ class LeadDataProcessor:
         )
         segment3 = df.loc[single_contact_mask]
         
-        segments = {
+        return {
             'both_email_phone': segment1,
             'no_website': segment2,
             'single_contact': segment3
         }
+    
+    def _segment_vectorized(self, df: pd.DataFrame) -> np.ndarray:
+        """Label every lead with its first matching segment in one np.select pass."""
+        return np.select(
+            [
+                df['has_email'] & df['has_phone'],
+                ~df['has_website'],
+                df['has_email'] | df['has_phone']
+            ],
+            self.SEGMENT_NAMES,
+            default=''
+        )
+    
+    def segment_data(self) -> Dict[str, pd.DataFrame]:
+        """Segment data into three categories with mutually exclusive segments.
+        
+        The enriched frame and the segments are memoized until self.df is replaced.
+        """
+        if self._segments is not None:
+            return self._segments
+        if self.df is None:
+            raise ValueError("segment_data needs the whole file in memory; use process_streaming() in chunked mode")
+        
+        # Create a copy to avoid SettingWithCopyWarning
+        df = self.df.copy()
+        if self.resolve_entities:
+            df = self.resolve_duplicates(df)
+        df = self._enrich(df)
+        if self._cache_file:
+            self._save_cache(df)
+        return self._set_segments(df)
+    
+    def _set_segments(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Memoize an enriched frame and its segments."""
+        segments = {name: df[df['segment'] == name] for name in self.SEGMENT_NAMES}
         
         # Verify that segments are mutually exclusive
-        total_segmented = len(segment1) + len(segment2) + len(segment3)
+        total_segmented = sum(len(segment) for segment in segments.values())
         logging.info(f"Total leads: {len(df)}, Total segmented: {total_segmented}")
         
         for name, segment in segments.items():
             if len(segment) > 0:  # Only log non-empty segments
                 logging.info(f"📊 Segment '{name}': {len(segment)} leads")
         
+        self._enriched = df
+        self._segments = segments
         return segments
     
+    def _cache_file_for_input(self) -> Optional[str]:
+        """Parquet cache path keyed by the input's path, its content hash and the options that shape the frame."""
+        if pq is None:
+            logging.warning("⚠️ pyarrow is not installed; the enriched-lead cache is disabled")
+            return None
+        digest = hashlib.sha256(f'v{CACHE_VERSION}-{self.hash_identifiers:d}{self.resolve_entities:d}-'.encode())
+        with open(self.input_file, 'rb') as f:
+            for block in iter(lambda: f.read(CACHE_HASH_BLOCK), b''):
+                digest.update(block)
+        return os.path.join(self.cache_dir, f'{self._cache_prefix()}_{digest.hexdigest()[:16]}.parquet')
+    
+    def _cache_prefix(self) -> str:
+        """Cache file prefix of this input: same-named files in other folders get their own entries."""
+        path_hash = hashlib.sha256(os.path.realpath(self.input_file).encode('utf-8')).hexdigest()[:8]
+        return f'{self.base_name}_{path_hash}'
+    
+    def _save_cache(self, df: pd.DataFrame):
+        """Write the enriched frame grouped by segment, replacing older caches of the same input path."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cached = df.astype({column: 'category' for column in CACHE_CATEGORICAL if column in df.columns})
+        cached = cached.iloc[np.argsort(pd.Categorical(df['segment'], self.SEGMENT_NAMES).codes, kind='stable')]
+        table = pa.Table.from_pandas(cached)
+        metadata = {**(table.schema.metadata or {}), b'lead_input_columns': json.dumps(list(self.df.columns)).encode()}
+        
+        temp_file = f'{self._cache_file}.{os.getpid()}.tmp'
+        pq.write_table(table.replace_schema_metadata(metadata), temp_file, row_group_size=CACHE_ROW_GROUP)
+        os.replace(temp_file, self._cache_file)
+        stale = re.compile(re.escape(self._cache_prefix()) + r'_[0-9a-f]{16}\.parquet')
+        for entry in os.scandir(self.cache_dir):
+            if stale.fullmatch(entry.name) and entry.path != self._cache_file:
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+        logging.info(f"💾 Cached enriched leads: {self._cache_file}")
+    
+    def _load_cache(self, cache_file: str):
+        """Restore self.df, the enriched frame and the segments from a Parquet cache."""
+        df = read_enriched(cache_file)
+        input_columns = json.loads(pq.read_schema(cache_file).metadata[b'lead_input_columns'])
+        self.df = df[input_columns]
+        logging.info(f"⚡ Loaded {len(df)} enriched leads from cache {cache_file}")
+        self._set_segments(df)
+    
+    def load_enriched(self, columns: Optional[List[str]] = None, filters=None) -> pd.DataFrame:
+        """Enriched leads of this input from the Parquet cache (built first if missing), see read_enriched()."""
+        cache_file = self._cache_file_for_input()
+        if cache_file is None:
+            raise RuntimeError("load_enriched needs pyarrow")
+        if not os.path.exists(cache_file):
+            if self.df is None:
+                raise ValueError("the enriched cache is built in batch mode; run without chunksize/incremental first")
+            self.invalidate_cache()
+            self._cache_file = cache_file
+            self.segment_data()
+        return read_enriched(cache_file, columns, filters)
+    
+    def _enrich(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Add parsed, contact-flag and segment label columns to df in place."""
+        # Parse names, addresses and best phone (keeping original format)
+        if self.vectorized:
+            self._enrich_vectorized(df)
+        else:
+            self._enrich_rowwise(df)
+        
+        # Check if email is valid (not null or empty)
+        df['has_email'] = ~((df['Email'] == '') | (df['Email'] == 'null') | pd.isna(df['Email']))
+        
+        # Check if phone is valid (not null or empty)
+        df['has_phone'] = (df['best_phone'] != '')
+        
+        # Check if website is valid
+        df['has_website'] = ~((df['Website'] == '') | (df['Website'] == 'null') | pd.isna(df['Website']))
+        
+        if self.vectorized:
+            df['segment'] = self._segment_vectorized(df)
+        else:
+            df['segment'] = ''
+            for name, segment in self._segment_rowwise(df).items():
+                df.loc[segment.index, 'segment'] = name
+        
+        if self.hash_identifiers:
+            self._add_hashed_identifiers(df)
+        return df
+    
+    def _normalize_phones(self, phones: pd.Series, countries: pd.Series) -> pd.Series:
+        """E.164 via phonenumbers, parsing national numbers in the lead's country.
+        
+        Numbers that do not parse (no known country, too short, no phonenumbers) fall back to
+        their plain digits. Each distinct number/country pair is parsed once.
+        """
+        raw = phones.where(self._has_value(phones), '').astype(str).str.strip()
+        codes = countries.fillna('').astype(str).str.strip().str.upper()
+        labels, uniques = pd.factorize(raw + '|' + codes.to_numpy())
+        normalized = np.array([self._e164(*pair.rsplit('|', 1)) for pair in uniques], dtype=object)
+        return pd.Series(normalized[labels] if len(labels) else [], index=phones.index, dtype=object)
+    
+    @staticmethod
+    def _e164(number: str, region: str) -> str:
+        """One number in E.164, or its digits when phonenumbers cannot parse it."""
+        if not number:
+            return ''
+        if phonenumbers is not None:
+            try:
+                parsed = phonenumbers.parse(number, region or None)
+                return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+            except phonenumbers.NumberParseException:
+                pass
+        return re.sub(r'\D', '', number)
+    
+    def _normalize_identifier(self, df: pd.DataFrame, column: str, kind: str) -> pd.Series:
+        """Platform hashing normalization: trimmed lowercase text, E.164 phones, zips without spaces."""
+        if column not in df.columns:
+            return pd.Series('', index=df.index, dtype=object)
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+        if kind in ('phone_e164', 'phone_digits'):
+            e164 = self._normalize_phones(values, self._countries(df))
+            return e164.str.lstrip('+') if kind == 'phone_digits' else e164
+        text = values.where(self._has_value(values), '').astype(str).str.strip().str.lower()
+        return text.str.replace(r'\s+', '', regex=True) if kind == 'zip' else text
+    
+    def _add_hashed_identifiers(self, df: pd.DataFrame) -> None:
+        """Add SHA-256 columns for the ad platforms, hashing each distinct value once."""
+        normalized = {}
+        phones = {}  # column -> E.164, shared by its phone_e164 and phone_digits identifiers
+        for target, (column, kind) in self.HASHED_IDENTIFIERS.items():
+            if kind in ('phone_e164', 'phone_digits'):
+                if column not in phones:
+                    phones[column] = self._normalize_identifier(df, column, 'phone_e164')
+                normalized[target] = phones[column].str.lstrip('+') if kind == 'phone_digits' else phones[column]
+            else:
+                normalized[target] = self._normalize_identifier(df, column, kind)
+        
+        # One hashing batch for every distinct value across all identifier columns
+        codes, uniques = pd.factorize(pd.concat(normalized.values(), ignore_index=True))
+        digests = sha256_hex(np.asarray(uniques, dtype=object))[codes]
+        for i, target in enumerate(normalized):
+            df[target] = digests[i * len(df):(i + 1) * len(df)]
+    
+    def segment_statistics(self) -> pd.DataFrame:
+        """Per-segment lead and contact counts from a single grouped aggregation."""
+        self.segment_data()
+        return self._segment_counts(self._enriched)
+    
+    def _segment_counts(self, df: pd.DataFrame) -> pd.DataFrame:
+        stats = df.groupby('segment', sort=False, observed=True).agg(
+            leads=('segment', 'size'),
+            with_email=('has_email', 'sum'),
+            with_phone=('has_phone', 'sum'),
+            with_website=('has_website', 'sum')
+        )
+        return stats.reindex(self.SEGMENT_NAMES, fill_value=0)
+    
     def split_large_dataframe(self, df: pd.DataFrame, segment_name: str) -> List[pd.DataFrame]:
-        """Split a large dataframe into smaller chunks."""
+        """Split a large dataframe into smaller chunks (row slices, not copies)."""
         if len(df) <= self.MAX_ROWS_PER_FILE:
             return [df]
         
-        chunks = []
-        for i in range(0, len(df), self.MAX_ROWS_PER_FILE):
-            chunk = df.iloc[i:i + self.MAX_ROWS_PER_FILE].copy()
-            chunks.append(chunk)
+        chunks = [df.iloc[i:i + self.MAX_ROWS_PER_FILE] for i in range(0, len(df), self.MAX_ROWS_PER_FILE)]
         
         logging.info(f"📂 Split segment '{segment_name}' into {len(chunks)} files")
         return chunks
     
-    def prepare_for_meta_ads(self, segments: Dict[str, pd.DataFrame]):
-        """Prepare data for Meta Ads Custom Audience."""
-        # Create platform-specific directory
-        meta_dir = os.path.join(self.output_dir, 'meta_ads')
-        os.makedirs(meta_dir, exist_ok=True)
-        
-        all_meta_dfs = []
+    def project_platform(self, platform: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Select and rename enriched columns into a platform's upload layout (missing columns are blank)."""
+        spec = self.PLATFORM_OUTPUTS[platform]
+        columns = spec.get('hashed_columns', spec['columns']) if self.hash_identifiers else spec['columns']
+        return pd.DataFrame(
+            {column: df[source] if source in df.columns else '' for column, source in columns.items()},
+            index=df.index
+        )
+    
+    def _plan_platform_files(self, platform: str, projected: Dict[str, pd.DataFrame]) -> List[Tuple[str, pd.DataFrame]]:
+        """Output path and rows of every file for one platform, from its projected segments."""
+        spec = self.PLATFORM_OUTPUTS[platform]
+        platform_dir = os.path.join(self.output_dir, platform)
+        os.makedirs(platform_dir, exist_ok=True)
         
-        for segment_name, segment_df in segments.items():
-            # Skip empty segments
+        files = []
+        for segment_name, segment_df in projected.items():
             if len(segment_df) == 0:
                 continue
-                
-            # Split into chunks if needed
-            chunks = self.split_large_dataframe(segment_df, segment_name)
             
+            chunks = self.split_large_dataframe(segment_df, segment_name)
             for i, chunk in enumerate(chunks):
-                meta_df = pd.DataFrame()
-                
-                # Hash Email (using original email)
-                meta_df['Email'] = chunk['Email'] 
-                
-                # Hash phones (using original best phone)
-                meta_df['Phone'] = chunk['best_phone'] 
-                
-                # Hash names
-                meta_df['First Name'] = chunk['first_name'] 
-                meta_df['Last Name'] = chunk['last_name'] 
-                
-                # Hash country (ISO format)
-                meta_df['Country'] = chunk['Country'] 
-                
-               
-                
-                # Hash zip
-                meta_df['Zip'] = chunk['zip'] 
-                
-                # Remove rows with no primary identifiers
-                meta_df = meta_df[(meta_df['Email'] != '') | (meta_df['Phone'] != '')]
-                
-                # Save without headers
+                # Keep rows with at least one primary identifier
+                chunk = chunk[(chunk[spec['identifiers']] != '').any(axis=1)]
                 part_suffix = f"_part_{i+1}" if len(chunks) > 1 else ""
-                output_file = os.path.join(meta_dir, f'{self.base_name}_{segment_name}_meta{part_suffix}.csv')
-                meta_df.to_csv(output_file, index=False, header=True)
-                all_meta_dfs.append(meta_df)
-                logging.info(f"✅ Created Meta Ads file: {output_file} ({len(meta_df)} contacts)")
-        
-        return all_meta_dfs
+                output_file = os.path.join(platform_dir, f"{self.base_name}_{segment_name}_{spec['suffix']}{part_suffix}.csv")
+                files.append((output_file, chunk))
+        return files
+    
+    def _write_platform_csv(self, platform: str, output_file: str, df: pd.DataFrame) -> None:
+        df.to_csv(output_file, index=False, header=True)
+        logging.info(f"✅ Created {self.PLATFORM_OUTPUTS[platform]['label']} file: {output_file} ({len(df)} contacts)")
+    
+    def _prepare_platform(self, platform: str, segments: Dict[str, pd.DataFrame]) -> List[pd.DataFrame]:
+        """Project and write one platform's files sequentially."""
+        projected = {name: self.project_platform(platform, segment_df) for name, segment_df in segments.items()}
+        files = self._plan_platform_files(platform, projected)
+        for output_file, df in files:
+            self._write_platform_csv(platform, output_file, df)
+        return [df for _, df in files]
+    
+    def prepare_for_meta_ads(self, segments: Dict[str, pd.DataFrame]):
+        """Prepare data for Meta Ads Custom Audience."""
+        return self._prepare_platform('meta_ads', segments)
     
     def prepare_for_google_ads(self, segments: Dict[str, pd.DataFrame]):
         """Prepare data for Google Ads Customer Match."""
-        # Create platform-specific directory
-        google_dir = os.path.join(self.output_dir, 'google_ads')
-        os.makedirs(google_dir, exist_ok=True)
+        return self._prepare_platform('google_ads', segments)
+    
+    def prepare_for_mautic(self, segments: Dict[str, pd.DataFrame]):
+        """Prepare data for Mautic contact import with phone numbers."""
+        return self._prepare_platform('mautic', segments)
+    
+    def _whatsapp_numbers(self, df: pd.DataFrame) -> np.ndarray:
+        """All phone columns of df in E.164 (raw text where the country is unknown), blanks dropped."""
+        countries = self._countries(df)
+        numbers = []
+        for col in self.WHATSAPP_COLUMNS:
+            if col in df.columns:
+                raw = df[col].where(self._has_value(df[col]), '').astype(str).str.strip()
+                e164 = self._normalize_phones(raw, countries)
+                numbers.append(e164.where(e164 != '', raw))
+        if not numbers:
+            return np.empty(0, dtype=object)
+        numbers = pd.concat(numbers, ignore_index=True)
+        return numbers[numbers != ''].to_numpy(dtype=object)
+    
+    def _whatsapp_writer(self, suffix: str = '', write_empty: bool = True) -> StreamingXlsxWriter:
+        whatsapp_dir = os.path.join(self.output_dir, 'whatsapp')
+        os.makedirs(whatsapp_dir, exist_ok=True)
+        return StreamingXlsxWriter(os.path.join(whatsapp_dir, f'{self.base_name}_whatsapp{suffix}'),
+                                   self.WHATSAPP_HEADER, write_empty=write_empty)
+    
+    def _close_whatsapp_writer(self, writer: StreamingXlsxWriter) -> List[str]:
+        output_files = writer.close()
+        for output_file in output_files:
+            logging.info(f"✅ Created WhatsApp Excel: {output_file}")
+        logging.info(f"📱 WhatsApp numbers: {writer.rows} unique contacts")
+        return output_files
+    
+    def prepare_for_whatsapp(self, segments: Dict[str, pd.DataFrame],
+                             suppression: Optional[SuppressionIndex] = None) -> List[str]:
+        """Prepare WhatsApp marketing Excel with a single column for all numbers (deduplicated).
         
-        all_google_dfs = []
+        Numbers are normalized to E.164, deduplicated chunk by chunk through a hash index and
+        streamed to the workbook, which is sharded at Excel's row limit.
+        """
+        writer = self._whatsapp_writer()
+        index = HashIndex()
+        suppressed = 0
+        for segment_df in segments.values():
+            for start in range(0, len(segment_df), self.MAX_ROWS_PER_FILE):
+                chunk = segment_df.iloc[start:start + self.MAX_ROWS_PER_FILE]
+                numbers = index.add_new(self._whatsapp_numbers(chunk))
+                if suppression is not None:
+                    numbers, skipped = self._suppress_numbers(numbers, suppression)
+                    suppressed += skipped
+                writer.write(numbers)
+        if suppressed:
+            logging.info(f"🚫 Skipped {suppressed} WhatsApp numbers exported by earlier runs")
+        return self._close_whatsapp_writer(writer)
+    
+    def _open_suppression(self) -> Dict[str, SuppressionIndex]:
+        """Exported-contact index per platform, shared by every input prepared into the same output root.
         
-        for segment_name, segment_df in segments.items():
-            # Skip empty segments
-            if len(segment_df) == 0:
-                continue
-                
-            # Split into chunks if needed
-            chunks = self.split_large_dataframe(segment_df, segment_name)
-            
-            for i, chunk in enumerate(chunks):
-                google_df = pd.DataFrame()
-                
-                # Hash Email (using original email)
-                google_df['Email'] = chunk['Email'] 
-                
-                # Hash phones (using original best phone)
-                google_df['Phone'] = chunk['best_phone'] 
-                
-                # Hash names
-                google_df['First Name'] = chunk['first_name'] 
-                google_df['Last Name'] = chunk['last_name'] 
-                
-                # Hash country (ISO format)
-                google_df['Country'] = chunk['Country'] 
-                
-                # Hash zip
-                google_df['Zip'] = chunk['zip'] 
-                
-                # Remove rows with no primary identifiers
-                google_df = google_df[(google_df['Email'] != '') | (google_df['Phone'] != '')]
-                
-                # Save without headers
-                part_suffix = f"_part_{i+1}" if len(chunks) > 1 else ""
-                output_file = os.path.join(google_dir, f'{self.base_name}_{segment_name}_google{part_suffix}.csv')
-                google_df.to_csv(output_file, index=False, header=True)
-                all_google_dfs.append(google_df)
-                logging.info(f"✅ Created Google Ads file: {output_file} ({len(google_df)} contacts)")
+        Parallel runs take turns: the lock is held until _close_suppression().
+        """
+        os.makedirs(self.suppression_dir, exist_ok=True)
+        self._suppression_lock = FileLock(os.path.join(self.suppression_dir, '.lock'))
+        self._suppression_lock.acquire()
+        return {
+            platform: SuppressionIndex(os.path.join(self.suppression_dir, f'{platform}.sqlite'))
+            for platform in [*self.PLATFORM_OUTPUTS, 'whatsapp']
+        }
+    
+    def _close_suppression(self, suppression: Dict[str, SuppressionIndex], commit: bool):
+        try:
+            for index in suppression.values():
+                index.close(commit=commit)
+        finally:
+            if suppression:
+                self._suppression_lock.release()
+    
+    def _contact_hashes(self, platform: str, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """64-bit hashes of a platform's normalized contact keys, one column per key, plus a non-blank mask.
         
-        return all_google_dfs
+        Phones that do not normalize fall back to their raw text, as in _whatsapp_numbers, so every
+        written contact gets a key.
+        """
+        keys = np.column_stack([
+            self._contact_key(df, column, kind).to_numpy(dtype=object)
+            for column, kind in self.PLATFORM_OUTPUTS[platform]['contact_keys']
+        ])
+        hashes = pd.util.hash_array(keys.ravel()).reshape(keys.shape)
+        return hashes, keys != ''
     
-    def prepare_for_mautic(self, segments: Dict[str, pd.DataFrame]):
-        """Prepare data for Mautic contact import with phone numbers."""
-        # Create Mautic output directory
-        mautic_dir = os.path.join(self.output_dir, 'mautic')
-        os.makedirs(mautic_dir, exist_ok=True)
+    def _contact_key(self, df: pd.DataFrame, column: str, kind: str) -> pd.Series:
+        key = self._normalize_identifier(df, column, kind)
+        if kind not in ('phone_e164', 'phone_digits') or column not in df.columns:
+            return key
+        values = df[column].astype(object)
+        return key.where(key != '', values.where(self._has_value(values), '').astype(str).str.strip())
+    
+    def _suppress(self, platform: str, df: pd.DataFrame,
+                  suppression: SuppressionIndex) -> Tuple[pd.DataFrame, np.ndarray]:
+        """Drop leads with any contact key already exported to the platform.
         
-        all_mautic_dfs = []
+        Returns the kept leads and their contact key hashes, to be added once they are written.
+        """
+        if len(df) == 0:
+            return df, np.empty(0, dtype=np.uint64)
+        hashes, present = self._contact_hashes(platform, df)
+        exported = np.zeros(present.shape, dtype=bool)
+        exported[present] = suppression.contains(hashes[present])
+        keep = ~exported.any(axis=1)
+        return df[keep], hashes[present & keep[:, None]]
+    
+    def _suppress_numbers(self, numbers: np.ndarray, suppression: SuppressionIndex) -> Tuple[np.ndarray, int]:
+        """Drop WhatsApp numbers exported by earlier runs and record the rest."""
+        if not len(numbers):
+            return numbers, 0
+        hashes = pd.util.hash_array(numbers)
+        exported = suppression.contains(hashes)
+        suppression.add(hashes[~exported])
+        return numbers[~exported], int(exported.sum())
+    
+    def write_platform_files(self) -> Dict[str, List[str]]:
+        """Project the enriched frame once per platform and write every CSV/XLSX in parallel.
         
-        for segment_name, segment_df in segments.items():
-            if len(segment_df) == 0:
-                continue
-            
-            # Split large segments into chunks
-            chunks = self.split_large_dataframe(segment_df, segment_name)
-            
-            for i, chunk in enumerate(chunks):
-                mautic_df = pd.DataFrame()
-                
-                # Map fields to Mautic format
-                mautic_df['firstname'] = chunk['first_name']
-                mautic_df['lastname'] = chunk['last_name']
-                mautic_df['email'] = chunk['Email']  # Keep original email
-                
-                # Add phone numbers safely
-                mautic_df['phone1'] = chunk.get('Phone', '')
-                mautic_df['phone2'] = chunk.get('mobile_number', '')  # Will be empty if not present
-                mautic_df['phone3'] = chunk.get('whatsapp_number', '')  # Will be empty if not present
-                
-                # Address components
-                mautic_df['address1'] = chunk.get('street_address', '')
-                mautic_df['city'] = chunk.get('city', '')
-                mautic_df['zipcode'] = chunk.get('zip', '')
-                mautic_df['country'] = chunk.get('Country', '')
-                
-                # Additional fields
-                mautic_df['website'] = chunk.get('Website', '')
-                mautic_df['company'] = chunk.apply(
-                    lambda row:  row.get('Title', ''), axis=1
+        Returns the written file paths per platform.
+        """
+        segments = self.segment_data()
+        suppression = self._open_suppression() if self.suppress_exported else {}
+        
+        completed = False
+        try:
+            planned = {}
+            for platform in self.PLATFORM_OUTPUTS:
+                enriched = self._enriched
+                if suppression:
+                    enriched, new_keys = self._suppress(platform, enriched, suppression[platform])
+                    suppression[platform].add(new_keys)
+                    skipped = len(self._enriched) - len(enriched)
+                    if skipped:
+                        logging.info(f"🚫 Skipped {skipped} leads exported to {self.PLATFORM_OUTPUTS[platform]['label']} by earlier runs")
+                projected = self.project_platform(platform, enriched)
+                labels = enriched['segment']
+                planned[platform] = self._plan_platform_files(
+                    platform, {name: projected[labels == name] for name in self.SEGMENT_NAMES}
                 )
-                mautic_df['tags'] = segment_name
-                
-                # Keep rows with at least one identifier (email or any phone)
-                mautic_df = mautic_df[
-                    (mautic_df['email'] != '') |
-                    (mautic_df['phone1'] != '') |
-                    (mautic_df['phone2'] != '') |
-                    (mautic_df['phone3'] != '')
+            
+            with ThreadPoolExecutor(max_workers=self.OUTPUT_WORKERS) as pool:
+                futures = [pool.submit(self.prepare_for_whatsapp, segments, suppression.get('whatsapp'))]
+                futures += [
+                    pool.submit(self._write_platform_csv, platform, output_file, df)
+                    for platform, files in planned.items() for output_file, df in files
                 ]
-                
-                # Save CSV with headers
-                part_suffix = f"_part_{i+1}" if len(chunks) > 1 else ""
-                output_file = os.path.join(mautic_dir, f'{self.base_name}_{segment_name}_mautic{part_suffix}.csv')
-                mautic_df.to_csv(output_file, index=False, header=True)
-                all_mautic_dfs.append(mautic_df)
-                logging.info(f"✅ Created Mautic file: {output_file} ({len(mautic_df)} contacts)")
+                for future in futures:
+                    future.result()  # re-raise write errors
+            completed = True
+        finally:
+            # Contacts only count as exported once every file was written
+            self._close_suppression(suppression, completed)
         
-        return all_mautic_dfs
-
-    
-    def prepare_for_whatsapp(self, segments: Dict[str, pd.DataFrame]):
-        """Prepare WhatsApp marketing Excel with a single column for all numbers (deduplicated)."""
-        import pandas as pd
-        import os
-        import logging
-
-        whatsapp_dir = os.path.join(self.output_dir, 'whatsapp')
-        os.makedirs(whatsapp_dir, exist_ok=True)
-
-        all_numbers = []
-
-        for segment_name, segment_df in segments.items():
-            if len(segment_df) == 0:
-                continue
-
-            chunks = self.split_large_dataframe(segment_df, segment_name)
-
-            for chunk in chunks:
-                for col in ['Phone', 'mobile_number', 'whatsapp_number']:
-                    if col in chunk.columns:
-                        # Convert all to string, drop NaN/empty
-                        numbers = chunk[col].dropna().astype(str).str.strip()
-                        numbers = numbers[numbers != '']
-                        all_numbers.extend(numbers.tolist())
-
-        # Remove duplicates
-        all_numbers = list(dict.fromkeys(all_numbers))
-
-        # Create DataFrame
-        whatsapp_df = pd.DataFrame({'WhatsApp Number (with country code)': all_numbers})
-
-        # Save Excel
-        output_file = os.path.join(whatsapp_dir, f'{self.base_name}_whatsapp.xlsx')
-        whatsapp_df.to_excel(output_file, index=False, header=True)
-        logging.info(f"✅ Created WhatsApp Excel: {output_file} ({len(whatsapp_df)} contacts)")
-
-        return whatsapp_df
-
+        written = {platform: [output_file for output_file, _ in files] for platform, files in planned.items()}
+        written['whatsapp'] = futures[0].result()
+        return written
     
-    def prepare_summary_report(self):
+    def prepare_summary_report(self, total_leads: Optional[int] = None, stats: Optional[pd.DataFrame] = None):
         """Generate a summary report of the data preparation."""
+        if stats is None:
+            stats = self.segment_statistics()
+            total_leads = len(self._enriched)
+        os.makedirs(self.output_dir, exist_ok=True)
         report_file = os.path.join(self.output_dir, f'{self.base_name}_summary_report.txt')
         
         with open(report_file, 'w') as f:
             f.write(f"Lead Data Preparation Summary Report\n")
             f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Input File: {self.input_file}\n")
-            f.write(f"Total Leads: {len(self.df)}\n\n")
+            f.write(f"Input File: {', '.join(self.sources)}\n")
+            f.write(f"Total Leads: {total_leads}\n\n")
             
-            segments = self.segment_data()
-            for name, segment in segments.items():
-                if len(segment) > 0:  # Only include non-empty segments
-                    f.write(f"Segment '{name}': {len(segment)} leads\n")
-                    
-                    # Count contacts with email
-                    email_count = len(segment[segment['has_email']])
-                    f.write(f"  - With Email: {email_count}\n")
-                    
-                    # Count contacts with phone
-                    phone_count = len(segment[segment['has_phone']])
-                    f.write(f"  - With Phone: {phone_count}\n")
-                    
-                    # Count contacts with website
-                    website_count = len(segment[segment['has_website']])
-                    f.write(f"  - With Website: {website_count}\n\n")
+            for name, row in stats.iterrows():
+                if row['leads'] > 0:  # Only include non-empty segments
+                    f.write(f"Segment '{name}': {row['leads']} leads\n")
+                    f.write(f"  - With Email: {row['with_email']}\n")
+                    f.write(f"  - With Phone: {row['with_phone']}\n")
+                    f.write(f"  - With Website: {row['with_website']}\n\n")
         
         logging.info(f"📋 Generated summary report: {report_file}")
     
+    def begin_stream(self, state: Optional[Dict] = None):
+        """Open rolling platform writers and the WhatsApp index for feed().
+        
+        A saved stream_state() resumes the writers and totals of an earlier run; its new
+        WhatsApp numbers then go to a separate timestamped delta workbook.
+        """
+        state = state or {}
+        writers = {}
+        for platform, spec in self.PLATFORM_OUTPUTS.items():
+            platform_dir = os.path.join(self.output_dir, platform)
+            os.makedirs(platform_dir, exist_ok=True)
+            for name in self.SEGMENT_NAMES:
+                stem = os.path.join(platform_dir, f"{self.base_name}_{name}_{spec['suffix']}")
+                resume = state.get('writers', {}).get(f'{platform}/{name}', {})
+                writers[platform, name] = RollingCsvWriter(stem, self.MAX_ROWS_PER_FILE, **resume)
+        
+        if state:
+            whatsapp = self._whatsapp_writer(f"_{datetime.now().strftime('%Y%m%d_%H%M%S')}", write_empty=False)
+        else:
+            whatsapp = self._whatsapp_writer()
+        index_path = os.path.join(self.output_dir, 'whatsapp', f'.{self.base_name}_numbers.sqlite')
+        
+        self._stream = {
+            'writers': writers,
+            'whatsapp': whatsapp,
+            'index': OnDiskHashIndex(index_path, scratch=not self.incremental),
+            'suppression': self._open_suppression() if self.suppress_exported else {},
+            'suppressed': dict.fromkeys([*self.PLATFORM_OUTPUTS, 'whatsapp'], 0),
+            'exported': {platform: [] for platform in self.PLATFORM_OUTPUTS},
+            'pool': ThreadPoolExecutor(max_workers=self.OUTPUT_WORKERS),
+            'loaded': 0,
+            'total_leads': state.get('total_leads', 0),
+            'stats': pd.DataFrame.from_dict(state['stats'], orient='index') if state.get('stats') else None
+        }
+    
+    def feed(self, chunk: pd.DataFrame):
+        """Filter, enrich and segment one raw chunk and append it to every platform's outputs."""
+        stream = self._stream
+        if stream['loaded'] == 0:
+            logging.info(f"Input file columns: {list(chunk.columns)}")
+        stream['loaded'] += len(chunk)
+        chunk = self._filter_contactable(self._conform_columns(chunk)).copy()
+        if self.resolve_entities:
+            # Duplicates are only resolved within a chunk here
+            chunk = self.resolve_duplicates(chunk)
+        chunk = self._enrich(chunk)
+        stream['total_leads'] += len(chunk)
+        counts = self._segment_counts(chunk)
+        stream['stats'] = counts if stream['stats'] is None else stream['stats'].add(counts, fill_value=0).astype(int)
+        
+        # One writer task per platform keeps each platform's appends in order
+        segments = {name: chunk[chunk['segment'] == name] for name in self.SEGMENT_NAMES}
+        futures = [
+            stream['pool'].submit(self._append_platform_chunk, platform, segments, stream)
+            for platform in self.PLATFORM_OUTPUTS
+        ]
+        for segment_df in segments.values():
+            numbers = stream['index'].add_new(self._whatsapp_numbers(segment_df))
+            if stream['suppression']:
+                numbers, skipped = self._suppress_numbers(numbers, stream['suppression']['whatsapp'])
+                stream['suppressed']['whatsapp'] += skipped
+            stream['whatsapp'].write(numbers)
+        for future in futures:
+            future.result()
+        logging.info(f"📦 Processed {stream['loaded']} rows ({len(chunk)} leads with Email or Phone)")
+    
+    def feed_records(self, records):
+        """feed() a batch of lead dicts, or an Arrow RecordBatch/Table, e.g. straight from a crawler."""
+        if pa is not None and isinstance(records, (pa.RecordBatch, pa.Table)):
+            chunk = records.to_pandas()
+        else:
+            chunk = pd.DataFrame.from_records(list(records))
+        if chunk.empty:
+            return
+        for column in self.INPUT_DTYPES:
+            if column in chunk.columns:
+                chunk[column] = chunk[column].where(chunk[column].isna(), chunk[column].astype(str))
+        loaded = self._stream['loaded']
+        chunk.index = pd.RangeIndex(loaded, loaded + len(chunk))  # row numbers continue across batches
+        self.feed(chunk)
+    
+    def stream_state(self) -> Dict:
+        """JSON-serializable writer positions and running totals of the open stream."""
+        stream = self._stream
+        stats = stream['stats']
+        return {
+            'writers': {f'{platform}/{name}': writer.state() for (platform, name), writer in stream['writers'].items()},
+            'total_leads': int(stream['total_leads']),
+            'stats': {} if stats is None else {
+                name: {column: int(value) for column, value in row.items()} for name, row in stats.iterrows()
+            }
+        }
+    
+    def end_stream(self, completed: bool = True, checkpoint: Optional[Callable[[], None]] = None) -> Dict[str, List[str]]:
+        """Finalize the stream's files and summary report; returns the written paths per platform.
+        
+        Suppressed contacts are only recorded as exported when the stream completed. checkpoint()
+        runs once the files are final (incremental runs save their watermark there); an incremental
+        stream that did not complete is rolled back to where it began, and only a completed one
+        commits its WhatsApp index.
+        """
+        stream, self._stream = self._stream, None
+        for platform, skipped in stream['suppressed'].items():
+            if skipped:
+                label = self.PLATFORM_OUTPUTS[platform]['label'] if platform in self.PLATFORM_OUTPUTS else 'WhatsApp'
+                logging.info(f"🚫 Skipped {skipped} contacts exported to {label} by earlier runs")
+        try:
+            stream['pool'].shutdown()
+            written = {platform: [] for platform in self.PLATFORM_OUTPUTS}
+            for (platform, name), writer in stream['writers'].items():
+                for output_file in writer.close():
+                    written[platform].append(output_file)
+                    logging.info(f"✅ Created {self.PLATFORM_OUTPUTS[platform]['label']} file: {output_file}")
+            written['whatsapp'] = self._close_whatsapp_writer(stream['whatsapp'])
+            if completed and checkpoint:
+                checkpoint()
+        except BaseException:
+            completed = False
+            raise
+        finally:
+            if not completed and self.incremental:
+                written = self._roll_back_stream(stream)
+            stream['index'].close(remove=not self.incremental, commit=completed)
+            try:
+                for platform, index in stream['suppression'].items():
+                    if completed and stream['exported'].get(platform):
+                        index.add(np.concatenate(stream['exported'][platform]))
+            finally:
+                self._close_suppression(stream['suppression'], completed)
+        
+        stats = stream['stats']
+        if stats is None:
+            stats = pd.DataFrame(0, index=self.SEGMENT_NAMES, columns=['leads', 'with_email', 'with_phone', 'with_website'])
+        self.prepare_summary_report(stream['total_leads'], stats.reindex(self.SEGMENT_NAMES, fill_value=0))
+        return written
+    
+    def _roll_back_stream(self, stream: Dict) -> Dict[str, List[str]]:
+        """Truncate the platform files back to the stream's start and drop its WhatsApp workbook."""
+        stream['pool'].shutdown()
+        written = {platform: [] for platform in self.PLATFORM_OUTPUTS}
+        for (platform, name), writer in stream['writers'].items():
+            written[platform].extend(writer.rollback())
+        stream['whatsapp'].discard()
+        written['whatsapp'] = []
+        logging.warning(f"↩️ Rolled back the outputs of {self.input_file} to the last completed run")
+        return written
+    
+    def process_streaming(self) -> Dict[str, List[str]]:
+        """Out-of-core pipeline: filter, enrich and segment one chunk at a time.
+        
+        Each chunk is projected for every platform and appended to rolling part files;
+        WhatsApp numbers are deduplicated across chunks in an on-disk hash index.
+        """
+        self.begin_stream()
+        completed = False
+        try:
+            for chunk in pd.read_csv(self.input_file, dtype=self.INPUT_DTYPES, chunksize=self.chunksize):
+                self.feed(chunk)
+            completed = True
+        finally:
+            written = self.end_stream(completed)
+        return written
+    
+    def _read_manifest(self) -> Dict:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _fingerprint(self, offset: int) -> str:
+        """Hash of the bytes just before a watermark, to notice inputs rewritten rather than appended."""
+        with open(self.input_file, 'rb') as f:
+            start = max(0, offset - FINGERPRINT_BYTES)
+            f.seek(start)
+            return hashlib.sha256(f.read(offset - start)).hexdigest()
+    
+    def _load_watermark(self) -> Optional[Dict]:
+        """Manifest entry of the input, or None if it is new, rewritten or its outputs are gone."""
+        entry = self._read_manifest().get('inputs', {}).get(os.path.abspath(self.input_file))
+        if not entry:
+            return None
+        if (not os.path.isdir(entry['output_dir'])
+                or os.path.getsize(self.input_file) < entry['offset']
+                or self._fingerprint(entry['offset']) != entry['fingerprint']):
+            logging.warning(f"⚠️ {self.input_file} or its outputs changed since the last run; preparing it from scratch")
+            return None
+        return entry
+    
+    def _save_watermark(self, offset: int, state: Dict):
+        entry = {
+            'offset': offset,
+            'fingerprint': self._fingerprint(offset),
+            'output_dir': os.path.abspath(self.output_dir),
+            'updated': datetime.now().isoformat(timespec='seconds'),
+            **state
+        }
+        # Parallel runs share the manifest: read-modify-write it under a lock
+        with FileLock(self.manifest_path + '.lock'):
+            manifest = self._read_manifest()
+            manifest.setdefault('inputs', {})[os.path.abspath(self.input_file)] = entry
+            temp_path = self.manifest_path + f'.{os.getpid()}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(temp_path, self.manifest_path)
+    
+    def _read_new_records(self, offset: Optional[int]):
+        """Yield (frame, end offset) for the complete CSV records after a byte offset.
+        
+        A trailing record the crawler is still writing is left for the next run.
+        """
+        with open(self.input_file, 'rb') as f:
+            header = f.readline()
+            if offset is None:
+                offset = len(header)
+            f.seek(offset)
+            carry = b''
+            while True:
+                block = f.read(DELTA_BLOCK_BYTES)
+                if not block:
+                    break
+                data = carry + block
+                cut = last_record_end(data)
+                carry = data[cut:]
+                if cut:
+                    offset += cut
+                    yield pd.read_csv(io.BytesIO(header + data[:cut]), dtype=self.INPUT_DTYPES), offset
+    
+    def process_incremental(self) -> Dict[str, List[str]]:
+        """Prepare only the rows appended since the manifest watermark and append them to the outputs."""
+        offset = self.watermark['offset'] if self.watermark else None
+        if offset is not None and os.path.getsize(self.input_file) == offset:
+            logging.info(f"⏸️ No new leads in {self.input_file} since the last run")
+            return {}
+        
+        if offset is not None:
+            logging.info(f"🔁 Resuming {self.input_file} from byte {offset} into '{self.output_dir}'")
+        self.begin_stream(self.watermark)
+        end = offset
+        completed = False
+        try:
+            for chunk, end in self._read_new_records(offset):
+                self.feed(chunk)
+            completed = True
+        finally:
+            state = self.stream_state()
+            
+            def save_watermark():
+                if end is not None:
+                    self._save_watermark(end, state)
+            
+            # The watermark is saved together with the outputs and WhatsApp index, or not at all
+            written = self.end_stream(completed, save_watermark)
+        return written
+    
+    def _append_platform_chunk(self, platform: str, segments: Dict[str, pd.DataFrame], stream: Dict):
+        """Project one chunk's segments for a platform and append them to its part files."""
+        identifiers = self.PLATFORM_OUTPUTS[platform]['identifiers']
+        suppression = stream['suppression'].get(platform)
+        for name, segment_df in segments.items():
+            if len(segment_df) == 0:
+                continue
+            if suppression is not None:
+                # Recorded in end_stream, so only earlier runs suppress (as in the in-memory mode)
+                kept, new_keys = self._suppress(platform, segment_df, suppression)
+                stream['exported'][platform].append(new_keys)
+                stream['suppressed'][platform] += len(segment_df) - len(kept)
+                segment_df = kept
+            projected = self.project_platform(platform, segment_df)
+            stream['writers'][platform, name].write(projected[(projected[identifiers] != '').any(axis=1)])
+    
+    def merge_enriched(self, frames: List[pd.DataFrame], input_columns: List[str]) -> Dict[str, pd.DataFrame]:
+        """Combine the enriched leads of several inputs into this processor's segments.
+        
+        Repeated leads (same title, email and phone, in or across inputs) are dropped; with
+        resolve_entities, duplicates are also resolved across inputs and only the merged
+        records are enriched again.
+        """
+        df = pd.concat(frames, ignore_index=True)
+        df = df.astype({column: object for column in CACHE_CATEGORICAL if column in df.columns})
+        identity = pd.DataFrame({
+            'title': self._normalize_identifier(df, 'Title', 'name'),
+            'email': self._normalize_identifier(df, 'Email', 'email'),
+            'phone': self._normalize_identifier(df, 'best_phone', 'phone_e164')
+        })
+        repeated = identity.duplicated()
+        if repeated.any():
+            df = df[~repeated]
+            logging.info(f"🧹 Dropped {repeated.sum()} repeated leads")
+        
+        if self.resolve_entities:
+            resolved = self.resolve_duplicates(df[input_columns])
+            df = df.loc[resolved.index]
+            before = df[input_columns]
+            changed = ~(resolved.eq(before) | (resolved.isna() & before.isna())).all(axis=1)
+            if changed.any():
+                df = df.copy()
+                df.loc[changed] = self._enrich(resolved[changed].copy())[df.columns]
+        
+        self.df = df[input_columns]
+        return self._set_segments(df)
+    
     def process_all(self):
         """Process all data for all platforms."""
         logging.info(f"\n🚀 Starting lead data processing...")
         
+        if self.incremental or self.chunksize:
+            with sampling_profiler.track('process_incremental' if self.incremental else 'process_streaming'):
+                self.process_incremental() if self.incremental else self.process_streaming()
+            logging.info(f"\n✅ All files prepared successfully in the '{self.output_dir}' directory")
+            return
+        
         # Segment the data
-        segments = self.segment_data()
+        with sampling_profiler.track('segment_data'):
+            self.segment_data()
         
-        # Prepare data for each platform
-        self.prepare_for_meta_ads(segments)
-        self.prepare_for_google_ads(segments)
-        self.prepare_for_mautic(segments)
-        self.prepare_for_whatsapp(segments)
+        # Prepare data for every platform (files are written in parallel)
+        with sampling_profiler.track('write_platform_files'):
+            self.write_platform_files()
         
         # Generate summary report
-        self.prepare_summary_report()
+        with sampling_profiler.track('prepare_summary_report'):
+            self.prepare_summary_report()
         
         logging.info(f"\n✅ All files prepared successfully in the '{self.output_dir}' directory")
         logging.info(f"📁 Files are ready for import into Meta Ads, Google Ads, Mautic, and WhatsApp")
 
+def watch_directory(directory: str, output_dir: str = "Prepared_Data_Platform_Specific",
+                    interval: float = WATCH_INTERVAL, suppress_exported: bool = False):
+    """Poll a directory and incrementally prepare every CSV whose size changed."""
+    logging.info(f"👀 Watching '{directory}' for new leads every {interval}s (Ctrl+C to stop)")
+    sizes = {}
+    try:
+        while True:
+            for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+                if not entry.is_file() or not entry.name.endswith('.csv'):
+                    continue
+                size = entry.stat().st_size
+                if sizes.get(entry.path) == size:
+                    continue
+                sizes[entry.path] = size
+                try:
+                    with sampling_profiler.track('load'):
+                        processor = LeadDataProcessor(entry.path, output_dir, incremental=True,
+                                                      suppress_exported=suppress_exported)
+                    processor.process_all()
+                except Exception as e:
+                    logging.error(f"Error preparing {entry.path}: {e}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        logging.info("🛑 Stopped watching")
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """CSV files named by paths, directories (searched recursively) or glob patterns, in order and without repeats."""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, '**', '*.csv'), recursive=True))
+        else:
+            matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        files.extend(os.path.normpath(path) for path in matches if os.path.isfile(path))
+    return list(dict.fromkeys(files))
+
+
+def _init_prepare_worker(profile_prefix: Optional[str] = None):
+    # The file pool already uses every core; hash in-process
+    global HASH_WORKERS
+    HASH_WORKERS = 1
+    if profile_prefix:
+        sampling_profiler.worker_init(profile_prefix)
+
+
+def _prepare_file(input_file: str, output_dir: str, options: Dict) -> str:
+    """Process-pool task: prepare one input into its own output folder."""
+    with sampling_profiler.track('load'):
+        processor = LeadDataProcessor(input_file, output_dir, **options)
+    processor.process_all()
+    return processor.output_dir
+
+
+def _enrich_file(input_file: str, output_dir: str, options: Dict) -> Tuple[pd.DataFrame, List[str]]:
+    """Process-pool task: one input's enriched leads and input columns, for merge_enriched()."""
+    with sampling_profiler.track('load'):
+        processor = LeadDataProcessor(input_file, output_dir, **options)
+    with sampling_profiler.track('segment_data'):
+        processor.segment_data()
+    return processor._enriched, list(processor.df.columns)
+
+
+def prepare_files(patterns: List[str], output_dir: str = "Prepared_Data_Platform_Specific",
+                  workers: int = PREPARE_WORKERS, merge: bool = False, merged_name: str = MERGED_NAME,
+                  **options) -> Dict[str, Optional[str]]:
+    """Prepare many lead files across a process pool; returns the output folder per input.
+    
+    Each input gets its own output folder, or with merge=True the inputs are enriched in
+    parallel and written once as a deduplicated set with one combined summary report.
+    Runs sharing the output root take turns on its manifest and suppression indexes.
+    """
+    files = expand_inputs(patterns)
+    if not files:
+        logging.warning(f"⚠️ No CSV files match {patterns}")
+        return {}
+    if merge and (options.get('chunksize') or options.get('incremental')):
+        raise ValueError("merge needs whole files in memory; it cannot be combined with chunksize or incremental")
+    workers = max(1, min(workers, len(files)))
+    logging.info(f"🗂️ Preparing {len(files)} files with {workers} workers" + (" (merged)" if merge else ""))
+    
+    task = _enrich_file if merge else _prepare_file
+    results = {}
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_prepare_worker,
+                             initargs=(sampling_profiler.profiling_prefix(),)) as pool:
+        futures = {input_file: pool.submit(task, input_file, output_dir, options) for input_file in files}
+        for input_file, future in futures.items():
+            try:
+                results[input_file] = future.result()
+            except Exception as e:
+                logging.error(f"Error preparing {input_file}: {e}")
+                results[input_file] = None
+    
+    if not merge:
+        return results
+    
+    loaded = {input_file: result for input_file, result in results.items() if result is not None}
+    if not loaded:
+        return results
+    merged = LeadDataProcessor(f'{merged_name}.csv', output_dir, streaming=True, **options)
+    merged.sources = list(loaded)
+    input_columns = list(dict.fromkeys(column for _, columns in loaded.values() for column in columns))
+    with sampling_profiler.track('merge_enriched'):
+        merged.merge_enriched([frame for frame, _ in loaded.values()], input_columns)
+    with sampling_profiler.track('write_platform_files'):
+        merged.write_platform_files()
+    with sampling_profiler.track('prepare_summary_report'):
+        merged.prepare_summary_report()
+    logging.info(f"\n✅ Merged {len(loaded)} files into the '{merged.output_dir}' directory")
+    return {input_file: merged.output_dir if result is not None else None for input_file, result in results.items()}
+
 # HOW TO USE
 if __name__ == "__main__":
-    # Replace with the path to your CSV file
-    input_file = 'Leads_Generated/salon_data.csv'
+    parser = argparse.ArgumentParser(description="Prepare crawled leads for Meta Ads, Google Ads, Mautic and WhatsApp")
+    parser.add_argument('inputs', nargs='*', default=['Leads_Generated/salon_data.csv'],
+                        help="lead CSVs written by the crawlers: files, directories or glob patterns")
+    parser.add_argument('--workers', type=int, default=PREPARE_WORKERS,
+                        help="processes preparing several input files in parallel")
+    parser.add_argument('--merge', action='store_true',
+                        help="write all inputs as one deduplicated output set with a combined summary")
+    parser.add_argument('--merge-name', default=MERGED_NAME, help="output name of the --merge set")
+    parser.add_argument('--chunksize', type=int, help="stream the input in chunks of this many rows")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only prepare rows appended since the last run and append them to its outputs")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep polling --watch-dir and prepare new leads as the crawlers append them")
+    parser.add_argument('--watch-dir', default='Leads_Generated')
+    parser.add_argument('--interval', type=float, default=WATCH_INTERVAL, help="seconds between --watch scans")
+    parser.add_argument('--suppress-exported', action='store_true',
+                        help="skip contacts already exported to each platform by earlier runs")
+    parser.add_argument('--resolve-duplicates', action='store_true',
+                        help="merge leads that describe the same business before segmenting")
+    parser.add_argument('--cache', action='store_true',
+                        help="reuse (or save) the enriched leads as Parquet when the input is unchanged")
+    parser.add_argument('--profile', metavar='DIR', nargs='?', const='profiles',
+                        help="sample where the run spends its time; writes collapsed stacks and a report to DIR")
+    args = parser.parse_args()
+    if args.profile:
+        sampling_profiler.enable(sampling_profiler.run_prefix(args.profile, __file__))
     
-    # Create processor and run
-    processor = LeadDataProcessor(input_file)
-    processor.process_all()
\ No newline at end of file
+    try:
+        if args.watch:
+            watch_directory(args.watch_dir, interval=args.interval, suppress_exported=args.suppress_exported)
+        else:
+            options = dict(chunksize=args.chunksize, incremental=args.incremental, suppress_exported=args.suppress_exported,
+                           resolve_entities=args.resolve_duplicates, cache_enriched=args.cache)
+            if len(args.inputs) == 1 and os.path.isfile(args.inputs[0]) and not args.merge:
+                # Create processor and run
+                with sampling_profiler.track('load'):
+                    processor = LeadDataProcessor(args.inputs[0], **options)
+                processor.process_all()
+            else:
+                prepare_files(args.inputs, workers=args.workers, merge=args.merge, merged_name=args.merge_name, **options)
+    finally:
+        profile = sampling_profiler.finish()
+        if profile:
+            logging.info(f"🔬 Profile written to {profile}.txt and {profile}.collapsed")
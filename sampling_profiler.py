@@ -0,0 +1,203 @@
+"""
+Wall-clock sampling profiler behind the --profile flag of the crawlers and prepare_leads.py
+- A background thread samples every thread's stack each SAMPLE_INTERVAL; no code is instrumented
+- track(label) marks a pipeline step (_process_lead, a LeadDataProcessor stage); samples of that thread are
+  grouped under the label, and untracked threads working meanwhile (writer pools) under the latest active step
+- Process-pool workers started with worker_init() profile themselves and write their stacks at exit
+- finish() writes, per run: PREFIX.collapsed (all processes, flamegraph.pl / speedscope format) and PREFIX.txt
+  (samples per step, top functions by own and total time)
+"""
+import os
+import sys
+import glob
+import time
+import threading
+import multiprocessing.util
+from collections import Counter
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+SAMPLE_INTERVAL = 0.01  # seconds between stack samples
+REPORT_TOP = 30  # functions listed per table in the .txt report
+# Leaf frames in these files are threads waiting for work, not doing it
+IDLE_FILES = ('threading.py', 'queue.py', 'selectors.py', os.path.join('concurrent', 'futures', 'thread.py'))
+
+_profiler = None
+
+
+class SamplingProfiler:
+    """Collapsed-stack sampler for one process"""
+
+    def __init__(self, prefix: str, role: str = 'main', interval: float = SAMPLE_INTERVAL):
+        self.prefix = prefix
+        self.role = role
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._tracks: Dict[int, List] = {}  # thread id -> [(label, entry frame), ...]
+        self._active: List[str] = []  # labels in entry order, across threads
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def track(self, label: str):
+        return _Track(self, label)
+
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+    def _sample(self):
+        own = threading.get_ident()
+        with self._lock:
+            tracks = {ident: entries[-1] for ident, entries in self._tracks.items() if entries}
+            stage = self._active[-1] if self._active else None
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            label, anchor = tracks.get(ident, (stage, None))
+            if label is None:
+                continue
+            if anchor is None and frame.f_code.co_filename.endswith(IDLE_FILES):
+                continue
+            names = []
+            while frame is not None:
+                names.append(self._frame_name(frame))
+                if frame is anchor:
+                    break
+                frame = frame.f_back
+            self.stacks[';'.join([self.role, label] + names[::-1])] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def write(self, path: str):
+        write_collapsed(path, self.stacks)
+
+
+def write_collapsed(path: str, stacks: Counter):
+    """One 'frame;frame;... count' line per distinct stack"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, count in stacks.most_common():
+            f.write(f'{stack} {count}\n')
+
+
+class _Track:
+    def __init__(self, profiler: SamplingProfiler, label: str):
+        self.profiler = profiler
+        self.label = label
+
+    def __enter__(self):
+        entry = (self.label, sys._getframe(1))
+        with self.profiler._lock:
+            self.profiler._tracks.setdefault(threading.get_ident(), []).append(entry)
+            self.profiler._active.append(self.label)
+        return self
+
+    def __exit__(self, *exc):
+        with self.profiler._lock:
+            entries = self.profiler._tracks.get(threading.get_ident())
+            if entries:
+                entries.pop()
+                if not entries:
+                    del self.profiler._tracks[threading.get_ident()]
+            self.profiler._active.remove(self.label)
+
+
+def enable(prefix: str, interval: float = SAMPLE_INTERVAL) -> SamplingProfiler:
+    """Start profiling this process; results go to PREFIX.* when finish() is called"""
+    global _profiler
+    os.makedirs(os.path.dirname(os.path.abspath(prefix)), exist_ok=True)
+    _profiler = SamplingProfiler(prefix, interval=interval).start()
+    return _profiler
+
+
+def profiling_prefix() -> Optional[str]:
+    """Output prefix of the running profile (for worker_init), or None when not profiling"""
+    return _profiler.prefix if _profiler else None
+
+
+def track(label: str):
+    """Group this thread's samples under label for the duration of the block (a no-op when not profiling)"""
+    return _profiler.track(label) if _profiler else nullcontext()
+
+
+def _finish_worker():
+    global _profiler
+    if _profiler:
+        _profiler.stop()
+        _profiler.write(f'{_profiler.prefix}.worker-{os.getpid()}.collapsed')
+        _profiler = None
+
+
+def worker_init(prefix: str):
+    """Process-pool initializer: profile this worker and write its stacks when it exits"""
+    global _profiler
+    # Pool tasks are often shorter than the default 5 ms GIL switch interval, and the sampler thread only
+    # runs when the worker's main thread yields the GIL; switch more often so mid-task stacks get sampled
+    sys.setswitchinterval(min(sys.getswitchinterval(), SAMPLE_INTERVAL / 10))
+    _profiler = SamplingProfiler(prefix, role='worker').start()
+    multiprocessing.util.Finalize(None, _finish_worker, exitpriority=10)
+
+
+def _report(stacks: Counter, samples: int, interval: float, processes: int) -> List[str]:
+    total = sum(stacks.values()) or 1
+    steps, own, inclusive = Counter(), Counter(), Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')
+        steps[';'.join(frames[:2])] += count
+        own[frames[-1]] += count
+        for name in set(frames[2:]):
+            inclusive[name] += count
+
+    def table(title: str, counter: Counter) -> List[str]:
+        lines = [f'\n{title}', f"{'samples':>9} {'%':>6}  name"]
+        lines += [f'{count:>9} {count / total:>6.1%}  {name}' for name, count in counter.most_common(REPORT_TOP)]
+        return lines
+
+    lines = [f'{total} stack samples ({samples} sampling ticks in the main process, every {interval * 1000:.0f} ms, '
+             f'wall clock) from {processes} process(es)']
+    lines += table('Samples per process role and step', steps)
+    lines += table('Top functions by own samples', own)
+    lines += table('Top functions by total samples (own + callees)', inclusive)
+    return lines
+
+
+def finish() -> Optional[str]:
+    """Stop profiling and write PREFIX.collapsed and PREFIX.txt, merging the stacks of finished workers"""
+    global _profiler
+    if not _profiler:
+        return None
+    profiler, _profiler = _profiler, None
+    profiler.stop()
+
+    stacks = Counter(profiler.stacks)
+    worker_files = sorted(glob.glob(f'{glob.escape(profiler.prefix)}.worker-*.collapsed'))
+    for path in worker_files:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                stack, _, count = line.rstrip('\n').rpartition(' ')
+                if stack:
+                    stacks[stack] += int(count)
+    write_collapsed(f'{profiler.prefix}.collapsed', stacks)
+    with open(f'{profiler.prefix}.txt', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(_report(stacks, profiler.samples, profiler.interval, 1 + len(worker_files))) + '\n')
+    return profiler.prefix
+
+
+def run_prefix(directory: str, script: str) -> str:
+    """PREFIX of a new run: DIRECTORY/<script name>_<timestamp>"""
+    stem = os.path.splitext(os.path.basename(script))[0]
+    return os.path.join(directory, f"{stem}_{time.strftime('%Y%m%d_%H%M%S')}")
@@ -0,0 +1,261 @@
+import os
+import re
+import sys
+import glob
+import hashlib
+
+import pandas as pd
+import phonenumbers
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import prepare_leads
+from prepare_leads import LeadDataProcessor
+
+
+def make_processor(tmp_path, rows, **options):
+    input_file = tmp_path / 'leads.csv'
+    pd.DataFrame(rows, columns=LeadDataProcessor.RECORD_COLUMNS).to_csv(input_file, index=False)
+    return LeadDataProcessor(str(input_file), output_dir=str(tmp_path / 'out'), **options)
+
+
+def lead(**fields):
+    return {**dict.fromkeys(LeadDataProcessor.RECORD_COLUMNS, ''), 'Title': 'Lead', **fields}
+
+
+def sha256(value):
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def test_branches_sharing_a_mobile_number_stay_separate(tmp_path):
+    chain = {'Country': 'NP', 'Website': 'https://hairnshantinepal.com', 'Email': 'hairnshantiktm@gmail.com',
+             'mobile_number': '+97715252052', 'whatsapp_number': ''}
+    processor = make_processor(tmp_path, [
+        {'Title': 'Hair n Shanti', 'Address': 'Teendhara Marg, Kathmandu 44600', 'Phone': '+9779823320055', **chain},
+        {'Title': 'Hair n Shanti', 'Address': 'Eye Plex Mall, Kathmandu 44600', 'Phone': '+97714574661', **chain},
+        # No listing phone: must not join the two branches into one cluster
+        {'Title': 'Hair n Shanti', 'Address': 'Kathmandu 44600', 'Phone': '', **chain},
+    ], resolve_entities=True)
+
+    resolved = processor.resolve_duplicates(processor.df)
+
+    assert sorted(resolved['Phone'].dropna()) == ['+97714574661', '+9779823320055']
+
+
+def test_merged_lead_keeps_the_clusters_other_numbers(tmp_path):
+    processor = make_processor(tmp_path, [
+        {'Title': 'Glow Salon', 'Address': 'Naxal, Kathmandu', 'Phone': '+97714544756', 'Country': 'NP',
+         'Website': '', 'Email': '', 'mobile_number': '', 'whatsapp_number': ''},
+        {'Title': 'Glow Salon', 'Address': 'Naxal, Kathmandu', 'Phone': '014544756', 'Country': 'NP',
+         'Website': '', 'Email': 'glow@example.com', 'mobile_number': '', 'whatsapp_number': '+9779801234567'},
+        {'Title': 'Glow Salon', 'Address': 'Naxal, Kathmandu', 'Phone': '+97714544756', 'Country': 'NP',
+         'Website': '', 'Email': 'glow@example.com', 'mobile_number': '', 'whatsapp_number': '+9779807654321'},
+    ], resolve_entities=True)
+
+    resolved = processor.resolve_duplicates(processor.df)
+
+    assert len(resolved) == 1
+    record = resolved.iloc[0]
+    assert {record['mobile_number'], record['whatsapp_number']} == {'+9779801234567', '+9779807654321'}
+
+
+def baseline_extract_postal_code(address: str) -> str:
+    """Pre-country extraction: the first of the universal patterns that matches anywhere."""
+    for fmt in LeadDataProcessor.POSTAL_FORMATS:
+        match = re.search(r'\b(' + fmt + r')\b', address)
+        if match:
+            return match.group(1)
+    return ''
+
+
+def test_postal_codes_without_a_known_country_match_the_baseline(tmp_path):
+    rows = [
+        ('123 Main St, Springfield, IL 62704', ''),
+        ('1600 Amphitheatre Pkwy, Mountain View, CA 94043', ''),
+        ('Rua Augusta 100, 1100-053 Lisboa', ''),
+        ('Keizersgracht 1, 1015 CJ Amsterdam', 'XX'),
+        ('10 Downing St, London SW1A 2AA', ''),
+        ('Chhaya center, Kathmandu 44600', 'NP'),
+        ('221B Baker Street, London NW1 6XE', 'GB'),
+        ('Rua Augusta 100, 1100-053 Lisboa', 'PT'),
+        ('Sheikh Zayed Rd 12, Dubai', 'AE'),
+        ('no digits here', ''),
+    ]
+    processor = make_processor(tmp_path, [
+        {'Title': 'Lead', 'Address': address, 'Phone': '', 'Country': country, 'Website': '', 'Email': '',
+         'mobile_number': '', 'whatsapp_number': ''}
+        for address, country in rows
+    ])
+    addresses = pd.Series([address for address, _ in rows])
+    countries = pd.Series([country for _, country in rows])
+
+    vectorized = processor._extract_postal_codes(addresses, countries).tolist()
+    row_wise = [processor.extract_postal_code(address, country) for address, country in rows]
+
+    assert vectorized == row_wise
+    assert row_wise[:3] == ['62704', '94043', '1100-053']
+    for (address, country), zip_code in zip(rows, row_wise):
+        if country not in LeadDataProcessor.COUNTRY_POSTAL_FORMATS:
+            assert zip_code == baseline_extract_postal_code(address)
+    assert row_wise[5:] == ['44600', 'NW1 6XE', '1100-053', '', '']
+
+
+def test_phones_normalize_to_e164_in_the_leads_country(tmp_path):
+    processor = make_processor(tmp_path, [lead(Phone='+97715252052', Country='NP')])
+    phones = pd.Series(['06 1234 5678', '1-555-123-4567', '8 (495) 123-45-67', '9779851097472',
+                        '00 44 20 7946 0958', '014544756', '555 1234', 'null', None])
+    countries = pd.Series(['IT', 'US', 'RU', 'NP', 'FR', 'NP', '', 'NP', 'NP'])
+
+    assert processor._normalize_phones(phones, countries).tolist() == [
+        '+390612345678',  # national leading zero kept
+        '+15551234567',  # NANP trunk prefix dropped
+        '+74951234567',  # Russian trunk prefix 8 dropped
+        '+9779851097472',  # country code without '+' not added twice
+        '+442079460958',  # international dialing prefix
+        '+97714544756',
+        '5551234',  # no country: plain digits
+        '',
+        '',
+    ]
+
+
+def test_hashed_identifiers_match_the_platforms_normalization(tmp_path):
+    processor = make_processor(tmp_path, [
+        lead(Phone='06 1234 5678', Country='IT', Email=' Info@Example.COM '),
+        lead(Phone='1-555-123-4567', Country='US'),
+    ])
+
+    processor.segment_data()
+    enriched = processor._enriched
+
+    assert enriched.loc[0, 'phone_sha256'] == sha256('+390612345678')
+    assert enriched.loc[0, 'phone_digits_sha256'] == sha256('390612345678')
+    assert enriched.loc[0, 'email_sha256'] == sha256('info@example.com')
+    assert enriched.loc[1, 'phone_sha256'] == sha256('+15551234567')
+
+
+def exported_rows(written):
+    return {platform: sum(len(pd.read_csv(path)) for path in paths if path.endswith('.csv'))
+            for platform, paths in written.items() if platform != 'whatsapp'}
+
+
+def test_second_suppressed_run_exports_nothing_again(tmp_path):
+    rows = [
+        lead(Title='Known Country', Phone='9851097472', Country='NP'),
+        lead(Title='No Country', Phone='98510 12345'),
+        lead(Title='No Country Mobile', mobile_number='+977 9801234567'),
+        lead(Title='Unparsed', Phone='ext. only'),
+        lead(Title='Email Only', Email='hello@example.com'),
+    ]
+    first = make_processor(tmp_path, rows, suppress_exported=True)
+    first.segment_data()
+    assert sum(exported_rows(first.write_platform_files()).values()) > 0
+
+    second = make_processor(tmp_path, rows, suppress_exported=True)
+    second.segment_data()
+    assert exported_rows(second.write_platform_files()) == {'meta_ads': 0, 'google_ads': 0, 'mautic': 0}
+
+
+def test_failed_incremental_run_is_rolled_back_and_resumed(tmp_path, monkeypatch):
+    salons = [lead(Title=f'Salon {i}', Email=f'salon{i}@example.com', Phone=f'+9779801{i:06d}', Country='NP')
+              for i in range(30)]
+    input_file = tmp_path / 'leads.csv'
+    pd.DataFrame(salons[:10], columns=LeadDataProcessor.RECORD_COLUMNS).to_csv(input_file, index=False)
+    run = lambda: LeadDataProcessor(str(input_file), output_dir=str(tmp_path / 'out'), incremental=True).process_all()
+    run()
+
+    pd.DataFrame(salons[10:], columns=LeadDataProcessor.RECORD_COLUMNS).to_csv(input_file, mode='a', index=False, header=False)
+    feed = LeadDataProcessor.feed
+    fed = []
+
+    def failing_feed(self, chunk):
+        fed.append(len(chunk))
+        if len(fed) == 2:
+            raise RuntimeError('disk full')
+        feed(self, chunk)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(prepare_leads, 'DELTA_BLOCK_BYTES', 512)
+        patch.setattr(LeadDataProcessor, 'feed', failing_feed)
+        with pytest.raises(RuntimeError):
+            run()
+    run()
+
+    output_dir, = glob.glob(str(tmp_path / 'out' / 'leads_completed_*'))
+    emails = pd.concat(pd.read_csv(path) for path in glob.glob(os.path.join(output_dir, 'mautic', '*.csv')))['email']
+    numbers = pd.concat(pd.read_excel(path, dtype=str) for path in glob.glob(os.path.join(output_dir, 'whatsapp', '*.xlsx'))).iloc[:, 0]
+    assert sorted(emails) == sorted(salon['Email'] for salon in salons)
+    assert sorted(numbers) == sorted(salon['Phone'] for salon in salons)
+
+
+MIXED_LEADS = [
+    lead(Title='Glow Salon', Address='Naxal, Kathmandu 44600', Phone='01-4544756', Country='NP',
+         Email='Glow@Example.com', Website='https://glow.example.com', whatsapp_number='+9779801234567'),
+    lead(Title='Corner Barber', Address='123 Main St, Springfield, IL 62704', Phone='(217) 555-0142', Country='US'),
+    lead(Title='Studio Roma', Address='Via Roma 1, 00184 Roma', Phone='06 1234 5678', Country='IT',
+         Email='ciao@studioroma.it'),
+    lead(Title='Maison Belle', Address='10 Rue Cler, 75007 Paris', Country='FR', Email='bonjour@maisonbelle.fr',
+         Website='https://maisonbelle.fr'),
+    lead(Title='Nail Bar', Address='221B Baker Street, London NW1 6XE', Phone='020 7946 0958', Country='GB',
+         mobile_number='07700 900123'),
+    lead(Title='No Country Spa', Phone='98510 12345', Email='spa@example.com'),
+    lead(Title='Website Only'),
+]
+
+
+def platform_outputs(output_root):
+    output_dir, = glob.glob(os.path.join(output_root, 'leads_completed_*'))
+    outputs = {}
+    for path in sorted(glob.glob(os.path.join(output_dir, '*', '*.*'))):
+        name = os.path.relpath(path, output_dir)
+        outputs[name] = (pd.read_excel(path, dtype=str) if path.endswith('.xlsx')
+                         else pd.read_csv(path, dtype=str, keep_default_na=False))
+    return outputs
+
+
+def test_chunked_run_writes_the_same_files_as_the_in_memory_run(tmp_path):
+    input_file = tmp_path / 'leads.csv'
+    pd.DataFrame(MIXED_LEADS, columns=LeadDataProcessor.RECORD_COLUMNS).to_csv(input_file, index=False)
+    LeadDataProcessor(str(input_file), output_dir=str(tmp_path / 'memory')).process_all()
+    LeadDataProcessor(str(input_file), output_dir=str(tmp_path / 'chunked'), chunksize=2).process_all()
+
+    in_memory = platform_outputs(str(tmp_path / 'memory'))
+    chunked = platform_outputs(str(tmp_path / 'chunked'))
+
+    assert sorted(chunked) == sorted(in_memory)
+    assert any(len(frame) for frame in in_memory.values())
+    for name, frame in in_memory.items():
+        if name.startswith('whatsapp'):
+            # Numbers are listed in the order the chunks reach them
+            assert sorted(chunked[name].iloc[:, 0]) == sorted(frame.iloc[:, 0])
+            continue
+        pd.testing.assert_frame_equal(chunked[name].reset_index(drop=True), frame.reset_index(drop=True), obj=name)
+
+
+def e164(phone, country):
+    try:
+        return phonenumbers.format_number(phonenumbers.parse(phone, country or None), phonenumbers.PhoneNumberFormat.E164)
+    except phonenumbers.NumberParseException:
+        return re.sub(r'\D', '', phone)
+
+
+def test_hashed_audiences_are_the_plain_audiences_normalized_and_hashed(tmp_path):
+    input_file = tmp_path / 'leads.csv'
+    pd.DataFrame(MIXED_LEADS, columns=LeadDataProcessor.RECORD_COLUMNS).to_csv(input_file, index=False)
+    LeadDataProcessor(str(input_file), output_dir=str(tmp_path / 'plain'), hash_identifiers=False).process_all()
+    LeadDataProcessor(str(input_file), output_dir=str(tmp_path / 'hashed')).process_all()
+
+    plain = platform_outputs(str(tmp_path / 'plain'))
+    hashed = platform_outputs(str(tmp_path / 'hashed'))
+    digest = lambda value: sha256(value) if value else ''
+    for name in [name for name in plain if name.startswith(('meta_ads', 'google_ads'))]:
+        text, hashes = plain[name], hashed[name]
+        assert len(text) and len(text) == len(hashes)
+        emails = text['Email'].str.strip().str.lower()
+        phones = pd.Series([e164(phone, country) for phone, country in zip(text['Phone'], text['Country'])])
+        if name.startswith('meta_ads'):
+            phones = phones.str.lstrip('+')
+        assert hashes['Email'].tolist() == emails.map(digest).tolist()
+        assert hashes['Phone'].tolist() == phones.map(digest).tolist()
+        assert hashes['First Name'].tolist() == text['First Name'].str.strip().str.lower().map(digest).tolist()